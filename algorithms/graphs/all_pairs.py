@@ -0,0 +1,195 @@
+"""
+Multi-source and All-Pairs Shortest Paths
+"""
+from array import array
+from algorithms.graphs.csr_graph import CSRGraph
+from algorithms.graphs.shortest_paths import NegativeCycleError
+from algorithms.process_pool import num_workers, process_pool
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# read-only state of a worker process, set once by _init_worker
+_worker_graph = None
+_worker_search = None
+_worker_potentials = None
+
+
+def _init_worker(graph: CSRGraph, algorithm, potentials):
+    """
+    Stores the graph shared by all the searches of a worker process.
+    With the fork start method the graph is inherited copy-on-write,
+    otherwise it is pickled once per worker instead of once per source.
+    """
+    global _worker_graph, _worker_search, _worker_potentials
+    _worker_graph = graph
+    _worker_search = getattr(graph, "_" + algorithm)
+    _worker_potentials = potentials
+
+
+def _search(s):
+    """
+    Runs a single source search in a worker process.
+    :param s: index of the source vertex
+    :return: (s, dist, predecessor) arrays, which are cheap to send back
+    """
+    return _single_source(_worker_graph, _worker_search, _worker_potentials, s)
+
+
+def _single_source(graph: CSRGraph, search, potentials, s):
+    """
+    :param graph: the graph searched
+    :param search: index based search method of graph
+    :param potentials: Johnson potentials to undo, or None
+    :param s: index of the source vertex
+    :return: (s, dist, predecessor)
+    """
+    dist, predecessor = search(s)
+    if potentials is not None:
+        _unreweight(s, dist, potentials, graph.infinity)
+    return s, dist, predecessor
+
+
+def _unreweight(s, dist, potentials, infinity):
+    """
+    Turns distances computed on Johnson reweighted edges back into real distances.
+    :param s: index of the source vertex
+    :param dist: distances from s on the reweighted graph, modified in place
+    :param potentials: vertex potentials used for the reweighting
+    :param infinity: distance of unreachable vertices
+    """
+    hs = potentials[s]
+    for v in range(len(dist)):
+        if dist[v] != infinity:
+            dist[v] = dist[v] - hs + potentials[v]
+
+
+def _freeze(graph):
+    """
+    :param graph: a Graph or a CSRGraph
+    :return: the CSRGraph of graph
+    """
+    if isinstance(graph, CSRGraph):
+        return graph
+    return graph.freeze()
+
+
+def _run(csr: CSRGraph, sources, workers, algorithm, potentials=None, chunksize=None):
+    """
+    Runs the single source searches, in parallel if workers > 1.
+    :return: generator of ShortestPathResult, in the order of sources
+    """
+    if sources is None:
+        indices = list(range(csr.num_vertices))
+    else:
+        indices = [csr.index_of(key) for key in sources]
+    workers = num_workers(workers)
+    if workers == 1 or len(indices) <= 1:
+        search = getattr(csr, "_" + algorithm)
+        for s in indices:
+            yield csr._result(*_single_source(csr, search, potentials, s))
+        return
+    if chunksize is None:
+        # a few chunks per worker balance the load without flooding the result pipe
+        chunksize = max(1, len(indices) // (4 * workers))
+    executor = process_pool(workers, _init_worker, (csr, algorithm, potentials))
+    try:
+        for s, dist, predecessor in executor.map(_search, indices, chunksize=chunksize):
+            yield csr._result(s, dist, predecessor)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def all_pairs_shortest_paths(graph, sources=None, workers=None, algorithm="dijkstra", chunksize=None):
+    """
+    Computes single source shortest paths from every source, streaming
+    one ShortestPathResult per source in the order of sources.
+    The graph is packed once into a read-only CSRGraph that is shared with
+    a process pool, so the searches run on several cores.
+    :param graph: a Graph or CSRGraph
+    :param sources: keys of the source vertices, all vertices if None
+    :param workers: number of worker processes, 1 runs in this process,
+                    None uses one worker per CPU
+    :param algorithm: "dijkstra", "bellman_ford", "spfa", "bfs" or "johnson"
+    :param chunksize: number of sources sent to a worker at once
+    :return: generator of ShortestPathResult
+    """
+    if algorithm == "johnson":
+        return johnson(graph, sources, workers, chunksize)
+    if algorithm not in ("dijkstra", "bellman_ford", "spfa", "bfs"):
+        raise ValueError("Unknown shortest path algorithm: {}".format(algorithm))
+    return _run(_freeze(graph), sources, workers, algorithm, chunksize=chunksize)
+
+
+def johnson(graph, sources=None, workers=None, chunksize=None):
+    """
+    Johnson's all-pairs shortest path algorithm for graphs with negative edges.
+    Runs Bellman-Ford once to compute vertex potentials h, reweights every
+    edge (u, v) to w(u, v) + h(u) - h(v) >= 0 and then runs Dijkstra from every
+    source, in parallel like all_pairs_shortest_paths.
+    If a negative weight cycle is found, the method raises a NegativeCycleError.
+    :param graph: a Graph or CSRGraph
+    :param sources: keys of the source vertices, all vertices if None
+    :param workers: number of worker processes, see all_pairs_shortest_paths
+    :param chunksize: number of sources sent to a worker at once
+    :return: generator of ShortestPathResult with the real (not reweighted) distances
+    """
+    csr = _freeze(graph)
+    potentials = _potentials(csr)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    reweighted = array(weights.typecode, weights)
+    for u in range(csr.num_vertices):
+        for e in range(offsets[u], offsets[u + 1]):
+            reweighted[e] += potentials[u] - potentials[targets[e]]
+    reweighted_csr = CSRGraph(csr.keys, offsets, targets, reweighted, csr.directed)
+    return _run(reweighted_csr, sources, workers, "dijkstra", potentials, chunksize)
+
+
+def _potentials(csr: CSRGraph):
+    """
+    Bellman-Ford from a virtual vertex with a zero weight edge to every vertex.
+    :param csr: the graph
+    :return: array of vertex potentials
+    """
+    h = array(csr.weights.typecode, [0]) * csr.num_vertices
+    predecessor = array('q', [-1]) * csr.num_vertices
+    v = csr._relax_passes(h, predecessor)
+    if v >= 0:
+        raise NegativeCycleError(csr._cycle(predecessor, v))
+    return h
+
+
+def floyd_warshall(graph):
+    """
+    Floyd-Warshall all-pairs shortest paths, vectorised with NumPy.
+    Uses O(V^2) memory, so it is meant for small dense graphs.
+    If a negative weight cycle is found, the method raises a NegativeCycleError.
+    :param graph: a Graph or CSRGraph
+    :return: (keys, dist, predecessor) where dist[i, j] is the distance from keys[i]
+             to keys[j] (inf if unreachable) and predecessor[i, j] is the index of
+             the vertex before keys[j] on that path (-1 if none)
+    """
+    if np is None:
+        raise ImportError("floyd_warshall requires NumPy.")
+    csr = _freeze(graph)
+    n = csr.num_vertices
+    rows = np.repeat(np.arange(n), np.diff(np.asarray(csr.offsets)))
+    cols = np.asarray(csr.targets, dtype=np.int64)
+    dist = np.full((n, n), np.inf)
+    np.minimum.at(dist, (rows, cols), np.asarray(csr.weights, dtype=np.float64))
+    predecessor = np.full((n, n), -1, dtype=np.int64)
+    predecessor[rows, cols] = rows
+    diagonal = np.arange(n)
+    dist[diagonal, diagonal] = np.minimum(dist[diagonal, diagonal], 0)
+    predecessor[diagonal, diagonal] = -1
+    for k in range(n):
+        through_k = dist[:, k, None] + dist[None, k, :]
+        improved = through_k < dist
+        dist = np.where(improved, through_k, dist)
+        predecessor = np.where(improved, predecessor[k][None, :], predecessor)
+    if (dist[diagonal, diagonal] < 0).any():
+        raise NegativeCycleError()
+    return csr.keys, dist, predecessor
@@ -0,0 +1,495 @@
+"""
+Compressed Sparse Row (CSR) Graph Module
+"""
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+import math
+from numbers import Integral, Real
+import sys
+from algorithms.graphs import traversal
+from algorithms.graphs.shortest_paths import NegativeCycleError, ShortestPathResult
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# vertices handled at once by a vectorised bottom-up BFS step
+BOTTOM_UP_BLOCK = 1 << 18
+
+
+class CSRGraph:
+    """
+    Read-only snapshot of a Graph packed into contiguous arrays.
+    Vertices are numbered 0..n-1 in the order of the keys list and
+    the out-edges of vertex i are stored in targets[offsets[i]:offsets[i + 1]],
+    with the matching edge weights in weights[offsets[i]:offsets[i + 1]].
+    """
+    def __init__(self, keys: list, offsets: array, targets: array, weights: array, directed=True):
+        # maps an index to the key of the vertex
+        self.keys = keys
+        # maps the key of a vertex to its index
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.num_vertices = len(keys)
+        self.directed = directed
+        # distance used for unreachable vertices, matching the weight type
+        self.infinity = sys.maxsize if weights.typecode == 'q' else math.inf
+        # NumPy views of the forward and reverse adjacency, built by the first bfs_levels
+        self._numpy_adjacency = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Packs a Graph into a CSRGraph.
+        Raises TypeError if a weight is not a real number.
+        :param graph: the Graph to be packed
+        :return: the CSRGraph snapshot
+        """
+        keys = list(graph.get_vertices())
+        index = {key: i for i, key in enumerate(keys)}
+        offsets = array('q', [0])
+        targets = array('q')
+        edge_weights = []
+        for key in keys:
+            for neighbour, weight in graph.get_vertex(key).connected_to.items():
+                targets.append(index[neighbour.get_id()])
+                edge_weights.append(weight)
+            offsets.append(len(targets))
+        if all(isinstance(w, Integral) for w in edge_weights):
+            weights = array('q', edge_weights)
+        elif all(isinstance(w, Real) for w in edge_weights):
+            weights = array('d', edge_weights)
+        else:
+            raise TypeError("The weights of a CSRGraph must be real numbers.")
+        return cls(keys, offsets, targets, weights, graph.directed)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def __len__(self):
+        return self.num_vertices
+
+    def index_of(self, key):
+        """
+        :param key: key of the vertex
+        :return: the index of the vertex, or raises KeyError
+        """
+        if key in self.index:
+            return self.index[key]
+        else:
+            raise KeyError("No Vertex with that key.")
+
+    def num_edges(self):
+        """
+        :return: the number of stored (directed) edges
+        """
+        return len(self.targets)
+
+    def neighbours(self, i):
+        """
+        :param i: index of a vertex
+        :return: the indices of the out-neighbours of i
+        """
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def get_edges(self):
+        """
+        :return: a list of (key_1, key_2, weight) edges
+        """
+        keys, offsets, targets, weights = self.keys, self.offsets, self.targets, self.weights
+        edges = []
+        for u in range(self.num_vertices):
+            for e in range(offsets[u], offsets[u + 1]):
+                edges.append((keys[u], keys[targets[e]], weights[e]))
+        return edges
+
+    def _result(self, s, dist, predecessor, infinity=None):
+        """
+        :param s: index of the source vertex
+        :param dist: distance array
+        :param predecessor: predecessor array, -1 marks no predecessor
+        :param infinity: distance of unreachable vertices, defaults to self.infinity
+        :return: the ShortestPathResult keyed by vertex keys
+        """
+        if infinity is None:
+            infinity = self.infinity
+        return ShortestPathResult(self.keys[s], self.keys, self.index_of, dist, predecessor, infinity)
+
+    def _predecessor_dict(self, predecessor):
+        """
+        :param predecessor: predecessor array, -1 marks no predecessor
+        :return: dict mapping every vertex key to the key of its predecessor or None
+        """
+        keys = self.keys
+        return {keys[i]: (keys[p] if p >= 0 else None) for i, p in enumerate(predecessor)}
+
+    ###################################
+    # Search algorithms for the graph #
+    ###################################
+
+    def bfs(self, source_key):
+        """
+        Runs the BFS algorithm from source_key and computes
+        the shortest number of edges from the source to all
+        other vertices and predecessor of every vertex.
+        :param source_key: the key of the source vertex
+        :return: the ShortestPathResult
+        """
+        s = self.index_of(source_key)
+        return self._result(s, *self._bfs(s), infinity=sys.maxsize)
+
+    def _bfs(self, s):
+        n = self.num_vertices
+        offsets, targets = self.offsets, self.targets
+        dist = array('q', [sys.maxsize]) * n
+        predecessor = array('q', [-1]) * n
+        dist[s] = 0
+        q = deque([s])
+        pop, push = q.popleft, q.append
+        while q:
+            u = pop()
+            d = dist[u] + 1
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if dist[v] == sys.maxsize:
+                    dist[v] = d
+                    predecessor[v] = u
+                    push(v)
+        return dist, predecessor
+
+    def bfs_levels(self, source_key, alpha=14, beta=24):
+        """
+        Level synchronous, direction optimising BFS (Beamer et al.) vectorised with NumPy.
+        Every level is expanded at once, top-down from the frontier while it is small
+        and bottom-up, from the unvisited vertices to their in-neighbours, when
+        the frontier has more than 1 / alpha of the unexplored edges. It goes back
+        to top-down when the frontier has less than 1 / beta of the vertices.
+        Bottom-up steps test frontier membership on a packed bitset of the frontier.
+        :param source_key: the key of the source vertex
+        :param alpha: top-down to bottom-up switch threshold
+        :param beta: bottom-up to top-down switch threshold
+        :return: (levels, parents) int64 ndarrays indexed by vertex index, where levels
+                 is the number of edges from the source and parents the index of the
+                 BFS tree parent, both -1 for unreachable vertices (parent of the source too)
+        """
+        if np is None:
+            raise ImportError("bfs_levels requires NumPy.")
+        s = self.index_of(source_key)
+        offsets, targets, degrees, in_offsets, in_sources = self._numpy_arrays()
+        n = self.num_vertices
+        levels = np.full(n, -1, dtype=np.int64)
+        parents = np.full(n, -1, dtype=np.int64)
+        levels[s] = 0
+        frontier = np.array([s], dtype=np.int64)
+        # out-edges of the vertices that are not visited yet
+        unexplored_edges = int(degrees.sum()) - int(degrees[s])
+        level = 0
+        bottom_up = False
+        while frontier.size:
+            if not bottom_up and int(degrees[frontier].sum()) > unexplored_edges / alpha:
+                bottom_up = True
+            elif bottom_up and frontier.size < n / beta:
+                bottom_up = False
+            if bottom_up:
+                frontier = self._bottom_up_step(in_offsets, in_sources, levels, parents, level)
+            else:
+                frontier = self._top_down_step(offsets, targets, levels, parents, level, frontier)
+            unexplored_edges -= int(degrees[frontier].sum())
+            level += 1
+        return levels, parents
+
+    def _numpy_arrays(self):
+        """
+        :return: (offsets, targets, out-degrees, in-offsets, in-sources) ndarrays,
+                 where the in-edges of vertex i come from in_sources[in_offsets[i]:in_offsets[i + 1]]
+        """
+        if self._numpy_adjacency is None:
+            n = self.num_vertices
+            offsets = np.asarray(self.offsets, dtype=np.int64)
+            targets = np.asarray(self.targets, dtype=np.int64)
+            degrees = np.diff(offsets)
+            if self.directed:
+                sources = np.repeat(np.arange(n, dtype=np.int64), degrees)
+                in_sources = sources[np.argsort(targets, kind="stable")]
+                in_offsets = np.zeros(n + 1, dtype=np.int64)
+                np.cumsum(np.bincount(targets, minlength=n), out=in_offsets[1:])
+            else:
+                in_offsets, in_sources = offsets, targets
+            self._numpy_adjacency = offsets, targets, degrees, in_offsets, in_sources
+        return self._numpy_adjacency
+
+    @staticmethod
+    def _gather(offsets, adjacency, vertices):
+        """
+        :return: (owners, neighbours) ndarrays with an entry for every edge of vertices
+        """
+        starts = offsets[vertices]
+        counts = offsets[vertices + 1] - starts
+        ends = np.cumsum(counts)
+        edges = np.arange(ends[-1] if ends.size else 0) + np.repeat(starts - ends + counts, counts)
+        return np.repeat(vertices, counts), adjacency[edges]
+
+    @staticmethod
+    def _top_down_step(offsets, targets, levels, parents, level, frontier):
+        """
+        Visits the unvisited out-neighbours of the frontier.
+        :return: the next frontier
+        """
+        owners, neighbours = CSRGraph._gather(offsets, targets, frontier)
+        unvisited = levels[neighbours] < 0
+        owners, neighbours = owners[unvisited], neighbours[unvisited]
+        # the first frontier vertex reaching a neighbour becomes its parent
+        discovered, first = np.unique(neighbours, return_index=True)
+        levels[discovered] = level + 1
+        parents[discovered] = owners[first]
+        return discovered
+
+    @staticmethod
+    def _bottom_up_step(in_offsets, in_sources, levels, parents, level):
+        """
+        Visits the unvisited vertices with an in-neighbour in the frontier.
+        :return: the next frontier
+        """
+        frontier_bits = np.packbits(levels == level, bitorder="little")
+        unvisited = np.flatnonzero(levels < 0)
+        found = []
+        for start in range(0, unvisited.size, BOTTOM_UP_BLOCK):
+            owners, sources = CSRGraph._gather(in_offsets, in_sources, unvisited[start:start + BOTTOM_UP_BLOCK])
+            hits = ((frontier_bits[sources >> 3] >> (sources & 7).astype(np.uint8)) & 1).astype(bool)
+            owners, sources = owners[hits], sources[hits]
+            discovered, first = np.unique(owners, return_index=True)
+            parents[discovered] = sources[first]
+            found.append(discovered)
+        discovered = np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+        levels[discovered] = level + 1
+        return discovered
+
+    def dfs(self):
+        """
+        Runs an iterative Depth First Search on the whole graph.
+        :return: (discovery order as a list of keys, predecessors dict)
+        """
+        n = self.num_vertices
+        offsets, targets = self.offsets, self.targets
+        visited = bytearray(n)
+        predecessor = array('q', [-1]) * n
+        order = []
+        for root in range(n):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            order.append(root)
+            # stack of (vertex, position of the next edge to explore)
+            stack = [(root, offsets[root])]
+            while stack:
+                u, e = stack[-1]
+                end = offsets[u + 1]
+                while e < end and visited[targets[e]]:
+                    e += 1
+                if e == end:
+                    stack.pop()
+                    continue
+                v = targets[e]
+                stack[-1] = (u, e + 1)
+                visited[v] = 1
+                predecessor[v] = u
+                order.append(v)
+                stack.append((v, offsets[v]))
+        keys = self.keys
+        return [keys[i] for i in order], self._predecessor_dict(predecessor)
+
+    def _sources(self, sources):
+        """
+        :param sources: keys of vertices, all vertices if None
+        :return: the indices of the vertices
+        """
+        if sources is None:
+            return range(self.num_vertices)
+        return [self.index_of(key) for key in sources]
+
+    def iter_bfs(self, sources=None, depth_limit=None, edges=True):
+        """
+        Iterative Breadth First Search that streams traversal events, see traversal.iter_bfs.
+        :param sources: keys of the start vertices, all vertices if None
+        :param depth_limit: vertices at this depth are not expanded, None for no limit
+        :param edges: also emit edge events
+        :return: generator of TraversalEvent
+        """
+        return traversal.iter_bfs(self.keys, self.neighbours, self._sources(sources),
+                                  self.directed, depth_limit, edges)
+
+    def iter_dfs(self, sources=None, depth_limit=None, edges=True):
+        """
+        Iterative Depth First Search that streams traversal events with
+        classified edges, see traversal.iter_dfs.
+        :param sources: keys of the start vertices, all vertices if None
+        :param depth_limit: vertices at this depth are not expanded, None for no limit
+        :param edges: also emit edge events
+        :return: generator of TraversalEvent
+        """
+        return traversal.iter_dfs(self.keys, self.neighbours, self._sources(sources),
+                                  self.directed, depth_limit, edges)
+
+    def dijkstra(self, source_key, target_key=None):
+        """
+        Applies the Dijkstra shortest path algorithm from source_key.
+        Only works for graphs with positive weights.
+        If target_key is given, the search stops as soon as the target is settled.
+        :param source_key: the key of the source vertex
+        :param target_key: optional key of the target vertex
+        :return: the ShortestPathResult
+        """
+        s = self.index_of(source_key)
+        t = -1 if target_key is None else self.index_of(target_key)
+        return self._result(s, *self._dijkstra(s, t))
+
+    def _dijkstra(self, s, t=-1):
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        dist = array(weights.typecode, [self.infinity]) * n
+        predecessor = array('q', [-1]) * n
+        dist[s] = 0
+        heap = [(0, s)]
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                # stale entry, u was already settled with a smaller distance
+                continue
+            if u == t:
+                break
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                nd = d + weights[e]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    predecessor[v] = u
+                    heappush(heap, (nd, v))
+        return dist, predecessor
+
+    def bellman_ford(self, source_key, algorithm="bellman_ford"):
+        """
+        Applies the Bellman-Ford shortest path algorithm from source_key.
+        If a negative weight cycle is reachable from the source, the method raises
+        a NegativeCycleError (a ValueError) whose cycle attribute holds the cycle.
+        :param source_key: the key of the source vertex
+        :param algorithm: "bellman_ford" for passes over all the edges that stop at the
+                          first pass without changes, or "spfa" to only relax the
+                          out-edges of the vertices whose distance changed
+        :return: the ShortestPathResult
+        """
+        if algorithm not in ("bellman_ford", "spfa"):
+            raise ValueError("Unknown shortest path algorithm: {}".format(algorithm))
+        s = self.index_of(source_key)
+        return self._result(s, *getattr(self, "_" + algorithm)(s))
+
+    def _bellman_ford(self, s):
+        n = self.num_vertices
+        dist = array(self.weights.typecode, [self.infinity]) * n
+        predecessor = array('q', [-1]) * n
+        dist[s] = 0
+        v = self._relax_passes(dist, predecessor)
+        if v >= 0:
+            raise NegativeCycleError(self._cycle(predecessor, v))
+        return dist, predecessor
+
+    def _relax_passes(self, dist, predecessor):
+        """
+        Relaxes all the edges in up to n passes, stopping at the first pass without changes.
+        :param dist: initial distances, updated in place
+        :param predecessor: predecessor array, updated in place
+        :return: -1 if the distances converged, otherwise a vertex whose distance
+                 changed in the n-th pass, which leads back to a negative weight cycle
+        """
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        infinity = self.infinity
+        for _ in range(n):
+            changed = -1
+            for u in range(n):
+                du = dist[u]
+                if du == infinity:
+                    continue
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    nd = du + weights[e]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        predecessor[v] = u
+                        changed = v
+            if changed < 0:
+                # no distance changed, so every later pass would be a no-op
+                break
+        return changed if n else -1
+
+    def _spfa(self, s):
+        """
+        Shortest Path Faster Algorithm: Bellman-Ford with a FIFO queue of
+        the vertices whose distance changed.
+        """
+        n = self.num_vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        dist = array(weights.typecode, [self.infinity]) * n
+        predecessor = array('q', [-1]) * n
+        # number of edges of the path that gave every vertex its distance
+        length = array('q', [0]) * n
+        queued = bytearray(n)
+        dist[s] = 0
+        q = deque([s])
+        queued[s] = 1
+        while q:
+            u = q.popleft()
+            queued[u] = 0
+            du = dist[u]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                nd = du + weights[e]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    predecessor[v] = u
+                    length[v] = length[u] + 1
+                    if length[v] >= n:
+                        # a path with n edges repeats a vertex, so there is a negative cycle
+                        cycle = self._cycle(predecessor, v)
+                        if cycle is None:
+                            return self._bellman_ford(s)
+                        raise NegativeCycleError(cycle)
+                    if not queued[v]:
+                        queued[v] = 1
+                        q.append(v)
+        return dist, predecessor
+
+    def find_negative_cycle(self):
+        """
+        Looks for a negative weight cycle anywhere in the graph, with Bellman-Ford
+        from a virtual source that has a zero weight edge to every vertex.
+        :return: the keys of the vertices of a negative weight cycle in edge order, or None
+        """
+        n = self.num_vertices
+        dist = array(self.weights.typecode, [0]) * n
+        predecessor = array('q', [-1]) * n
+        v = self._relax_passes(dist, predecessor)
+        return None if v < 0 else self._cycle(predecessor, v)
+
+    def _cycle(self, predecessor, v):
+        """
+        Follows the predecessors from v until a vertex repeats.
+        :return: the keys of the vertices of the cycle in edge order, or None if the walk ends
+        """
+        seen = set()
+        while v >= 0 and v not in seen:
+            seen.add(v)
+            v = predecessor[v]
+        if v < 0:
+            return None
+        cycle = [v]
+        u = predecessor[v]
+        while u != v:
+            cycle.append(u)
+            u = predecessor[u]
+        cycle.reverse()
+        keys = self.keys
+        return [keys[i] for i in cycle]
@@ -0,0 +1,155 @@
+"""
+Dynamic Single Source Shortest Paths
+"""
+import weakref
+from array import array
+from heapq import heappush, heappop
+from algorithms.graphs.shortest_paths import INFINITY, ShortestPathResult
+
+
+class DynamicShortestPaths:
+    """
+    Shortest path tree from one source that is repaired after edge changes,
+    in the style of Ramalingam and Reps, instead of being recomputed.
+    The changes are read from the change log of the Graph. Decreases and insertions
+    relax the changed edge and propagate from there. Increases and deletions of
+    tree edges reset the subtree below the edge, give every vertex of the subtree
+    its best distance through an unaffected in-neighbour and propagate from there.
+    Only the vertices whose distance changes, and the subtrees hanging below
+    worsened tree edges, are visited. Only works for graphs with positive weights.
+    """
+    def __init__(self, graph, source_key):
+        """
+        Runs Dijkstra from source_key and acquires the current version of the
+        change log of graph, which is released by close.
+        :param graph: the Graph
+        :param source_key: the key of the source vertex
+        """
+        self.graph = graph
+        self.source = source_key
+        # the version read by the next update, in a list shared with the finalizer
+        self._version = [graph.acquire()]
+        self._close = weakref.finalize(self, self._release, graph, self._version)
+        result = graph.dijkstra(source_key)
+        self.dist = list(result.dist)
+        self.predecessor = array('q', result.predecessors)
+        # in-edges shared with the graph and the other trackers, kept up to date by the graph
+        self._in = graph.in_edges()
+        # vertices and shortest path tree children by index
+        self._vertices = []
+        self._children = []
+        self._grow()
+        for v, p in enumerate(self.predecessor):
+            if p >= 0:
+                self._children[p].add(v)
+
+    @staticmethod
+    def _release(graph, version):
+        graph.release(version[0])
+
+    def close(self):
+        """
+        Stops following the graph and lets it drop the changes kept for this tracker.
+        Also done when the tracker is garbage collected.
+        """
+        self._close()
+
+    def _grow(self):
+        """
+        Extends the arrays with the vertices added to the graph since the last update.
+        """
+        for key in self.graph._keys[len(self._vertices):]:
+            self._vertices.append(self.graph.get_vertex(key))
+            self._children.append(set())
+        missing = len(self._vertices) - len(self.dist)
+        self.dist.extend([INFINITY] * missing)
+        self.predecessor.extend(array('q', [-1]) * missing)
+
+    def _set_predecessor(self, v, u):
+        """
+        Moves v below u in the shortest path tree, u = -1 detaches v.
+        """
+        old = self.predecessor[v]
+        if old >= 0:
+            self._children[old].discard(v)
+        self.predecessor[v] = u
+        if u >= 0:
+            self._children[u].add(v)
+
+    def update(self):
+        """
+        Repairs the distances and the tree after the changes made to the graph
+        since the last update.
+        :return: the number of vertices whose distance was recomputed
+        """
+        if not self._close.alive:
+            raise ValueError("The tracker is closed.")
+        graph = self.graph
+        # vertices added without edges are unreachable but still part of the result
+        self._grow()
+        changes = graph.changes_since(self._version[0])
+        if not changes:
+            return 0
+        version = graph.acquire()
+        graph.release(self._version[0])
+        self._version[0] = version
+        index_of = graph.index_of
+        dist, predecessor, in_edges = self.dist, self.predecessor, self._in
+        vertices = self._vertices
+        worsened = []
+        improved = []
+        for change in changes:
+            u, v = index_of(change.source), index_of(change.target)
+            if change.old_weight is None or (change.new_weight is not None and change.new_weight < change.old_weight):
+                improved.append((u, v))
+            elif predecessor[v] == u:
+                worsened.append(v)
+        # the vertices whose tree path used a worsened edge
+        affected = set()
+        stack = worsened
+        while stack:
+            x = stack.pop()
+            if x not in affected:
+                affected.add(x)
+                stack.extend(self._children[x])
+        heap = []
+        for x in affected:
+            dist[x] = INFINITY
+            self._set_predecessor(x, -1)
+        for x in affected:
+            for vertex, weight in in_edges[x].items():
+                y = vertex.index
+                if y not in affected and dist[y] != INFINITY and dist[y] + weight < dist[x]:
+                    dist[x] = dist[y] + weight
+                    self._set_predecessor(x, y)
+            if dist[x] != INFINITY:
+                heappush(heap, (dist[x], x))
+        for u, v in improved:
+            weight = vertices[u].connected_to.get(vertices[v])
+            if weight is not None and dist[u] != INFINITY and dist[u] + weight < dist[v]:
+                dist[v] = dist[u] + weight
+                self._set_predecessor(v, u)
+                heappush(heap, (dist[v], v))
+        # Dijkstra restricted to the vertices reached from the changed ones
+        settled = 0
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue
+            settled += 1
+            for v, weight in vertices[u].connected_to.items():
+                nd = d + weight
+                if nd < dist[v.index]:
+                    dist[v.index] = nd
+                    self._set_predecessor(v.index, u)
+                    heappush(heap, (nd, v.index))
+        return settled
+
+    def result(self):
+        """
+        Brings the tree up to date with the graph.
+        :return: ShortestPathResult over the live arrays, changed in place by later updates
+        """
+        self.update()
+        return ShortestPathResult(self.source, self.graph._keys, self.graph.index_of,
+                                  self.dist, self.predecessor)
@@ -1,10 +1,22 @@
 """
 Graphs Module
 """
-import queue
-import sys
-from datastructures.heap import MutablePriorityQueue
-
+from array import array
+from collections import deque, namedtuple
+from heapq import heappush, heappop
+from operator import itemgetter
+from datastructures.disjoint_set import DisjointSet
+from datastructures.heap import IndexedPriorityQueue
+from algorithms.graphs import traversal
+from algorithms.graphs.all_pairs import all_pairs_shortest_paths
+from algorithms.graphs.csr_graph import CSRGraph
+from algorithms.graphs.dynamic_shortest_paths import DynamicShortestPaths
+from algorithms.graphs.shortest_paths import INFINITY, ShortestPathResult
+
+
+# Change of the directed edge from source to target, a weight of None means no edge.
+# Undirected edges are recorded in both directions.
+EdgeChange = namedtuple("EdgeChange", ["source", "target", "old_weight", "new_weight"])
 
 # Colors used by the search algorithms
 WHITE = 0
@@ -13,13 +25,12 @@ GRAY = 2
 
 
 class Vertex:
-    def __init__(self, key):
+    def __init__(self, key, index=0):
         self.id = key
+        # position of this vertex in the arrays used by the graph algorithms
+        self.index = index
         # map from a neighbour vertex to the weight of the edge
         self.connected_to = {}
-        # maps a distance from a source vertex to this vertex
-        # ex: dist[neighbour_1] = 4 => dist(neighbour_1, self) = 4
-        self.dist = {}
         # color of this vertex for search algorithms, initialized as WHITE
         self.color = WHITE
         # predecessor, initialized as None
@@ -60,6 +71,18 @@ class Vertex:
 class Graph:
     def __init__(self, directed=True):
         self.vertices = {}
+        # maps the index of a vertex to its key
+        self._keys = []
+        # in-edges of every vertex, built on demand and then kept up to date by every change
+        self._reverse = None
+        # EdgeChange of every insertion, deletion and weight change of an edge,
+        # None until track_changes or acquire is called, without the first _base released changes
+        self._changes = None
+        self._base = 0
+        # number of readers holding each version of the change log
+        self._pins = {}
+        # True once track_changes is called, the log is then never compacted
+        self._tracked = False
         self.num_vertices = 0
         self.directed = directed
 
@@ -83,6 +106,13 @@ class Graph:
         else:
             raise KeyError("No Vertex with that key.")
 
+    def index_of(self, key):
+        """
+        :param key: key of the vertex
+        :return: the index of the vertex, or raises KeyError
+        """
+        return self.get_vertex(key).index
+
     def get_vertices(self):
         """
         :return: the keys of the vertices in the graph
@@ -102,11 +132,17 @@ class Graph:
     def add_vertex(self, key):
         """
         Adds a vertex with the specified key to the graph.
+        Does nothing if the graph already contains the key.
         :param key: the key of the vertex
         """
+        if key in self.vertices:
+            return
+        new_vertex = Vertex(key, self.num_vertices)
         self.num_vertices += 1
-        new_vertex = Vertex(key)
         self.vertices[key] = new_vertex
+        self._keys.append(key)
+        if self._reverse is not None:
+            self._reverse.append({} if self.directed else new_vertex.connected_to)
 
     def add_edges(self, edges: list):
         """
@@ -129,14 +165,137 @@ class Graph:
             self.add_vertex(vertex_1)
         if vertex_2 not in self.vertices:
             self.add_vertex(vertex_2)
-        if len(cost) == 0:
-            self.vertices[vertex_1].add_neighbour(self.vertices[vertex_2], 0)
-            if not self.directed:
-                self.vertices[vertex_2].add_neighbour(self.vertices[vertex_1], 0)
+        weight = cost[0] if cost else 0
+        self._set_weight(self.vertices[vertex_1], self.vertices[vertex_2], weight)
+        if not self.directed:
+            self._set_weight(self.vertices[vertex_2], self.vertices[vertex_1], weight)
+
+    def remove_edge(self, key_1, key_2):
+        """
+        Removes the edge from key_1 to key_2 (and back for undirected graphs).
+        Raises KeyError if there is no such edge.
+        :param key_1: key of the first vertex
+        :param key_2: key of the second vertex
+        """
+        vertex_1, vertex_2 = self.get_vertex(key_1), self.get_vertex(key_2)
+        if vertex_2 not in vertex_1.connected_to:
+            raise KeyError("No Edge between those keys.")
+        self._set_weight(vertex_1, vertex_2, None)
+        if not self.directed and vertex_1 is not vertex_2:
+            self._set_weight(vertex_2, vertex_1, None)
+
+    def _set_weight(self, u: Vertex, v: Vertex, weight):
+        """
+        Sets the weight of the directed edge from u to v and records the change.
+        :param weight: the new weight, None removes the edge
+        """
+        old_weight = u.connected_to.get(v)
+        if weight is None:
+            del u.connected_to[v]
         else:
-            self.vertices[vertex_1].add_neighbour(self.vertices[vertex_2], cost[0])
-            if not self.directed:
-                self.vertices[vertex_2].add_neighbour(self.vertices[vertex_1], cost[0])
+            u.add_neighbour(v, weight)
+        if old_weight != weight:
+            # the reversed adjacency of an undirected graph is the adjacency itself
+            if self._reverse is not None and self.directed:
+                if weight is None:
+                    del self._reverse[v.index][u]
+                else:
+                    self._reverse[v.index][u] = weight
+            if self._changes is not None:
+                self._changes.append(EdgeChange(u.get_id(), v.get_id(), old_weight, weight))
+
+    def track_changes(self):
+        """
+        Starts recording the edge changes in the change log, if not done yet.
+        The readers of version and changes_since are not known to the graph,
+        so from now on every change is kept, whatever is released.
+        """
+        self._tracked = True
+        self._start_log()
+
+    def _start_log(self):
+        """
+        Creates the empty change log, if not done yet.
+        """
+        if self._changes is None:
+            self._changes = []
+
+    @property
+    def version(self):
+        """
+        :return: the number of edge changes recorded so far
+        """
+        if self._changes is None:
+            raise ValueError("The changes of the graph are not tracked.")
+        return self._base + len(self._changes)
+
+    def changes_since(self, version):
+        """
+        :param version: a previous value of self.version, not released since
+        :return: list of the EdgeChange recorded since then, in order
+        """
+        if self._changes is None:
+            raise ValueError("The changes of the graph are not tracked.")
+        if version < self._base:
+            raise ValueError("The changes since that version were released.")
+        return self._changes[version - self._base:]
+
+    def acquire(self):
+        """
+        Starts tracking the changes if needed and keeps the changes made from
+        the current version on until it is released. Unlike track_changes,
+        lets the graph drop the changes that no acquired version needs.
+        :return: the current version
+        """
+        self._start_log()
+        version = self.version
+        self._pins[version] = self._pins.get(version, 0) + 1
+        return version
+
+    def release(self, version):
+        """
+        Gives back a version returned by acquire. Unless track_changes was called,
+        the changes older than every version still acquired are dropped from the change log.
+        :param version: the version returned by acquire
+        """
+        count = self._pins.pop(version)
+        if count > 1:
+            self._pins[version] = count - 1
+        if self._tracked:
+            return
+        oldest = min(self._pins, default=self.version)
+        # drop in bulk so that compacting stays amortised O(1) per change
+        released = oldest - self._base
+        if released and 2 * released >= len(self._changes):
+            del self._changes[:released]
+            self._base = oldest
+
+    def in_edges(self):
+        """
+        Builds the reversed adjacency on the first call, later changes of
+        the graph update it in place.
+        :return: list indexed by vertex index of dicts mapping every
+                 in-neighbour vertex to the weight of the edge
+        """
+        if self._reverse is None:
+            if self.directed:
+                reverse = [{} for _ in range(self.num_vertices)]
+                for u in self:
+                    for v, weight in u.connected_to.items():
+                        reverse[v.index][u] = weight
+            else:
+                reverse = [self.vertices[key].connected_to for key in self._keys]
+            self._reverse = reverse
+        return self._reverse
+
+    def freeze(self):
+        """
+        Packs the graph into a read-only CSRGraph snapshot.
+        Later changes to this graph are not reflected in the snapshot.
+        Raises TypeError if a weight is not a real number.
+        :return: the CSRGraph
+        """
+        return CSRGraph.from_graph(self)
 
     ###################################
     # Search algorithms for the graph #
@@ -154,156 +313,550 @@ class Graph:
                 return True
         return False
 
-    def print_path(self, key_source, key_destination):
+    @staticmethod
+    def print_path(result: ShortestPathResult, key_destination):
         """
-        Prints the path from source to destination if it exists.
-        Assumes that the predecessor have been computed.
-        :param key_source: key of source vertex
+        Prints the path from the source of result to destination if it exists.
+        :param result: the result of a shortest path algorithm
         :param key_destination: key of destination vertex
         """
-        source = self.get_vertex(key_source)
-        destination = self.get_vertex(key_destination)
-        self._print_path_util(source, destination)
+        path = result.path_to(key_destination)
+        if path is None:
+            print("No path from {} to {} exists!".format(result.source, key_destination))
+        else:
+            print(" ".join(str(key) for key in path), end=" ")
 
-    def _print_path_util(self, source, destination):
+    def _result(self, source, dist, predecessor):
         """
-        Main print path algorithm.
-        :param source: source vertex
-        :param destination: destination vertex
+        :return: the ShortestPathResult for the given source, distance and predecessor arrays
         """
-        if source is destination:
-            print(source.get_id(), end=" ")
-        elif destination.predecessor is None:
-            print("No path from {} to {} exists!".format(source.get_id(), destination.get_id()))
-        else:
-            self._print_path_util(source, destination.predecessor)
-            print(destination.get_id(), end=" ")
+        return ShortestPathResult(source.get_id(), self._keys, self.index_of, dist, predecessor)
+
+    def _from_frozen(self, result):
+        """
+        :param result: ShortestPathResult of a search on the CSRGraph of this graph
+        :return: the same result with INFINITY as the distance of unreachable vertices
+        """
+        dist = result.dist
+        if result.infinity != INFINITY:
+            dist = [INFINITY if d == result.infinity else d for d in dist]
+        return ShortestPathResult(result.source, self._keys, self.index_of, dist, result.predecessors)
 
     def bfs(self, source_key):
         """
         Runs the BFS algorithm from source_key and computes
         the shortest number of edges from the source to all
         other vertices and predecessor of every vertex.
+        The graph itself is not modified.
         :param source_key: the key of the source vertex
+        :return: the ShortestPathResult
         """
         source: Vertex = self.get_vertex(source_key)
-        for u in self:
-            if u is not source:
-                u.color = WHITE
-                u.predecessor = None
-                # initialize the distance from the source
-                u.dist[source] = sys.maxsize
-        source.color = GRAY
-        source.dist[source] = 0
-        source.predecessor = None
-        # initialize queue with max size number of vertices
-        q = queue.Queue(self.num_vertices)
-        q.put(source)
-        while not q.empty():
-            u: Vertex = q.get()
+        dist = array('q', [INFINITY]) * self.num_vertices
+        predecessor = array('q', [-1]) * self.num_vertices
+        dist[source.index] = 0
+        q = deque([source])
+        while q:
+            u: Vertex = q.popleft()
             for v in u.get_connections():
-                if v.color is WHITE:
-                    v.color = GRAY
-                    v.dist[source] = u.dist[source] + 1
-                    v.predecessor = u
-                    q.put(v)
-            u.color = BLACK
+                if dist[v.index] == INFINITY:
+                    dist[v.index] = dist[u.index] + 1
+                    predecessor[v.index] = u.index
+                    q.append(v)
+        return self._result(source, dist, predecessor)
+
+    def _sources(self, sources):
+        """
+        :param sources: keys of vertices, all vertices if None
+        :return: the indices of the vertices
+        """
+        if sources is None:
+            return range(self.num_vertices)
+        return [self.index_of(key) for key in sources]
+
+    def _adjacent(self):
+        """
+        :return: function mapping the index of a vertex to the indices of its neighbours
+        """
+        vertices = [self.vertices[key] for key in self._keys]
+        return lambda i: (v.index for v in vertices[i].connected_to)
+
+    def iter_bfs(self, sources=None, depth_limit=None, edges=True):
+        """
+        Iterative Breadth First Search that streams traversal events,
+        see traversal.iter_bfs. The graph itself is not modified.
+        :param sources: keys of the start vertices, all vertices if None
+        :param depth_limit: vertices at this depth are not expanded, None for no limit
+        :param edges: also emit edge events
+        :return: generator of TraversalEvent
+        """
+        return traversal.iter_bfs(self._keys, self._adjacent(), self._sources(sources),
+                                  self.directed, depth_limit, edges)
+
+    def iter_dfs(self, sources=None, depth_limit=None, edges=True):
+        """
+        Iterative Depth First Search that streams traversal events with
+        classified edges, see traversal.iter_dfs. The graph itself is not modified.
+        :param sources: keys of the start vertices, all vertices if None
+        :param depth_limit: vertices at this depth are not expanded, None for no limit
+        :param edges: also emit edge events
+        :return: generator of TraversalEvent
+        """
+        return traversal.iter_dfs(self._keys, self._adjacent(), self._sources(sources),
+                                  self.directed, depth_limit, edges)
 
     def dfs(self):
         """
         Runs Depth First Search on this graph.
+        Sets the color and predecessor of every vertex.
+        :return: the keys of the vertices in discovery order
         """
         for u in self:
             u.color = WHITE
             u.predecessor = None
+        order = []
         for u in self:
             if u.color is WHITE:
-                self.dfs_visit(u)
+                self.dfs_visit(u, order)
+        return order
 
-    def dfs_visit(self, u: Vertex):
+    def dfs_visit(self, u: Vertex, order=None):
         """
-        Explores a Vertex u. Called by dfs
+        Explores a Vertex u with an explicit stack. Called by dfs
         :param u: the explored vertex
+        :param order: list the keys of the discovered vertices are appended to
+        :return: order
         """
-        print(u.get_id(), end=" ")
+        if order is None:
+            order = []
+        order.append(u.get_id())
         u.color = GRAY
-        for v in u.get_connections():
-            if v.color is WHITE:
-                v.predecessor = u
-                self.dfs_visit(v)
-        u.color = BLACK
+        stack = [(u, iter(u.get_connections()))]
+        while stack:
+            u, neighbours = stack[-1]
+            for v in neighbours:
+                if v.color is WHITE:
+                    v.predecessor = u
+                    order.append(v.get_id())
+                    v.color = GRAY
+                    stack.append((v, iter(v.get_connections())))
+                    break
+            else:
+                stack.pop()
+                u.color = BLACK
+        return order
 
     def initialize_single_source(self, source):
         """
         Initialization method used by single source shortest path algorithms.
         :param source: the source vertex
+        :return: (dist, predecessor) arrays indexed by vertex index
         """
-        for v in self:
-            v.dist[source] = sys.maxsize
-            v.predecessor = None
-        source.dist[source] = 0
+        dist = [INFINITY] * self.num_vertices
+        predecessor = array('q', [-1]) * self.num_vertices
+        dist[source.index] = 0
+        return dist, predecessor
 
     @staticmethod
-    def relax(source, u, v, weight):
+    def relax(dist, predecessor, u, v, weight):
         """
         Performs a relaxation operation for u and v.
-        :param source: source of the shortest path algorithm
+        :param dist: distance array of the shortest path algorithm
+        :param predecessor: predecessor array of the shortest path algorithm
         :param u: vertex 1
         :param v: vertex 2
         :param weight: weight of the edge between u and v
+        :return: True if the distance of v decreased
         """
-        if v.dist[source] > u.dist[source] + weight:
-            v.dist[source] = u.dist[source] + weight
-            v.predecessor = u
+        if dist[u.index] != INFINITY and dist[v.index] > dist[u.index] + weight:
+            dist[v.index] = dist[u.index] + weight
+            predecessor[v.index] = u.index
+            return True
+        return False
 
     @staticmethod
-    def relax_with_priority_update(source, u, v, weight, priority_queue):
+    def relax_with_priority_update(dist, predecessor, u, v, weight, priority_queue):
         """
         Performs a relaxation operation for u and v.
         Updates the priority queue with a new key for v
-        :param source: source of the shortest path algorithm
+        :param dist: distance array of the shortest path algorithm
+        :param predecessor: predecessor array of the shortest path algorithm
         :param u: vertex 1
         :param v: vertex 2
         :param weight: weight of the edge between u and v
         :param priority_queue: to be updated
         """
-        if v.dist[source] > u.dist[source] + weight:
-            v.dist[source] = u.dist[source] + weight
-            v.predecessor = u
-            priority_queue.add_task(v, v.dist[source])
+        if Graph.relax(dist, predecessor, u, v, weight):
+            priority_queue.add_task(v, dist[v.index])
 
-    def bellman_ford(self, source_key):
+    def bellman_ford(self, source_key, algorithm="bellman_ford"):
         """
         Applies the Bellman-Ford shortest path algorithm from source_key.
-        Only works for graphs that do not contain a negative weight cycle.
-        If a negative weight cycle is found, the method raises a ValueError.
+        The graph is packed once into a CSRGraph, so every pass runs over compact
+        edge arrays, and the passes stop as soon as one changes nothing.
+        If a negative weight cycle is reachable from the source, the method raises
+        a NegativeCycleError (a ValueError) whose cycle attribute holds the cycle.
         :param source_key: the key of the source vertex
+        :param algorithm: "bellman_ford", or "spfa" for the queue based variant
+        :return: the ShortestPathResult
         """
-        source: Vertex = self.get_vertex(source_key)
-        self.initialize_single_source(source)
-        for _ in range(self.num_vertices - 1):
-            for edge in self.get_edges():
-                self.relax(source, edge[0], edge[1], edge[2])
-        for edge in self.get_edges():
-            if edge[1].dist[source] > edge[0].dist[source] + edge[2]:
-                raise ValueError("Negative Weight Cycle Found")
+        return self._from_frozen(self.freeze().bellman_ford(source_key, algorithm))
 
-    def dijkstra(self, source_key):
+    def find_negative_cycle(self):
+        """
+        :return: the keys of the vertices of a negative weight cycle in edge order, or None
+        """
+        return self.freeze().find_negative_cycle()
+
+    def dijkstra(self, source_key, target_key=None, queue_class=IndexedPriorityQueue):
         """
         Applies the Dijkstra shortest path algorithm from source_key.
         Only works for graphs with positive weights.
+        Vertices enter the priority queue when they are first discovered.
+        If target_key is given, the search stops as soon as the target is settled:
+        its distance and path are final, the other distances may be tentative.
+        :param source_key: the key of the source vertex
+        :param target_key: optional key of the target vertex
+        :param queue_class: priority queue with the add_task/pop_task/empty interface,
+                            PairingHeap or FibonacciHeap have O(1) decrease-keys for dense graphs
+        :return: the ShortestPathResult
+        """
+        source: Vertex = self.get_vertex(source_key)
+        target = None if target_key is None else self.get_vertex(target_key)
+        dist, predecessor = self.initialize_single_source(source)
+        priority_queue = queue_class()
+        priority_queue.add_task(source, 0)
+        while not priority_queue.empty():
+            u: Vertex = priority_queue.pop_task()
+            if u is target:
+                break
+            for v in u.get_connections():
+                self.relax_with_priority_update(dist, predecessor, u, v, u.get_weight(v), priority_queue)
+        return self._result(source, dist, predecessor)
+
+    def dynamic_shortest_paths(self, source_key):
+        """
+        Computes the shortest paths from source_key and keeps them up to date
+        incrementally as edges of this graph change, see DynamicShortestPaths.
+        :param source_key: the key of the source vertex
+        :return: the DynamicShortestPaths, call its result() method after changes
+                 and its close() method when done
+        """
+        return DynamicShortestPaths(self, source_key)
+
+    def bidirectional_dijkstra(self, source_key, target_key):
+        """
+        Point to point Dijkstra that searches forward from the source and
+        backward from the target at the same time, and stops when the two
+        searches meet. Only works for graphs with positive weights.
+        :param source_key: the key of the source vertex
+        :param target_key: the key of the target vertex
+        :return: the ShortestPathResult, final for the vertices on the path to the target
+        """
+        source: Vertex = self.get_vertex(source_key)
+        target: Vertex = self.get_vertex(target_key)
+        dist, predecessor = self.initialize_single_source(source)
+        if source is target:
+            return self._result(source, dist, predecessor)
+        dist_back, successor = self.initialize_single_source(target)
+        reverse = self.in_edges()
+        forward = [(0, source.index, source)]
+        backward = [(0, target.index, target)]
+        settled, settled_back = set(), set()
+        # length of the best path found so far and the vertex where it meets
+        best, meeting = INFINITY, None
+        while forward and backward and forward[0][0] + backward[0][0] < best:
+            # expand the smaller frontier
+            if len(forward) <= len(backward):
+                d, _, u = heappop(forward)
+                if u.index in settled:
+                    continue
+                settled.add(u.index)
+                neighbours = u.connected_to
+                heap, own, other, links = forward, dist, dist_back, predecessor
+            else:
+                d, _, u = heappop(backward)
+                if u.index in settled_back:
+                    continue
+                settled_back.add(u.index)
+                neighbours = reverse[u.index]
+                heap, own, other, links = backward, dist_back, dist, successor
+            for v, weight in neighbours.items():
+                nd = d + weight
+                if nd < own[v.index]:
+                    own[v.index] = nd
+                    links[v.index] = u.index
+                    heappush(heap, (nd, v.index, v))
+                if other[v.index] != INFINITY and nd + other[v.index] < best:
+                    best, meeting = nd + other[v.index], v.index
+        if meeting is not None:
+            # splice the backward half of the path into the forward result
+            i = meeting
+            while i != target.index:
+                j = successor[i]
+                predecessor[j] = i
+                dist[j] = best - dist_back[j]
+                i = j
+        return self._result(source, dist, predecessor)
+
+    def a_star(self, source_key, target_key, heuristic, queue_class=IndexedPriorityQueue):
+        """
+        A* search from source_key to target_key.
+        Only works for graphs with positive weights. The heuristic must never
+        overestimate the distance to the target (and should be consistent),
+        otherwise the returned path may not be the shortest one.
         :param source_key: the key of the source vertex
+        :param target_key: the key of the target vertex
+        :param heuristic: function mapping a vertex key to a lower bound of its distance to the target
+        :param queue_class: priority queue with the add_task/pop_task/empty interface
+        :return: the ShortestPathResult, final for the vertices on the path to the target
         """
         source: Vertex = self.get_vertex(source_key)
-        self.initialize_single_source(source)
-        priority_queue = MutablePriorityQueue()
-        for v_key in self.get_vertices():
-            v: Vertex = self.get_vertex(v_key)
-            priority_queue.add_task(v, v.dist[source])
+        target: Vertex = self.get_vertex(target_key)
+        dist, predecessor = self.initialize_single_source(source)
+        priority_queue = queue_class()
+        priority_queue.add_task(source, heuristic(source_key))
         while not priority_queue.empty():
             u: Vertex = priority_queue.pop_task()
+            if u is target:
+                break
             for v in u.get_connections():
-                self.relax_with_priority_update(source, u, v, u.get_weight(v), priority_queue)
+                if self.relax(dist, predecessor, u, v, u.get_weight(v)):
+                    priority_queue.add_task(v, dist[v.index] + heuristic(v.get_id()))
+        return self._result(source, dist, predecessor)
+
+    def all_pairs_shortest_paths(self, sources=None, workers=None, algorithm="dijkstra"):
+        """
+        Runs a single source shortest path algorithm from every source on a
+        process pool sharing a frozen copy of this graph.
+        :param sources: keys of the source vertices, all vertices if None
+        :param workers: number of worker processes, 1 runs in this process,
+                        None uses one worker per CPU
+        :param algorithm: "dijkstra", "bellman_ford", "spfa", "bfs" or "johnson" (for negative edges)
+        :return: generator of ShortestPathResult, in the order of sources
+        """
+        results = all_pairs_shortest_paths(self, sources, workers, algorithm)
+        return (self._from_frozen(result) for result in results)
+
+    ##################################
+    # Spanning trees and components #
+    ##################################
+
+    def _adjacency(self):
+        """
+        :return: list indexed by vertex index of the lists of neighbour indices
+        """
+        vertices = self.vertices
+        return [[v.index for v in vertices[key].connected_to] for key in self._keys]
+
+    def kruskal(self):
+        """
+        Kruskal's minimum spanning tree algorithm, with a DisjointSet of the vertices.
+        Edges are considered undirected. For a disconnected graph
+        the result is a minimum spanning forest.
+        :return: list of the (key_1, key_2, weight) edges of the tree
+        """
+        edges = [(weight, u.index, v.index) for u in self for v, weight in u.connected_to.items()]
+        edges.sort(key=itemgetter(0))
+        components = DisjointSet(self.num_vertices)
+        keys = self._keys
+        tree = []
+        for weight, u, v in edges:
+            if components.union(u, v):
+                tree.append((keys[u], keys[v], weight))
+                if components.num_sets == 1:
+                    break
+        return tree
+
+    def prim(self, root_key=None, queue_class=IndexedPriorityQueue):
+        """
+        Prim's minimum spanning tree algorithm for undirected graphs.
+        A vertex stays in the priority queue with the weight of its lightest
+        edge to the tree, which is decreased in place.
+        :param root_key: key of the first vertex, all components are spanned if None
+        :param queue_class: priority queue with the add_task/pop_task/empty interface
+        :return: list of the (parent key, key, weight) edges of the tree
+        """
+        n = self.num_vertices
+        best = [INFINITY] * n
+        parent = array('q', [-1]) * n
+        in_tree = bytearray(n)
+        keys = self._keys
+        tree = []
+        roots = self if root_key is None else [self.get_vertex(root_key)]
+        for root in roots:
+            if in_tree[root.index]:
+                continue
+            priority_queue = queue_class()
+            priority_queue.add_task(root, 0)
+            while not priority_queue.empty():
+                u: Vertex = priority_queue.pop_task()
+                in_tree[u.index] = 1
+                if parent[u.index] >= 0:
+                    tree.append((keys[parent[u.index]], u.get_id(), best[u.index]))
+                for v, weight in u.connected_to.items():
+                    if not in_tree[v.index] and weight < best[v.index]:
+                        best[v.index] = weight
+                        parent[v.index] = u.index
+                        priority_queue.add_task(v, weight)
+        return tree
+
+    def connected_components(self):
+        """
+        Connected components with union-find. Edges are considered undirected,
+        so for directed graphs these are the weakly connected components.
+        :return: list of the components, as lists of keys
+        """
+        components = DisjointSet(self.num_vertices)
+        for u in self:
+            for v in u.connected_to:
+                components.union(u.index, v.index)
+        keys = self._keys
+        return [[keys[i] for i in members] for members in components.sets().values()]
+
+    def strongly_connected_components(self, algorithm="tarjan"):
+        """
+        Strongly connected components, without recursion.
+        :param algorithm: "tarjan" (one DFS) or "kosaraju" (a DFS on the graph
+                          and one on the reversed graph)
+        :return: list of the components, as lists of keys, in reverse topological
+                 order of the condensation for tarjan and in topological order for kosaraju
+        """
+        if algorithm == "tarjan":
+            components = self._tarjan(self._adjacency())
+        elif algorithm == "kosaraju":
+            components = self._kosaraju(self._adjacency())
+        else:
+            raise ValueError("Unknown strongly connected components algorithm: {}".format(algorithm))
+        keys = self._keys
+        return [[keys[i] for i in members] for members in components]
+
+    @staticmethod
+    def _tarjan(adjacency):
+        """
+        Tarjan's algorithm with an explicit stack of (vertex, position of the next edge).
+        :param adjacency: lists of neighbour indices
+        :return: list of the components, as lists of indices
+        """
+        n = len(adjacency)
+        index = array('q', [-1]) * n
+        low = array('q', [0]) * n
+        on_stack = bytearray(n)
+        stack = []
+        components = []
+        counter = 0
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            call_stack = [(root, 0)]
+            while call_stack:
+                u, e = call_stack[-1]
+                neighbours = adjacency[u]
+                if e < len(neighbours):
+                    call_stack[-1] = (u, e + 1)
+                    v = neighbours[e]
+                    if index[v] < 0:
+                        index[v] = low[v] = counter
+                        counter += 1
+                        stack.append(v)
+                        on_stack[v] = 1
+                        call_stack.append((v, 0))
+                    elif on_stack[v] and index[v] < low[u]:
+                        low[u] = index[v]
+                    continue
+                call_stack.pop()
+                if call_stack:
+                    p = call_stack[-1][0]
+                    if low[u] < low[p]:
+                        low[p] = low[u]
+                if low[u] == index[u]:
+                    # u is the root of a component
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component.append(w)
+                        if w == u:
+                            break
+                    components.append(component)
+        return components
+
+    @staticmethod
+    def _kosaraju(adjacency):
+        """
+        Kosaraju's algorithm with iterative DFS.
+        :param adjacency: lists of neighbour indices
+        :return: list of the components, as lists of indices
+        """
+        n = len(adjacency)
+        reverse = [[] for _ in range(n)]
+        for u, neighbours in enumerate(adjacency):
+            for v in neighbours:
+                reverse[v].append(u)
+        # vertices in increasing order of finishing time
+        finished = []
+        visited = bytearray(n)
+        for root in range(n):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            stack = [(root, iter(adjacency[root]))]
+            while stack:
+                u, neighbours = stack[-1]
+                for v in neighbours:
+                    if not visited[v]:
+                        visited[v] = 1
+                        stack.append((v, iter(adjacency[v])))
+                        break
+                else:
+                    stack.pop()
+                    finished.append(u)
+        components = []
+        assigned = bytearray(n)
+        for root in reversed(finished):
+            if assigned[root]:
+                continue
+            assigned[root] = 1
+            component = [root]
+            stack = [root]
+            while stack:
+                u = stack.pop()
+                for v in reverse[u]:
+                    if not assigned[v]:
+                        assigned[v] = 1
+                        component.append(v)
+                        stack.append(v)
+            components.append(component)
+        return components
+
+    def topological_sort(self):
+        """
+        Kahn's topological sort of a directed acyclic graph.
+        If the graph has a cycle, the method raises a ValueError.
+        :return: list of the keys in topological order
+        """
+        adjacency = self._adjacency()
+        in_degree = array('q', [0]) * self.num_vertices
+        for neighbours in adjacency:
+            for v in neighbours:
+                in_degree[v] += 1
+        ready = deque(i for i in range(self.num_vertices) if in_degree[i] == 0)
+        order = []
+        while ready:
+            u = ready.popleft()
+            order.append(u)
+            for v in adjacency[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    ready.append(v)
+        if len(order) < self.num_vertices:
+            raise ValueError("Cycle Found")
+        keys = self._keys
+        return [keys[i] for i in order]
 
 
 if __name__ == "__main__":
@@ -321,11 +874,9 @@ if __name__ == "__main__":
     g.add_edge(5, 2, 1)
     for g_edge in g.get_edges():
         print("({}, {}) with weight {}".format(g_edge[0].get_id(), g_edge[1].get_id(), g_edge[2]))
-    g.bfs(0)
-    s = g.get_vertex(0)
-    for vertex in g:
-        print("Shortest number of edges from 0 to {}: {}".format(vertex.get_id(), vertex.dist[s]))
-    g.dijkstra(0)
-    s = g.get_vertex(0)
-    for vertex in g:
-        print("Shortest path from 0 to {}: {}".format(vertex.get_id(), vertex.dist[s]))
+    bfs_result = g.bfs(0)
+    for key, distance in bfs_result.items():
+        print("Shortest number of edges from 0 to {}: {}".format(key, distance))
+    dijkstra_result = g.dijkstra(0)
+    for key, distance in dijkstra_result.items():
+        print("Shortest path from 0 to {}: {} via {}".format(key, distance, dijkstra_result.path_to(key)))
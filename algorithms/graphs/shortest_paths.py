@@ -0,0 +1,111 @@
+"""
+Shortest Path Results Module
+"""
+from collections.abc import Mapping
+from itertools import islice
+import sys
+
+
+# distance of the vertices that cannot be reached from the source
+INFINITY = sys.maxsize
+
+
+class NegativeCycleError(ValueError):
+    """
+    Raised by the shortest path algorithms when the graph has a negative weight cycle.
+    """
+    def __init__(self, cycle=None):
+        """
+        :param cycle: keys of the vertices of a negative weight cycle, in edge order
+        """
+        super().__init__("Negative Weight Cycle Found")
+        self.cycle = cycle
+
+    def __reduce__(self):
+        return NegativeCycleError, (self.cycle,)
+
+
+class ShortestPathResult(Mapping):
+    """
+    Result of a single source shortest path algorithm.
+    Maps the key of every vertex to its distance from the source.
+    Distances and predecessors are kept in index based arrays,
+    paths are only reconstructed when they are asked for.
+    """
+    def __init__(self, source, keys, index_of, dist, predecessor, infinity=INFINITY):
+        """
+        :param source: key of the source vertex
+        :param keys: sequence mapping a vertex index to its key
+        :param index_of: function mapping a vertex key to its index
+        :param dist: distance from the source for every vertex index
+        :param predecessor: predecessor index for every vertex index, -1 if none
+        :param infinity: the distance of unreachable vertices
+        """
+        self.source = source
+        self._keys = keys
+        self._index_of = index_of
+        self.dist = dist
+        self.predecessors = predecessor
+        self.infinity = infinity
+
+    def __getitem__(self, key):
+        return self.dist[self._index(key)]
+
+    def __iter__(self):
+        # the graph may have grown since the result was computed
+        return islice(self._keys, len(self.dist))
+
+    def __len__(self):
+        return len(self.dist)
+
+    def __repr__(self):
+        return "ShortestPathResult(source={!r}, {})".format(self.source, dict(self))
+
+    def _index(self, key):
+        """
+        :param key: key of a vertex
+        :return: the index of the vertex, or raises KeyError
+        """
+        i = self._index_of(key)
+        if i >= len(self.dist):
+            raise KeyError("No Vertex with that key.")
+        return i
+
+    def distance(self, key):
+        """
+        :param key: key of the destination vertex
+        :return: the distance from the source to the vertex
+        """
+        return self[key]
+
+    def reachable(self, key):
+        """
+        :param key: key of the destination vertex
+        :return: True if there is a path from the source to the vertex
+        """
+        return self[key] != self.infinity
+
+    def predecessor(self, key):
+        """
+        :param key: key of a vertex
+        :return: the key of the predecessor on the shortest path, None for the source and unreachable vertices
+        """
+        p = self.predecessors[self._index(key)]
+        return self._keys[p] if p >= 0 else None
+
+    def path_to(self, key):
+        """
+        Reconstructs the shortest path from the source to key.
+        :param key: key of the destination vertex
+        :return: list of keys from the source to key, or None if key is unreachable
+        """
+        i = self._index(key)
+        if self.dist[i] == self.infinity:
+            return None
+        path = []
+        predecessors = self.predecessors
+        while i >= 0:
+            path.append(self._keys[i])
+            i = predecessors[i]
+        path.reverse()
+        return path
@@ -0,0 +1,130 @@
+"""
+Iterative Graph Traversals
+Generators of traversal events over index based adjacencies, shared by
+Graph and CSRGraph. They use O(V) memory in arrays and never recurse,
+and stop as soon as the caller stops iterating.
+"""
+from array import array
+from collections import deque, namedtuple
+
+
+# kinds of vertex events
+DISCOVER = "discover"
+FINISH = "finish"
+# kinds of edge events
+TREE = "tree"
+BACK = "back"
+FORWARD = "forward"
+CROSS = "cross"
+# edges of a BFS that do not discover a vertex
+NON_TREE = "non_tree"
+
+
+# vertex events have neighbour None, edge events go from vertex to neighbour.
+# depth is the depth of vertex in the search tree.
+TraversalEvent = namedtuple("TraversalEvent", ["kind", "vertex", "neighbour", "depth"])
+
+
+def iter_bfs(keys, adjacent, sources, directed=True, depth_limit=None, edges=True):
+    """
+    Breadth First Search from every source that is not discovered yet.
+    A vertex is finished once all its out-edges have been scanned.
+    :param keys: sequence mapping a vertex index to its key
+    :param adjacent: function mapping a vertex index to the indices of its out-neighbours
+    :param sources: iterable of the indices of the start vertices
+    :param directed: False if every edge is stored in both directions,
+                     undirected NON_TREE edges are reported once
+    :param depth_limit: vertices at this depth are not expanded, None for no limit
+    :param edges: also emit TREE and NON_TREE edge events
+    :return: generator of TraversalEvent
+    """
+    n = len(keys)
+    depth = array('q', [-1]) * n
+    parent = array('q', [-1]) * n
+    finished = bytearray(n)
+    for s in sources:
+        if depth[s] >= 0:
+            continue
+        depth[s] = 0
+        yield TraversalEvent(DISCOVER, keys[s], None, 0)
+        q = deque([s])
+        while q:
+            u = q.popleft()
+            du = depth[u]
+            if depth_limit is None or du < depth_limit:
+                for v in adjacent(u):
+                    if depth[v] < 0:
+                        depth[v] = du + 1
+                        parent[v] = u
+                        if edges:
+                            yield TraversalEvent(TREE, keys[u], keys[v], du)
+                        yield TraversalEvent(DISCOVER, keys[v], None, du + 1)
+                        q.append(v)
+                    elif edges and (directed or (v != parent[u] and not finished[v])):
+                        yield TraversalEvent(NON_TREE, keys[u], keys[v], du)
+            finished[u] = 1
+            yield TraversalEvent(FINISH, keys[u], None, du)
+
+
+def iter_dfs(keys, adjacent, sources, directed=True, depth_limit=None, edges=True):
+    """
+    Depth First Search from every source that is not discovered yet, with an
+    explicit stack of neighbour iterators. Edges are classified as in the CLRS:
+    TREE edges discover a vertex, BACK edges go to an ancestor, FORWARD edges
+    to a descendant and CROSS edges to any other finished vertex.
+    Undirected graphs only have TREE and BACK edges, each reported once.
+    :param keys: sequence mapping a vertex index to its key
+    :param adjacent: function mapping a vertex index to the indices of its out-neighbours
+    :param sources: iterable of the indices of the start vertices
+    :param directed: False if every edge is stored in both directions
+    :param depth_limit: vertices at this depth are not expanded, None for no limit
+    :param edges: also emit edge events
+    :return: generator of TraversalEvent
+    """
+    n = len(keys)
+    # WHITE (0), GRAY (1) and BLACK (2) like the colors of the CLRS
+    state = bytearray(n)
+    discovered = array('q', [0]) * n
+    parent = array('q', [-1]) * n
+    time = 0
+    for root in sources:
+        if state[root]:
+            continue
+        state[root] = 1
+        discovered[root] = time
+        time += 1
+        yield TraversalEvent(DISCOVER, keys[root], None, 0)
+        stack = [(root, iter(adjacent(root)) if depth_limit != 0 else iter(()))]
+        while stack:
+            u, neighbours = stack[-1]
+            d = len(stack) - 1
+            for v in neighbours:
+                if state[v] == 0:
+                    state[v] = 1
+                    discovered[v] = time
+                    time += 1
+                    parent[v] = u
+                    if edges:
+                        yield TraversalEvent(TREE, keys[u], keys[v], d)
+                    yield TraversalEvent(DISCOVER, keys[v], None, d + 1)
+                    if depth_limit is None or d + 1 < depth_limit:
+                        stack.append((v, iter(adjacent(v))))
+                    else:
+                        stack.append((v, iter(())))
+                    break
+                if not edges:
+                    continue
+                if not directed:
+                    # the reverse of a tree edge, or the second copy of a back edge
+                    if v != parent[u] and state[v] == 1:
+                        yield TraversalEvent(BACK, keys[u], keys[v], d)
+                elif state[v] == 1:
+                    yield TraversalEvent(BACK, keys[u], keys[v], d)
+                elif discovered[u] < discovered[v]:
+                    yield TraversalEvent(FORWARD, keys[u], keys[v], d)
+                else:
+                    yield TraversalEvent(CROSS, keys[u], keys[v], d)
+            else:
+                stack.pop()
+                state[u] = 2
+                yield TraversalEvent(FINISH, keys[u], None, d)
@@ -0,0 +1,29 @@
+"""
+Process Pool shared by the parallel algorithms
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+
+def num_workers(workers=None):
+    """
+    :param workers: number of worker processes, None for one per CPU
+    :return: the number of worker processes to start
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+    return workers
+
+
+def process_pool(workers, initializer=None, initargs=()):
+    """
+    Creates a process pool with the default start method of the platform.
+    With spawn or forkserver the workers do not inherit the memory of this process,
+    so they must get their data from initargs (pickled once per worker), the tasks
+    or shared memory, never from globals set before the pool is created.
+    :param workers: number of worker processes
+    :param initializer: function run once by every worker when it starts
+    :param initargs: arguments of initializer
+    :return: the ProcessPoolExecutor
+    """
+    return ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs)
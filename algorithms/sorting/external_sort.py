@@ -0,0 +1,161 @@
+"""
+External merge sort for data that does not fit in memory
+"""
+from functools import partial
+import mmap
+import os
+import tempfile
+from algorithms.sorting.quicksort import quick_sort
+from datastructures.streaming import kway_merge
+
+# bytes of records kept in memory at once
+MEMORY_BUDGET = 64 << 20
+# number of runs merged at once
+FAN_IN = 16
+# marks the end of the records
+_END = object()
+
+
+class TextRuns:
+    """
+    Runs of text records, one per line. Records must not contain newlines.
+    """
+    def size(self, record):
+        return len(record) + 1
+
+    def write(self, path, records):
+        with open(path, "w") as f:
+            for record in records:
+                f.write(record)
+                f.write("\n")
+
+    def read(self, path):
+        with open(path) as f:
+            for line in f:
+                yield line[:-1]
+
+
+class BinaryRuns:
+    """
+    Runs of fixed width bytes records, read back through a memory map.
+    """
+    def __init__(self, record_size):
+        """
+        :param record_size: number of bytes of every record
+        """
+        if record_size <= 0:
+            raise ValueError("record_size must be positive.")
+        self.record_size = record_size
+
+    def size(self, record):
+        return self.record_size
+
+    def write(self, path, records):
+        with open(path, "wb") as f:
+            for record in records:
+                if len(record) != self.record_size:
+                    raise ValueError("Records must be exactly {} bytes.".format(self.record_size))
+                f.write(record)
+
+    def read(self, path):
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for i in range(0, len(view), self.record_size):
+                    yield bytes(view[i:i + self.record_size])
+            finally:
+                view.release()
+
+
+def external_sort(records, key=None, reverse=False, memory_budget=MEMORY_BUDGET, fan_in=FAN_IN,
+                  record_size=None, tmp_dir=None):
+    """
+    Sorts a stream of records that may be larger than memory.
+    Records are read in chunks of at most memory_budget bytes, every chunk is sorted
+    with quick_sort and spilled to a temporary file as a sorted run, and the runs are
+    merged fan_in at a time with kway_merge until one stream is left.
+    Input that fits in one chunk is never written to disk.
+    :param records: iterable of str records (without newlines), or bytes records if record_size is given
+    :param key: optional function computing the sort key of a record
+    :param reverse: sort in descending order
+    :param memory_budget: approximate number of bytes of records kept in memory
+    :param fan_in: maximum number of runs merged at once, at least 2
+    :param record_size: size of the fixed width bytes records, None for text records
+    :param tmp_dir: directory of the temporary run files, the system default if None
+    :return: generator of the sorted records
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+    runs = TextRuns() if record_size is None else BinaryRuns(record_size)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as directory:
+        paths = []
+        records = iter(records)
+        record = next(records, _END)
+        while record is not _END:
+            chunk, record = _read_chunk(record, records, runs, memory_budget)
+            quick_sort(chunk, key=key, reverse=reverse)
+            if not paths and record is _END:
+                # everything fits in memory
+                yield from chunk
+                return
+            paths.append(os.path.join(directory, "run{}".format(len(paths))))
+            runs.write(paths[-1], chunk)
+            del chunk
+        # merge passes until at most fan_in runs are left
+        count = len(paths)
+        while len(paths) > fan_in:
+            merged = []
+            for i in range(0, len(paths), fan_in):
+                group = paths[i:i + fan_in]
+                path = os.path.join(directory, "run{}".format(count))
+                count += 1
+                runs.write(path, kway_merge(*map(runs.read, group), key=key, reverse=reverse))
+                for old in group:
+                    os.remove(old)
+                merged.append(path)
+            paths = merged
+        yield from kway_merge(*map(runs.read, paths), key=key, reverse=reverse)
+
+
+def _read_chunk(first, records, runs, memory_budget):
+    """
+    Reads the records of a chunk, of at most memory_budget bytes (at least one record).
+    :param first: first record of the chunk
+    :param records: iterator of the following records
+    :return: (list of the records of the chunk, first record of the next chunk or _END)
+    """
+    chunk = [first]
+    used = runs.size(first)
+    for record in records:
+        if used >= memory_budget:
+            return chunk, record
+        chunk.append(record)
+        used += runs.size(record)
+    return chunk, _END
+
+
+def sort_file(input_path, output_path, key=None, reverse=False, memory_budget=MEMORY_BUDGET,
+              fan_in=FAN_IN, record_size=None, tmp_dir=None):
+    """
+    Sorts a file of text lines, or of fixed width binary records, into output_path.
+    See external_sort for the parameters.
+    :param input_path: path of the file to be sorted
+    :param output_path: path of the sorted file
+    """
+    runs = TextRuns() if record_size is None else BinaryRuns(record_size)
+    with open(input_path, "r" if record_size is None else "rb") as f:
+        if record_size is None:
+            records = (line[:-1] if line.endswith("\n") else line for line in f)
+        else:
+            records = _fixed_width_records(f, record_size)
+        runs.write(output_path, external_sort(records, key, reverse, memory_budget, fan_in, record_size, tmp_dir))
+
+
+def _fixed_width_records(f, record_size):
+    """
+    :return: generator of the records of a binary file
+    """
+    for record in iter(partial(f.read, record_size), b""):
+        if len(record) != record_size:
+            raise ValueError("The file size is not a multiple of record_size.")
+        yield record
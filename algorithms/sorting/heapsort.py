@@ -4,11 +4,32 @@ Heap Sort algorithm
 from datastructures.heap import MaxHeap
 
 
-def heap_sort(a: list):
+def heap_sort(a: list, key=None, reverse=False):
     """
     Sorts a list in O(n * log(n)) time, where n is the length of a.
+    With key or reverse, the keys are computed once and the heap sorts (key, position)
+    pairs, so the elements are only moved once, by the final permutation, and equal
+    keys keep their input order like with sorted.
     :param a: the list to be sorted
-    :return:
+    :param key: optional function computing the sort key of an element
+    :param reverse: sort in descending order
+    :return: new sorted list
+    """
+    if key is None and not reverse:
+        return _heap_sort(a)
+    keys = a if key is None else map(key, a)
+    # descending positions for reverse, so that equal keys stay in input order once reversed
+    sign = -1 if reverse else 1
+    pairs = _heap_sort(list(zip(keys, range(0, sign * len(a), sign))))
+    result = [a[sign * i] for _, i in pairs]
+    if reverse:
+        result.reverse()
+    return result
+
+
+def _heap_sort(a):
+    """
+    :return: new list with the elements of a in ascending order
     """
     heap = MaxHeap(a)
     for i in range(heap.current_size, 1, -1):
@@ -1,47 +1,76 @@
 """
-Linear time sorting algorithms as described in the CLRS
+Linear time sorting algorithms as described in the CLRS.
+NumPy ndarrays are sorted by the vectorised versions in vectorised_sorting.
 """
+from array import array
 import math
 
+try:
+    import numpy as np
+    from algorithms.sorting import vectorised_sorting
+except ImportError:
+    np = None
 
-def counting_sort(arr: list, k, get_index=None):
+
+def counting_sort(arr: list, k, get_index=None, key=None):
     """
     Sorts the arr in O(n + k) where n = len(arr)
+    The index of every element is computed once, into an array,
+    and the elements are moved once, by the final permutation.
     :param arr: the array list to be sorted
     :param k: elements in arr are no higher then k
-    :param get_index: optional lambda
+    :param get_index: optional lambda, same as key
+    :param key: optional function mapping an element to its index in 0..k
     :return: a new sorted array list
     """
-    counts = [0 for _ in range(k + 1)]
-    sorted_arr = [None for _ in range(len(arr))]
-    for elem in arr:
-        if get_index is None:
-            counts[elem] += 1
-        else:
-            counts[get_index(elem)] += 1
+    if key is None:
+        key = get_index
+    if np is not None and isinstance(arr, np.ndarray) and key is None:
+        return vectorised_sorting.counting_sort(arr, k)
+    indices = arr if key is None else array("q", map(key, arr))
+    return [arr[j] for j in _counting_order(indices, k)]
+
+
+def _counting_order(indices, k):
+    """
+    Stable counting sort of positions.
+    :param indices: sequence of integers in 0..k
+    :param k: the maximum index
+    :return: list of the positions of indices in sorted order
+    """
+    counts = [0] * (k + 1)
+    for i in indices:
+        counts[i] += 1
     for i in range(1, k + 1):
         counts[i] += counts[i - 1]
-    for j in range(len(arr) - 1, -1, -1):
-        if get_index is None:
-            sorted_arr[counts[arr[j]] - 1] = arr[j]
-            counts[arr[j]] -= 1
-        else:
-            sorted_arr[counts[get_index(arr[j])] - 1] = arr[j]
-            counts[get_index(arr[j])] -= 1
-    return sorted_arr
+    order = [0] * len(indices)
+    for j in range(len(indices) - 1, -1, -1):
+        c = counts[indices[j]] - 1
+        counts[indices[j]] = c
+        order[c] = j
+    return order
 
 
-def radix_sort(arr: list, d):
+def radix_sort(arr: list, d, key=None):
     """
     Sorts the arr in 0(d(n+k)) where n = len(arr).
-    Uses counting_sort as the stable sorting algorithm.
+    Uses a stable counting sort of the positions for every digit,
+    the keys are computed once and the elements are moved once at the end.
     :param arr: the array list to be sorted
     :param d: the number of digits in the elements of arr
+    :param key: optional function mapping an element to a non-negative integer
     :return: new sorted array list
     """
-    for i in range(d):
-        arr = counting_sort(arr, k=9, get_index=lambda a: get_digit(a, i + 1))
-    return arr
+    if np is not None and isinstance(arr, np.ndarray) and key is None:
+        return vectorised_sorting.radix_sort(arr)
+    keys = arr if key is None else array("q", map(key, arr))
+    order = list(range(len(arr)))
+    divisor = 1
+    for _ in range(d):
+        digits = array("q", [keys[j] // divisor % 10 for j in order])
+        order = [order[i] for i in _counting_order(digits, 9)]
+        divisor *= 10
+    return [arr[j] for j in order]
 
 
 def get_digit(n, d):
@@ -55,19 +84,33 @@ def get_digit(n, d):
     return n % 10
 
 
-def bucket_sort(arr: list):
+def bucket_sort(arr: list, key=None):
     """
     Bucket sort algorithm
     :param arr: the array list to be sorted
+    :param key: optional function mapping an element to a number in [0, 1),
+                computed once per element
     :return: new sorted array list
     """
+    if np is not None and isinstance(arr, np.ndarray) and key is None:
+        return vectorised_sorting.bucket_sort(arr)
     n = len(arr)
+    if key is None:
+        keys, items = arr, arr
+    else:
+        # sort the positions by their cached keys
+        keys, items = array("d", map(key, arr)), range(n)
     buckets = [[] for _ in range(n)]
-    for elem in arr:
-        buckets[math.floor(n * elem)].append(elem)
+    for elem, elem_key in zip(items, keys):
+        buckets[math.floor(n * elem_key)].append(elem)
     for bucket in buckets:
-        bucket.sort()
+        if key is None:
+            bucket.sort()
+        else:
+            bucket.sort(key=keys.__getitem__)
     sorted_arr = []
     for bucket in buckets:
         sorted_arr += bucket
+    if key is not None:
+        sorted_arr = [arr[j] for j in sorted_arr]
     return sorted_arr
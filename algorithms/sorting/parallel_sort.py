@@ -0,0 +1,182 @@
+"""
+Parallel sample sort on multiple cores
+"""
+from array import array
+from bisect import bisect_right
+from multiprocessing.shared_memory import SharedMemory
+from operator import itemgetter
+import random
+from algorithms.process_pool import num_workers, process_pool
+from algorithms.sorting.quicksort import quick_sort
+from datastructures.streaming import kway_merge
+
+# inputs with fewer elements are sorted in this process
+PARALLEL_THRESHOLD = 1 << 16
+# number of samples taken per worker to choose the splitters
+OVERSAMPLING = 64
+
+
+def parallel_sort(arr, workers=None, threshold=PARALLEL_THRESHOLD, sort=quick_sort, typecode=None, key=None):
+    """
+    Sorts numbers with a sample sort on a process pool, in O(n * log(n) / p) time
+    with p workers. The numbers are copied once into a shared memory buffer that
+    the workers attach to, so no data is pickled:
+    1. every worker sorts one contiguous chunk of the buffer with sort and
+       cuts it into p runs at the splitters, chosen from a random sample;
+    2. every worker k-way merges the i-th runs of all chunks into its own
+       range of an output buffer.
+    With key, the numeric keys are computed once into the buffer and sorted along
+    with a buffer of positions, and the elements are permuted once at the end.
+    :param arr: list or array.array of numbers, or of any elements if key is given
+    :param workers: number of worker processes, None uses one per CPU
+    :param threshold: below this length the sort runs in this process
+    :param sort: sort of the library for the chunks, that takes key= and sorts
+                 a list in place like quick_sort or returns a new one like heap_sort
+    :param typecode: array typecode of the numbers (or keys), by default the typecode
+                     of arr, or 'q' if all the numbers are ints and 'd' otherwise
+    :param key: optional function mapping an element to a number
+    :return: new sorted array.array, or a new sorted list if key is given
+    """
+    keys = arr if key is None else [key(x) for x in arr]
+    if typecode is None:
+        typecode = getattr(keys, "typecode", None)
+    if typecode is None:
+        typecode = "q" if all(isinstance(x, int) for x in keys) else "d"
+    workers = num_workers(workers)
+    n = len(keys)
+    if workers == 1 or n < max(threshold, 2 * workers):
+        if key is None:
+            return array(typecode, _sort_list(list(keys), sort))
+        return [arr[i] for i in _sort_list(list(range(n)), sort, keys.__getitem__)]
+    itemsize = array(typecode).itemsize
+    blocks = [SharedMemory(create=True, size=n * itemsize) for _ in range(2)]
+    if key is not None:
+        blocks += [SharedMemory(create=True, size=n * array("q").itemsize) for _ in range(2)]
+    try:
+        view = _view(blocks[0], typecode, n)
+        view[:] = keys if isinstance(keys, array) and keys.typecode == typecode else array(typecode, keys)
+        view.release()
+        if key is not None:
+            view = _view(blocks[2], "q", n)
+            view[:] = array("q", range(n))
+            view.release()
+        # (data, out) or (data, out, data positions, out positions)
+        names = tuple(block.name for block in blocks)
+        bounds = [n * i // workers for i in range(workers + 1)]
+        splitters = _splitters(keys, workers)
+        with process_pool(workers) as executor:
+            # cuts[c][i] is where the i-th run of chunk c starts
+            cuts = list(executor.map(_sort_chunk, [(names, typecode, lo, hi, splitters, sort)
+                                                   for lo, hi in zip(bounds, bounds[1:])]))
+            tasks = []
+            offset = 0
+            for i in range(workers):
+                runs = [(chunk_cuts[i], chunk_cuts[i + 1]) for chunk_cuts in cuts]
+                tasks.append((names, typecode, runs, offset))
+                offset += sum(hi - lo for lo, hi in runs)
+            list(executor.map(_merge_runs, tasks))
+        if key is None:
+            view = _view(blocks[1], typecode, n)
+            result = array(typecode, view)
+        else:
+            view = _view(blocks[3], "q", n)
+            result = [arr[i] for i in view]
+        view.release()
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _sort_list(arr, sort, key=None):
+    """
+    :return: arr sorted by sort, whether it sorts in place or returns a new list
+    """
+    result = sort(arr) if key is None else sort(arr, key=key)
+    return arr if result is None else result
+
+
+def _splitters(arr, workers, seed=0):
+    """
+    :return: the workers - 1 values cutting a random sample of arr into equal parts
+    """
+    rng = random.Random(seed)
+    n = len(arr)
+    sample = sorted(arr[rng.randrange(n)] for _ in range(OVERSAMPLING * workers))
+    return [sample[OVERSAMPLING * i] for i in range(1, workers)]
+
+
+def _view(block, typecode, n):
+    """
+    :return: memoryview of the first n numbers of a shared buffer, which can be
+             larger than requested because some platforms round it up to whole pages
+    """
+    return block.buf[:n * array(typecode).itemsize].cast(typecode)
+
+
+def _attach(names, typecode):
+    """
+    Attaches a worker process to the shared buffers.
+    :return: (list of blocks, list of views) in the order of names
+    """
+    blocks = [SharedMemory(name=name) for name in names]
+    views = [block.buf.cast("B").cast(typecode if i < 2 else "q") for i, block in enumerate(blocks)]
+    return blocks, views
+
+
+def _detach(blocks, views):
+    for view in views:
+        view.release()
+    for block in blocks:
+        block.close()
+
+
+def _sort_chunk(task):
+    """
+    Sorts buffer[lo:hi] in place in a worker process, with the positions if any.
+    :param task: (names of the shared buffers, typecode, lo, hi, splitters, sort)
+    :return: the p + 1 positions cutting the sorted chunk at the splitters
+    """
+    names, typecode, lo, hi, splitters, sort = task
+    blocks, views = _attach(names, typecode)
+    try:
+        view = views[0]
+        if len(views) == 2:
+            chunk = _sort_list(view[lo:hi].tolist(), sort)
+        else:
+            keys = view[lo:hi].tolist()
+            order = _sort_list(list(range(hi - lo)), sort, keys.__getitem__)
+            chunk = [keys[i] for i in order]
+            positions = views[2][lo:hi].tolist()
+            views[2][lo:hi] = array("q", [positions[i] for i in order])
+        view[lo:hi] = array(typecode, chunk)
+        cuts = [lo]
+        for splitter in splitters:
+            cuts.append(lo + bisect_right(chunk, splitter))
+        cuts.append(hi)
+        return cuts
+    finally:
+        _detach(blocks, views)
+
+
+def _merge_runs(task):
+    """
+    Merges sorted runs of the input buffer into the output buffer, in a worker process.
+    :param task: (names of the shared buffers, typecode,
+                  list of (lo, hi) runs, offset of the merged runs in the output)
+    """
+    names, typecode, runs, offset = task
+    blocks, views = _attach(names, typecode)
+    try:
+        if len(views) == 2:
+            merged = array(typecode, kway_merge(*(views[0][lo:hi] for lo, hi in runs)))
+            views[1][offset:offset + len(merged)] = merged
+        else:
+            pairs = list(kway_merge(*(zip(views[0][lo:hi], views[2][lo:hi]) for lo, hi in runs),
+                                    key=itemgetter(0)))
+            end = offset + len(pairs)
+            views[1][offset:end] = array(typecode, [k for k, _ in pairs])
+            views[3][offset:end] = array("q", [i for _, i in pairs])
+    finally:
+        _detach(blocks, views)
@@ -1,18 +1,153 @@
 """
 Quicksort algorithm
 """
+from algorithms.sorting.heapsort import heap_sort
 
+# slices of at most this many elements are finished with insertion sort
+INSERTION_SORT_THRESHOLD = 16
+# slices of more than this many elements take the ninther as pivot
+NINTHER_THRESHOLD = 128
 
-def quick_sort(arr):
+
+def quick_sort(arr, key=None, reverse=False):
     """
-    Sorts the array list in place.
-    Uses the helper functions quick_sort_helper and partition.
+    Sorts the array list in place with introsort, in O(n * log(n)) worst case time.
+    The partitions are kept on an explicit stack and the smaller side is always
+    sorted first, so the stack holds O(log(n)) slices. The pivot is the median of
+    three (the ninther for large slices), the partition is three-way so duplicate
+    keys are never sorted twice, and slices that are too deep fall back to heap_sort.
+    The sort is not stable.
     :param arr: the array list to be sorted
+    :param key: optional function computing the sort key of an element, called once per element
+    :param reverse: sort in descending order
+    """
+    if key is None:
+        _introsort(arr, None)
+    else:
+        keys = [key(x) for x in arr]
+        # sort the positions along with the keys and move the elements once at the end
+        order = list(range(len(arr)))
+        _introsort(keys, order)
+        arr[:] = [arr[i] for i in order]
+    if reverse:
+        arr.reverse()
+
+
+def _introsort(keys, items):
     """
-    quick_sort_helper(arr, 0, len(arr) - 1)
+    Sorts keys in place, applying every move to items too if it is not None.
+    :param keys: list of keys
+    :param items: list of elements with keys[i] the key of items[i], or None
+    """
+    n = len(keys)
+    stack = [(0, n - 1, 2 * n.bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo >= INSERTION_SORT_THRESHOLD:
+            if depth == 0:
+                _heap_sort_slice(keys, items, lo, hi)
+                break
+            depth -= 1
+            lt, gt = _partition3(keys, items, lo, hi, _pivot(keys, lo, hi))
+            # continue with the smaller side, the larger one waits on the stack
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi, depth))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1, depth))
+                lo = gt + 1
+        else:
+            _insertion_sort(keys, items, lo, hi)
+
+
+def _median3(a, b, c):
+    """
+    :return: the median of three keys
+    """
+    if a < b:
+        if b < c:
+            return b
+        return c if a < c else a
+    if a < c:
+        return a
+    return c if b < c else b
+
+
+def _pivot(keys, lo, hi):
+    """
+    :return: the median of three keys of the slice, or Tukey's ninther for large slices
+    """
+    mid = (lo + hi) // 2
+    if hi - lo < NINTHER_THRESHOLD:
+        return _median3(keys[lo], keys[mid], keys[hi])
+    step = (hi - lo) // 8
+    return _median3(_median3(keys[lo], keys[lo + step], keys[lo + 2 * step]),
+                    _median3(keys[mid - step], keys[mid], keys[mid + step]),
+                    _median3(keys[hi - 2 * step], keys[hi - step], keys[hi]))
+
+
+def _partition3(keys, items, lo, hi, pivot):
+    """
+    Dutch national flag partition of keys[lo..hi] around pivot.
+    :return: (lt, gt) such that keys[lo..lt-1] < pivot, keys[lt..gt] == pivot
+             and keys[gt+1..hi] > pivot
+    """
+    lt, i, gt = lo, lo, hi
+    while i <= gt:
+        k = keys[i]
+        if k < pivot:
+            keys[lt], keys[i] = k, keys[lt]
+            if items is not None:
+                items[lt], items[i] = items[i], items[lt]
+            lt += 1
+            i += 1
+        elif pivot < k:
+            keys[gt], keys[i] = k, keys[gt]
+            if items is not None:
+                items[gt], items[i] = items[i], items[gt]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+def _insertion_sort(keys, items, lo, hi):
+    """
+    Sorts keys[lo..hi] in place by insertion.
+    """
+    for i in range(lo + 1, hi + 1):
+        k = keys[i]
+        item = items[i] if items is not None else None
+        j = i - 1
+        while j >= lo and k < keys[j]:
+            keys[j + 1] = keys[j]
+            if items is not None:
+                items[j + 1] = items[j]
+            j -= 1
+        keys[j + 1] = k
+        if items is not None:
+            items[j + 1] = item
+
+
+def _heap_sort_slice(keys, items, lo, hi):
+    """
+    Sorts keys[lo..hi] in place with heap_sort.
+    """
+    if items is None:
+        keys[lo:hi + 1] = heap_sort(keys[lo:hi + 1])
+        return
+    # the original positions break ties, so elements are never compared
+    order = heap_sort(list(zip(keys[lo:hi + 1], range(lo, hi + 1))))
+    moved = [items[i] for _, i in order]
+    keys[lo:hi + 1] = [k for k, _ in order]
+    items[lo:hi + 1] = moved
 
 
 def quick_sort_helper(arr, first, last):
+    """
+    Textbook recursive quicksort of arr[first..last] with the last element as pivot,
+    O(n^2) on sorted input.
+    """
     if first < last:
         pivot = partition(arr, first, last)
         quick_sort_helper(arr, first, pivot - 1)
@@ -0,0 +1,112 @@
+"""
+Linear time sorting algorithms vectorised with NumPy
+"""
+import numpy as np
+
+# flips the sign bit of a 64 bit key
+_SIGN_BIT = np.uint64(1 << 63)
+
+
+def counting_sort(arr, k=None, return_indices=False):
+    """
+    Counting sort of non-negative integers in O(n + k), with bincount and cumsum.
+    :param arr: 1-d integer ndarray with elements in 0..k
+    :param k: elements in arr are no higher than k, computed if None
+    :param return_indices: return the stable sorting permutation instead of the sorted array
+    :return: a new sorted ndarray, or the permutation that sorts arr
+    """
+    arr = np.asarray(arr)
+    if arr.size and arr.min() < 0:
+        raise ValueError("counting_sort only sorts non-negative integers.")
+    if k is None:
+        k = int(arr.max()) if arr.size else 0
+    if return_indices:
+        # the stable argsort of NumPy is itself a counting (radix) sort for 16 bit keys
+        if k < 1 << 16:
+            return np.argsort(arr.astype(np.uint16), kind="stable")
+        return radix_sort(arr, return_indices=True)
+    counts = np.bincount(arr, minlength=k + 1)
+    return np.repeat(np.arange(k + 1, dtype=arr.dtype), counts)
+
+
+def radix_keys(arr):
+    """
+    Maps integers or floats to unsigned 64 bit keys in the same order.
+    Negative integers are handled by flipping the sign bit, floats by flipping
+    the sign bit of positive numbers and all the bits of negative ones.
+    :param arr: 1-d integer or float ndarray
+    :return: uint64 ndarray of keys
+    """
+    if arr.dtype.kind == "f":
+        bits = arr.astype(np.float64).view(np.uint64)
+        return np.where(bits & _SIGN_BIT, ~bits, bits | _SIGN_BIT)
+    if arr.dtype.kind == "u":
+        return arr.astype(np.uint64)
+    if arr.dtype.kind in "ib":
+        return arr.astype(np.int64).view(np.uint64) ^ _SIGN_BIT
+    raise TypeError("radix_sort only sorts integers and floats.")
+
+
+def radix_sort(arr, digit_bits=16, return_indices=False):
+    """
+    LSD radix sort on 8 or 16 bit digits in O(n * b / digit_bits),
+    where b is the number of bits of max(arr) - min(arr), so small ranges take few passes.
+    Every pass is a stable counting sort of one digit.
+    :param arr: 1-d integer or float ndarray, may contain negative numbers
+    :param digit_bits: 8 or 16
+    :param return_indices: return the stable sorting permutation instead of the sorted array
+    :return: a new sorted ndarray, or the permutation that sorts arr
+    """
+    if digit_bits not in (8, 16):
+        raise ValueError("digit_bits must be 8 or 16.")
+    arr = np.asarray(arr)
+    permutation = np.arange(arr.size)
+    if arr.size:
+        keys = radix_keys(arr)
+        keys -= keys.min()
+        digit_type = np.uint8 if digit_bits == 8 else np.uint16
+        mask = np.uint64((1 << digit_bits) - 1)
+        for shift in range(0, int(keys.max()).bit_length(), digit_bits):
+            digits = ((keys >> np.uint64(shift)) & mask).astype(digit_type)
+            order = np.argsort(digits, kind="stable")
+            keys = keys[order]
+            permutation = permutation[order]
+    return permutation if return_indices else arr[permutation]
+
+
+def bucket_sort(arr, num_buckets=None, return_indices=False):
+    """
+    Bucket sort of numbers with a vectorised bucket assignment.
+    The buckets split the range [min(arr), max(arr)] in equal parts. The elements
+    are scattered into their buckets with a counting sort of the bucket numbers,
+    then every bucket is sorted on its own, all the buckets of the same size at once.
+    Runs in O(n) expected time for evenly spread numbers.
+    :param arr: 1-d ndarray of finite integers or floats
+    :param num_buckets: number of buckets, len(arr) if None
+    :param return_indices: return the stable sorting permutation instead of the sorted array
+    :return: a new sorted ndarray, or the permutation that sorts arr
+    """
+    arr = np.asarray(arr)
+    n = arr.size
+    if n == 0:
+        return np.arange(0) if return_indices else arr.copy()
+    if num_buckets is None:
+        num_buckets = n
+    lo, hi = float(arr.min()), float(arr.max())
+    if not np.isfinite(hi - lo):
+        raise ValueError("bucket_sort only sorts finite numbers.")
+    if hi == lo:
+        buckets = np.zeros(n, dtype=np.intp)
+    else:
+        scaled = (arr.astype(np.float64) - lo) * (num_buckets / (hi - lo))
+        buckets = np.minimum(scaled.astype(np.intp), num_buckets - 1)
+    counts = np.bincount(buckets, minlength=num_buckets)
+    starts = np.cumsum(counts) - counts
+    permutation = counting_sort(buckets, num_buckets - 1, return_indices=True)
+    values = arr[permutation]
+    for size in np.unique(counts[counts > 1]):
+        # one row per bucket holding size elements
+        positions = starts[counts == size][:, None] + np.arange(size)
+        within = np.argsort(values[positions], axis=1, kind="stable")
+        permutation[positions] = permutation[np.take_along_axis(positions, within, axis=1)]
+    return permutation if return_indices else arr[permutation]
@@ -0,0 +1,71 @@
+"""
+Benchmark of the CSRGraph snapshot against the object based Graph.
+Run from the repository root:
+    python -m benchmarks.bench_csr_graph [num_vertices] [num_edges]
+"""
+import random
+import sys
+import time
+
+from algorithms.graphs.graph import Graph
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def random_graph(num_vertices, num_edges, seed=0):
+    """
+    :param num_vertices: number of vertices
+    :param num_edges: number of directed edges
+    :param seed: random seed
+    :return: a random weighted Graph
+    """
+    rng = random.Random(seed)
+    g = Graph()
+    for i in range(num_vertices):
+        g.add_vertex(i)
+    for _ in range(num_edges):
+        g.add_edge(rng.randrange(num_vertices), rng.randrange(num_vertices), rng.randint(1, 100))
+    return g
+
+
+def timed(function, *args):
+    """
+    :return: the wall clock time in seconds of function(*args)
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(num_vertices=100000, num_edges=1000000):
+    g = random_graph(num_vertices, num_edges)
+    start = time.perf_counter()
+    csr = g.freeze()
+    print("freeze: {:.3f}s for {} vertices, {} edges".format(
+        time.perf_counter() - start, num_vertices, csr.num_edges()))
+    print("{:<14}{:>12}{:>12}{:>10}".format("algorithm", "Graph", "CSRGraph", "speedup"))
+    for name in ("bfs", "dijkstra"):
+        graph_time = timed(getattr(g, name), 0)
+        csr_time = timed(getattr(csr, name), 0)
+        print("{:<14}{:>11.3f}s{:>11.3f}s{:>9.1f}x".format(name, graph_time, csr_time, graph_time / csr_time))
+    if np is not None:
+        csr.bfs_levels(0)
+        graph_time = timed(g.bfs, 0)
+        csr_time = timed(csr.bfs_levels, 0)
+        print("{:<14}{:>11.3f}s{:>11.3f}s{:>9.1f}x".format(
+            "bfs_levels", graph_time, csr_time, graph_time / csr_time))
+    # Bellman-Ford is O(V * E) on the object graph, so it runs on a smaller graph
+    small = random_graph(num_vertices // 100, num_edges // 100)
+    small_csr = small.freeze()
+    graph_time = timed(small.bellman_ford, 0)
+    csr_time = timed(small_csr.bellman_ford, 0)
+    print("{:<14}{:>11.3f}s{:>11.3f}s{:>9.1f}x".format(
+        "bellman_ford*", graph_time, csr_time, graph_time / csr_time))
+    print("* on a graph with {} vertices and {} edges".format(num_vertices // 100, small_csr.num_edges()))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
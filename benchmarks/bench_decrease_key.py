@@ -0,0 +1,72 @@
+"""
+Benchmark of the priority queues of Graph.dijkstra on dense graphs,
+where decrease-key updates outnumber the pops.
+Run from the repository root:
+    python -m benchmarks.bench_decrease_key [num_vertices] [edge_probability]
+"""
+import random
+import sys
+import time
+
+from algorithms.graphs.graph import Graph
+from datastructures.heap import FibonacciHeap, IndexedPriorityQueue, MutablePriorityQueue, PairingHeap
+
+
+def dense_graph(num_vertices, edge_probability, seed=0):
+    """
+    Random DAG where the edge (u, v), u < v, weighs (v - u) ** 2.
+    Dijkstra from 0 settles the vertices in key order and almost every
+    settled vertex improves the distance of all its successors, so the
+    search does about edge_probability * V^2 / 2 decrease-keys and only V pops.
+    :return: a dense weighted Graph
+    """
+    rng = random.Random(seed)
+    g = Graph()
+    for i in range(num_vertices):
+        g.add_vertex(i)
+    for u in range(num_vertices):
+        for v in range(u + 1, num_vertices):
+            if v == u + 1 or rng.random() < edge_probability:
+                g.add_edge(u, v, (v - u) ** 2)
+    return g
+
+
+class CountingQueue(IndexedPriorityQueue):
+    """
+    IndexedPriorityQueue that counts its inserts, decrease-keys and pops.
+    """
+    __slots__ = ("inserts", "updates", "pops")
+
+    def __init__(self):
+        super().__init__()
+        self.inserts = self.updates = self.pops = 0
+
+    def add_task(self, task, priority=0):
+        if task in self:
+            self.updates += 1
+        else:
+            self.inserts += 1
+        super().add_task(task, priority)
+
+    def pop_task(self):
+        self.pops += 1
+        return super().pop_task()
+
+
+def main(num_vertices=2000, edge_probability=0.5):
+    g = dense_graph(num_vertices, edge_probability)
+    counter = CountingQueue()
+    g.dijkstra(0, queue_class=lambda: counter)
+    print("dijkstra on {} vertices, {} edges: {} inserts, {} decrease-keys, {} pops".format(
+        num_vertices, sum(len(v.get_connections()) for v in g), counter.inserts, counter.updates, counter.pops))
+    print("{:<28}{:>10}".format("queue", "time"))
+    queues = [("MutablePriorityQueue", MutablePriorityQueue), ("IndexedPriorityQueue(d=4)", IndexedPriorityQueue),
+              ("PairingHeap", PairingHeap), ("FibonacciHeap", FibonacciHeap)]
+    for name, factory in queues:
+        start = time.perf_counter()
+        g.dijkstra(0, queue_class=factory)
+        print("{:<28}{:>9.3f}s".format(name, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main(*(float(arg) if i else int(arg) for i, arg in enumerate(sys.argv[1:3])))
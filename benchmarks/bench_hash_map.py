@@ -0,0 +1,54 @@
+"""
+Benchmark of the chaining HashMap, the Robin Hood OpenAddressingHashMap and dict.
+Run from the repository root:
+    python -m benchmarks.bench_hash_map [num_keys]
+"""
+import random
+import sys
+import time
+
+from datastructures.hash_map import HashMap, OpenAddressingHashMap
+
+
+class DictMap(dict):
+    """
+    dict with the put/get/delete interface of the library maps.
+    """
+    put = dict.__setitem__
+    get = dict.__getitem__
+    delete = dict.__delitem__
+
+
+def run(factory, keys):
+    """
+    Puts, gets and deletes every key.
+    :return: (put, get, delete) wall clock times in seconds
+    """
+    times = []
+    m = factory()
+    start = time.perf_counter()
+    for key in keys:
+        m.put(key, key)
+    times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for key in keys:
+        m.delete(key)
+    times.append(time.perf_counter() - start)
+    return times
+
+
+def main(num_keys=10000000):
+    keys = list(range(num_keys))
+    random.Random(0).shuffle(keys)
+    print("{} integer keys".format(num_keys))
+    print("{:<24}{:>10}{:>10}{:>10}".format("map", "put", "get", "delete"))
+    for name, factory in (("HashMap", HashMap), ("OpenAddressingHashMap", OpenAddressingHashMap), ("dict", DictMap)):
+        print("{:<24}{:>9.3f}s{:>9.3f}s{:>9.3f}s".format(name, *run(factory, keys)))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,50 @@
+"""
+Benchmark of IndexedPriorityQueue against the tombstone based MutablePriorityQueue.
+Run from the repository root:
+    python -m benchmarks.bench_priority_queue [num_updates] [num_tasks]
+"""
+import random
+import sys
+import time
+
+from datastructures.heap import IndexedPriorityQueue, MutablePriorityQueue
+from benchmarks.bench_csr_graph import random_graph
+
+
+def churn(queue, num_updates, num_tasks, seed=0):
+    """
+    Inserts num_tasks tasks, decreases random priorities num_updates times and pops everything.
+    :return: the wall clock time in seconds
+    """
+    rng = random.Random(seed)
+    updates = [(rng.randrange(num_tasks), rng.random()) for _ in range(num_updates)]
+    start = time.perf_counter()
+    priorities = [1.0] * num_tasks
+    for task in range(num_tasks):
+        queue.add_task(task, 1.0)
+    for task, priority in updates:
+        if priority < priorities[task]:
+            priorities[task] = priority
+            queue.add_task(task, priority)
+    while not queue.empty():
+        queue.pop_task()
+    return time.perf_counter() - start
+
+
+def main(num_updates=1000000, num_tasks=100000):
+    print("{} decrease-key updates on {} tasks".format(num_updates, num_tasks))
+    print("{:<28}{:>10}".format("queue", "time"))
+    queues = [("MutablePriorityQueue", MutablePriorityQueue)]
+    queues += [("IndexedPriorityQueue(d={})".format(d), lambda d=d: IndexedPriorityQueue(d)) for d in (2, 4, 8)]
+    for name, factory in queues:
+        print("{:<28}{:>9.3f}s".format(name, churn(factory(), num_updates, num_tasks)))
+    g = random_graph(num_tasks, num_updates)
+    print("dijkstra on {} vertices, {} edges".format(num_tasks, num_updates))
+    for name, factory in queues:
+        start = time.perf_counter()
+        g.dijkstra(0, queue_class=factory)
+        print("{:<28}{:>9.3f}s".format(name, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,82 @@
+"""
+Benchmark of the introsort quick_sort on adversarial inputs,
+against heap_sort, the textbook recursive quicksort and the built-in sorted.
+Run from the repository root:
+    python -m benchmarks.bench_quicksort [n]
+"""
+import random
+import sys
+import time
+
+from algorithms.sorting.heapsort import heap_sort
+from algorithms.sorting.quicksort import quick_sort, quick_sort_helper
+
+
+def median_of_3_killer(n):
+    """
+    Musser's sequence that drives median-of-three quicksort to O(n^2).
+    :param n: even length of the sequence
+    :return: a permutation of 1..n
+    """
+    k = n // 2
+    arr = [0] * n
+    for i in range(1, k + 1):
+        if i % 2 == 1:
+            arr[i - 1] = i
+            arr[i] = k + i
+        arr[k + i - 1] = 2 * i
+    return arr
+
+
+def inputs(n, seed=0):
+    """
+    :return: list of (name, list) adversarial inputs of length n
+    """
+    rng = random.Random(seed)
+    return [
+        ("random", [rng.random() for _ in range(n)]),
+        ("sorted", list(range(n))),
+        ("reversed", list(range(n, 0, -1))),
+        ("all equal", [7] * n),
+        ("few unique", [rng.randrange(4) for _ in range(n)]),
+        ("organ pipe", list(range(n // 2)) + list(range(n - n // 2, 0, -1))),
+        ("median-of-3 killer", median_of_3_killer(n - n % 2)),
+    ]
+
+
+def textbook_quick_sort(arr):
+    quick_sort_helper(arr, 0, len(arr) - 1)
+
+
+def timed_sort(function, arr):
+    """
+    :return: the wall clock time in seconds of sorting a copy of arr, None on RecursionError
+    """
+    arr = list(arr)
+    start = time.perf_counter()
+    try:
+        function(arr)
+    except RecursionError:
+        return None
+    return time.perf_counter() - start
+
+
+def main(n=200000):
+    sorts = [("quick_sort", quick_sort), ("heap_sort", heap_sort),
+             ("textbook", textbook_quick_sort), ("sorted", sorted)]
+    print("{} elements".format(n))
+    print("{:<20}".format("input") + "".join("{:>12}".format(name) for name, _ in sorts))
+    for name, arr in inputs(n):
+        times = []
+        for sort_name, function in sorts:
+            # the textbook quicksort is quadratic on most of these inputs
+            if sort_name == "textbook" and name != "random":
+                times.append("{:>12}".format("skipped"))
+                continue
+            t = timed_sort(function, arr)
+            times.append("{:>12}".format("recursion") if t is None else "{:>11.3f}s".format(t))
+        print("{:<20}".format(name) + "".join(times))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
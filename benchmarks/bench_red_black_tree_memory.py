@@ -0,0 +1,51 @@
+"""
+Memory benchmark of RedBlackTree.
+Run from the repository root:
+    python -m benchmarks.bench_red_black_tree_memory [num_keys ...]
+"""
+import sys
+import tracemalloc
+
+from datastructures.red_black_tree import RedBlackTree
+
+
+class DictNode:
+    """
+    A node with the same attributes as RBNode but a per-instance __dict__,
+    which is how RBNode used to be stored.
+    """
+    def __init__(self, key=None, value=None):
+        self.color = 0
+        self.parent = self.left = self.right = None
+        self.num_left = self.num_right = 0
+        self.key = key
+        self.value = value
+
+
+def traced(build):
+    """
+    :param build: function building the structure to measure
+    :return: (structure, bytes allocated while building it)
+    """
+    tracemalloc.start()
+    structure = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return structure, size
+
+
+def main(*sizes):
+    if not sizes:
+        sizes = (10 ** 6, 10 ** 7)
+    print("{:>10}{:>18}{:>18}{:>18}".format("keys", "RedBlackTree", "DictNode nodes", "list of keys"))
+    for n in sizes:
+        keys = list(range(n))
+        _, tree_size = traced(lambda: RedBlackTree.from_sorted(keys))
+        _, dict_size = traced(lambda: [DictNode(key) for key in keys])
+        _, list_size = traced(lambda: list(keys))
+        print("{:>10}{:>13.1f} B/key{:>13.1f} B/key{:>13.1f} B/key".format(
+            n, tree_size / n, dict_size / n, list_size / n))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,224 @@
+"""
+Thread-safe wrapper around the Red Black Tree
+"""
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+import threading
+from datastructures.red_black_tree import RedBlackTree
+
+
+class ReadWriteLock:
+    """
+    Lock that lets any number of readers in at the same time, or a single writer.
+    Waiting writers block new readers, so writers are not starved.
+    The lock is not reentrant.
+    """
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class Snapshot:
+    """
+    Immutable sorted view of the (key, value) pairs of a tree at one point in time.
+    """
+    __slots__ = ("keys", "values")
+
+    def __init__(self, keys: tuple, values: tuple):
+        self.keys = keys
+        self.values = values
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def items(self):
+        """
+        :return: iterator of (key, value) pairs in key order
+        """
+        return zip(self.keys, self.values)
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        """
+        Iterates over the keys k with lo <= k <= hi in O(log n + k).
+        :param lo: lower bound, inclusive, None for no bound
+        :param hi: upper bound, inclusive, None for no bound
+        :param reverse: iterate from hi down to lo
+        :return: generator of keys
+        """
+        keys = self.keys
+        start = 0 if lo is None else bisect_left(keys, lo)
+        end = len(keys) if hi is None else bisect_right(keys, hi)
+        if reverse:
+            return (keys[i] for i in range(end - 1, start - 1, -1))
+        return (keys[i] for i in range(start, end))
+
+
+class ConcurrentRedBlackTree:
+    """
+    Red Black Tree that can be shared between threads.
+    Queries run in parallel under a read lock, updates take the write lock.
+    Iteration goes over a Snapshot that is built at most once per version
+    of the tree and shared by all readers until the next update, so
+    iterators are consistent and never hold a lock while they are consumed.
+    Bounded ranges only copy the keys in the range.
+    """
+    def __init__(self, tree: RedBlackTree = None):
+        """
+        :param tree: tree to wrap, it must not be used directly afterwards
+        """
+        self._tree = RedBlackTree() if tree is None else tree
+        self._lock = ReadWriteLock()
+        # cached snapshot of the current version, None after any update
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+
+    ###########
+    # Queries #
+    ###########
+
+    def __len__(self):
+        with self._lock.read_locked():
+            return len(self._tree)
+
+    def __contains__(self, key):
+        with self._lock.read_locked():
+            return key in self._tree
+
+    def __getitem__(self, key):
+        with self._lock.read_locked():
+            return self._tree[key]
+
+    def get(self, key, default=None):
+        with self._lock.read_locked():
+            return self._tree.get(key, default)
+
+    def floor(self, key):
+        with self._lock.read_locked():
+            return self._tree.floor(key)
+
+    def ceiling(self, key):
+        with self._lock.read_locked():
+            return self._tree.ceiling(key)
+
+    def select(self, k):
+        with self._lock.read_locked():
+            return self._tree.select(k)
+
+    def rank(self, key):
+        with self._lock.read_locked():
+            return self._tree.rank(key)
+
+    def count_range(self, lo, hi):
+        with self._lock.read_locked():
+            return self._tree.count_range(lo, hi)
+
+    def percentile(self, p):
+        with self._lock.read_locked():
+            return self._tree.percentile(p)
+
+    #############
+    # Iteration #
+    #############
+
+    def snapshot(self):
+        """
+        :return: the Snapshot of the current version of the tree
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._snapshot_lock:
+            with self._lock.read_locked():
+                if self._snapshot is None:
+                    items = list(self._tree.items())
+                    self._snapshot = Snapshot(tuple(k for k, _ in items), tuple(v for _, v in items))
+                return self._snapshot
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def items(self):
+        return self.snapshot().items()
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        """
+        Iterates over the keys k with lo <= k <= hi as they are at the time of the call.
+        A bounded range that the cached Snapshot does not cover is collected from
+        the tree under the read lock in O(log n + k), instead of copying the tree.
+        :param lo: lower bound, inclusive, None for no bound
+        :param hi: upper bound, inclusive, None for no bound
+        :param reverse: iterate from hi down to lo
+        :return: iterator of keys
+        """
+        if self._snapshot is None and (lo is not None or hi is not None):
+            with self._lock.read_locked():
+                return iter(list(self._tree.irange(lo, hi, reverse)))
+        return self.snapshot().irange(lo, hi, reverse)
+
+    ###########
+    # Updates #
+    ###########
+
+    def insert(self, key, value=None):
+        with self._lock.write_locked():
+            self._tree.insert(key, value)
+            self._snapshot = None
+
+    def delete(self, key):
+        with self._lock.write_locked():
+            self._tree.delete(key)
+            self._snapshot = None
+
+    def __setitem__(self, key, value):
+        with self._lock.write_locked():
+            self._tree[key] = value
+            self._snapshot = None
+
+    def __delitem__(self, key):
+        self.delete(key)
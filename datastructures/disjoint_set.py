@@ -0,0 +1,75 @@
+"""
+Disjoint Set (Union-Find) Implementation
+"""
+from array import array
+
+
+class DisjointSet:
+    """
+    Disjoint sets of the elements 0..n-1, kept in a parent array and a rank array.
+    Union by rank and path compression make every operation
+    run in O(alpha(n)) amortised time.
+    """
+    __slots__ = ("parent", "rank", "num_sets")
+
+    def __init__(self, n):
+        """
+        Makes n singleton sets.
+        :param n: number of elements
+        """
+        self.parent = array('q', range(n))
+        # the rank of a root bounds the height of its tree, at most log2(n) < 256
+        self.rank = bytearray(n)
+        self.num_sets = n
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, x):
+        """
+        Finds the representative of the set of x and compresses the path to it.
+        :param x: an element
+        :return: the root of the set of x
+        """
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x, y):
+        """
+        Merges the sets of x and y.
+        :param x: an element
+        :param y: an element
+        :return: True if x and y were in different sets
+        """
+        x = self.find(x)
+        y = self.find(y)
+        if x == y:
+            return False
+        rank = self.rank
+        if rank[x] < rank[y]:
+            x, y = y, x
+        self.parent[y] = x
+        if rank[x] == rank[y]:
+            rank[x] += 1
+        self.num_sets -= 1
+        return True
+
+    def connected(self, x, y):
+        """
+        :return: True if x and y are in the same set
+        """
+        return self.find(x) == self.find(y)
+
+    def sets(self):
+        """
+        :return: dict mapping the root of every set to the list of its elements
+        """
+        sets = {}
+        for x in range(len(self.parent)):
+            sets.setdefault(self.find(x), []).append(x)
+        return sets
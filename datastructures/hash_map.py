@@ -3,14 +3,59 @@ Hash Map Python implementation
 """
 
 
+# number of buckets of the old table moved to the new one by every
+# put or delete while the map is being resized
+MIGRATION_STEP = 4
+# the map expands when the number of elements per bucket reaches this
+LOAD_FACTOR = 0.7
+# default of get_many, distinguishes "no default" from a default of None
+_MISSING = object()
+
+
 class HashMap:
-    def __init__(self):
+    """
+    Hash map with separate chaining.
+    Resizing is incremental: expand allocates a table twice as large and
+    every following put or delete moves a few buckets of the old table to
+    the new one, so a single operation never rehashes the whole map.
+    """
+    def __init__(self, num_buckets=10):
         # initial number of elements in the map
         self._size = 0
-        # 10 initial slots
-        self._num_buckets = 10
+        # 10 initial slots by default
+        self._num_buckets = max(1, num_buckets)
         # create list of Nones
         self._bucket_list: list = [None] * self._num_buckets
+        # table that is being migrated into _bucket_list, None when not resizing
+        self._old_bucket_list: list = None
+        # buckets of the old table below this index have been migrated
+        self._migrated = 0
+
+    @classmethod
+    def from_items(cls, items, expected_size=None):
+        """
+        Builds a map from (key, value) pairs or a mapping in one pass.
+        :param items: iterable of (key, value) pairs, or a mapping
+        :param expected_size: number of pairs, len(items) is used if None
+        :return: the new map
+        """
+        if expected_size is None and hasattr(items, "__len__"):
+            expected_size = len(items)
+        hash_map = cls(int((expected_size or 0) / LOAD_FACTOR) + 1)
+        hash_map.update_many(items)
+        return hash_map
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __iter__(self):
+        for head in self._buckets():
+            while head is not None:
+                yield head.key
+                head = head.next
 
     def size(self):
         """
@@ -18,20 +63,26 @@ class HashMap:
         """
         return self._size
 
+    def items(self):
+        """
+        :return: generator of (key, value) pairs
+        """
+        for head in self._buckets():
+            while head is not None:
+                yield head.key, head.value
+                head = head.next
+
     def get(self, key):
         """
         Returns the value given a key.
+        Raises ValueError if the key is not in the map.
         :param key: key
         :return: value
         """
-        index = self._get_index(key)
-        head = self._bucket_list[index]
-        if head is None:
+        node = self._find(key)
+        if node is None:
             raise ValueError("Key not in the map.")
-        while head is not None:
-            if head.key == key:
-                return head.value
-            head = head.next
+        return node.value
 
     def put(self, key, value):
         """
@@ -39,21 +90,187 @@ class HashMap:
         :param key: key
         :param value: value
         """
-        index = self._get_index(key)
-        head = self._bucket_list[index]
-        while head is not None:
-            if head.key == key:
-                head.value = value
-                return
-            head = head.next
+        self._migrate()
+        key_hash = hash(key)
+        node = self._find(key, key_hash)
+        if node is not None:
+            node.value = value
+            return
         self._size += 1
-        head = self._bucket_list[index]
-        new_node = Node(key, value)
-        new_node.next = head
+        index = key_hash % self._num_buckets
+        new_node = Node(key, value, key_hash)
+        new_node.next = self._bucket_list[index]
         self._bucket_list[index] = new_node
         if self._should_expand():
             self.expand()
 
+    def delete(self, key):
+        """
+        Removes the key from the map.
+        Raises ValueError if the key is not in the map.
+        :param key: key
+        """
+        self._migrate()
+        key_hash = hash(key)
+        for buckets, index in self._chains(key_hash):
+            previous, head = None, buckets[index]
+            while head is not None:
+                if head.hash == key_hash and head.key == key:
+                    if previous is None:
+                        buckets[index] = head.next
+                    else:
+                        previous.next = head.next
+                    self._size -= 1
+                    return
+                previous, head = head, head.next
+        raise ValueError("Key not in the map.")
+
+    def update_many(self, items):
+        """
+        Puts all the (key, value) pairs in the map.
+        The table is sized once for the whole batch and each key is hashed once.
+        :param items: iterable of (key, value) pairs, or a mapping
+        """
+        if hasattr(items, "items"):
+            items = items.items()
+        if hasattr(items, "__len__"):
+            self._reserve(self._size + len(items))
+        else:
+            self._reserve(self._size)
+        bucket_list, num_buckets = self._bucket_list, self._num_buckets
+        limit = num_buckets * LOAD_FACTOR
+        size = self._size
+        for key, value in items:
+            key_hash = hash(key)
+            index = key_hash % num_buckets
+            head = bucket_list[index]
+            while head is not None:
+                if head.hash == key_hash and head.key == key:
+                    head.value = value
+                    break
+                head = head.next
+            else:
+                new_node = Node(key, value, key_hash)
+                new_node.next = bucket_list[index]
+                bucket_list[index] = new_node
+                size += 1
+                if size >= limit:
+                    # only reached when the number of items was unknown
+                    self._size = size
+                    self._reserve(2 * size)
+                    bucket_list, num_buckets = self._bucket_list, self._num_buckets
+                    limit = num_buckets * LOAD_FACTOR
+        self._size = size
+
+    def get_many(self, keys, default=_MISSING):
+        """
+        Returns the values of all the keys.
+        Raises ValueError if a key is not in the map and no default is given.
+        :param keys: iterable of keys
+        :param default: value returned for the keys that are not in the map
+        :return: list of values, in the order of keys
+        """
+        find = self._find
+        values = []
+        for key in keys:
+            node = find(key)
+            if node is not None:
+                values.append(node.value)
+            elif default is _MISSING:
+                raise ValueError("Key not in the map.")
+            else:
+                values.append(default)
+        return values
+
+    def delete_many(self, keys):
+        """
+        Removes all the keys from the map. Keys not in the map are ignored.
+        :param keys: iterable of keys
+        :return: the number of removed keys
+        """
+        # finish any resize so every key lives in a single table
+        self._reserve(self._size)
+        bucket_list, num_buckets = self._bucket_list, self._num_buckets
+        removed = 0
+        for key in keys:
+            key_hash = hash(key)
+            index = key_hash % num_buckets
+            previous, head = None, bucket_list[index]
+            while head is not None:
+                if head.hash == key_hash and head.key == key:
+                    if previous is None:
+                        bucket_list[index] = head.next
+                    else:
+                        previous.next = head.next
+                    removed += 1
+                    break
+                previous, head = head, head.next
+        self._size -= removed
+        return removed
+
+    def _reserve(self, n):
+        """
+        Finishes any incremental resize and grows the table at once so it
+        can hold n elements without expanding.
+        :param n: number of elements
+        """
+        if self._old_bucket_list is not None:
+            self._migrate(len(self._old_bucket_list))
+        num_buckets = int(n / LOAD_FACTOR) + 1
+        if num_buckets <= self._num_buckets:
+            return
+        self._old_bucket_list = self._bucket_list
+        self._migrated = 0
+        self._num_buckets = num_buckets
+        self._bucket_list = [None] * num_buckets
+        self._migrate(len(self._old_bucket_list))
+
+    def _find(self, key, key_hash=None):
+        """
+        :param key: key
+        :param key_hash: hash of the key, computed if None
+        :return: the node holding the key, or None
+        """
+        if key_hash is None:
+            key_hash = hash(key)
+        head = self._bucket_list[key_hash % self._num_buckets]
+        while head is not None:
+            if head.hash == key_hash and head.key == key:
+                return head
+            head = head.next
+        if self._old_bucket_list is not None:
+            old_index = key_hash % len(self._old_bucket_list)
+            if old_index >= self._migrated:
+                head = self._old_bucket_list[old_index]
+                while head is not None:
+                    if head.hash == key_hash and head.key == key:
+                        return head
+                    head = head.next
+        return None
+
+    def _chains(self, key_hash):
+        """
+        New keys always go to the new table, keys of old buckets
+        that were not migrated yet are still in the old table.
+        :param key_hash: hash of a key
+        :return: list of (bucket list, index) of the chains that may hold the key
+        """
+        chains = [(self._bucket_list, key_hash % self._num_buckets)]
+        if self._old_bucket_list is not None:
+            old_index = key_hash % len(self._old_bucket_list)
+            if old_index >= self._migrated:
+                chains.append((self._old_bucket_list, old_index))
+        return chains
+
+    def _buckets(self):
+        """
+        :return: generator of the heads of all non migrated and new buckets
+        """
+        if self._old_bucket_list is not None:
+            for i in range(self._migrated, len(self._old_bucket_list)):
+                yield self._old_bucket_list[i]
+        yield from self._bucket_list
+
     def _get_index(self, key):
         """
         :param key: key
@@ -63,19 +280,232 @@ class HashMap:
 
     def _should_expand(self):
         """
-        Checks if the map should expand. The threshold is 0.7
+        Checks if the map should expand. The threshold is LOAD_FACTOR
         """
-        return self.size() / self._num_buckets >= 0.7
+        return self.size() / self._num_buckets >= LOAD_FACTOR
 
     def expand(self):
         """
-        Doubles the size of map and copies the elements.
+        Doubles the size of map. The elements are copied incrementally
+        by the following operations, see _migrate.
         """
-        pass
+        if self._old_bucket_list is not None:
+            # finish the previous resize first
+            self._migrate(len(self._old_bucket_list))
+        self._old_bucket_list = self._bucket_list
+        self._migrated = 0
+        self._num_buckets *= 2
+        self._bucket_list = [None] * self._num_buckets
+
+    def _migrate(self, steps=MIGRATION_STEP):
+        """
+        Moves the next steps buckets of the old table to the new one.
+        The new table takes at least 0.7 * n more puts before it expands again,
+        and moving more than 2 buckets per put empties the n / 2 old buckets first.
+        :param steps: number of old buckets to move
+        """
+        old_bucket_list = self._old_bucket_list
+        if old_bucket_list is None:
+            return
+        bucket_list, num_buckets = self._bucket_list, self._num_buckets
+        end = min(self._migrated + steps, len(old_bucket_list))
+        for i in range(self._migrated, end):
+            head = old_bucket_list[i]
+            while head is not None:
+                next_node = head.next
+                index = head.hash % num_buckets
+                head.next = bucket_list[index]
+                bucket_list[index] = head
+                head = next_node
+            old_bucket_list[i] = None
+        self._migrated = end
+        if end == len(old_bucket_list):
+            self._old_bucket_list = None
 
 
 class Node:
-    def __init__(self, key, value):
+    __slots__ = ("key", "value", "hash", "next")
+
+    def __init__(self, key, value, key_hash=None):
         self.key = key
         self.value = value
+        # cached hash of the key, used when resizing
+        self.hash = hash(key) if key_hash is None else key_hash
         self.next: Node = None
+
+
+class OpenAddressingHashMap:
+    """
+    Hash map with open addressing and Robin Hood linear probing.
+    Hashes, keys and values are stored in three parallel lists instead of
+    linked nodes. On insertion an entry takes the slot of any entry that is
+    closer to its home slot, which keeps probe sequences short, and deletion
+    shifts the following entries back instead of leaving tombstones.
+    """
+    # the table doubles when it gets fuller than this
+    MAX_LOAD = 0.75
+    # 2^64 divided by the golden ratio, for Fibonacci hashing
+    FIBONACCI = 0x9E3779B97F4A7C15
+
+    def __init__(self, capacity=8):
+        """
+        :param capacity: initial number of slots, rounded up to a power of two
+        """
+        self._size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """
+        Replaces the table by an empty one with at least capacity slots.
+        :param capacity: minimum number of slots
+        """
+        capacity = max(8, 1 << (capacity - 1).bit_length())
+        self._mask = capacity - 1
+        # the home slot of a hash is given by its top log2(capacity) bits
+        self._shift = 65 - capacity.bit_length()
+        # an empty slot has a hash of None
+        self._hashes: list = [None] * capacity
+        self._keys: list = [None] * capacity
+        self._values: list = [None] * capacity
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __iter__(self):
+        for i, key_hash in enumerate(self._hashes):
+            if key_hash is not None:
+                yield self._keys[i]
+
+    def size(self):
+        """
+        :return: number of elements in the map
+        """
+        return self._size
+
+    def items(self):
+        """
+        :return: generator of (key, value) pairs
+        """
+        for i, key_hash in enumerate(self._hashes):
+            if key_hash is not None:
+                yield self._keys[i], self._values[i]
+
+    def get(self, key):
+        """
+        Returns the value given a key.
+        Raises ValueError if the key is not in the map.
+        :param key: key
+        :return: value
+        """
+        i = self._find(key)
+        if i < 0:
+            raise ValueError("Key not in the map.")
+        return self._values[i]
+
+    def put(self, key, value):
+        """
+        Puts the key, value pair in the map
+        :param key: key
+        :param value: value
+        """
+        key_hash = self._hash(key)
+        i = self._find(key, key_hash)
+        if i >= 0:
+            self._values[i] = value
+            return
+        if self._size + 1 > (self._mask + 1) * self.MAX_LOAD:
+            self._resize(2 * (self._mask + 1))
+        self._insert(key_hash, key, value)
+        self._size += 1
+
+    def delete(self, key):
+        """
+        Removes the key from the map.
+        Raises ValueError if the key is not in the map.
+        :param key: key
+        """
+        i = self._find(key)
+        if i < 0:
+            raise ValueError("Key not in the map.")
+        hashes, keys, values, mask, shift = self._hashes, self._keys, self._values, self._mask, self._shift
+        j = (i + 1) & mask
+        # shift back the following entries until an empty slot or an entry in its home slot
+        while hashes[j] is not None and (j - (hashes[j] >> shift)) & mask != 0:
+            hashes[i], keys[i], values[i] = hashes[j], keys[j], values[j]
+            i, j = j, (j + 1) & mask
+        hashes[i] = keys[i] = values[i] = None
+        self._size -= 1
+
+    @classmethod
+    def _hash(cls, key):
+        """
+        Scrambles hash(key) with Fibonacci hashing, so that keys with regular
+        hashes, like consecutive integers or floats, spread over the table instead
+        of filling runs of neighbouring slots. Every bit of hash(key) reaches the
+        top bits of the product, which give the home slot.
+        :param key: key
+        :return: 64 bit hash, different for keys with different hash(key)
+        """
+        return (hash(key) * cls.FIBONACCI) & 0xFFFFFFFFFFFFFFFF
+
+    def _find(self, key, key_hash=None):
+        """
+        :param key: key
+        :param key_hash: scrambled hash of the key, computed if None
+        :return: the slot of the key, or -1
+        """
+        if key_hash is None:
+            key_hash = self._hash(key)
+        hashes, keys, mask, shift = self._hashes, self._keys, self._mask, self._shift
+        i = key_hash >> shift
+        distance = 0
+        while True:
+            slot_hash = hashes[i]
+            if slot_hash is None:
+                return -1
+            if (i - (slot_hash >> shift)) & mask < distance:
+                # the key would have displaced this entry, so it is not in the map
+                return -1
+            if slot_hash == key_hash and keys[i] == key:
+                return i
+            i = (i + 1) & mask
+            distance += 1
+
+    def _insert(self, key_hash, key, value):
+        """
+        Inserts a key that is not in the map. Assumes there is a free slot.
+        :param key_hash: scrambled hash of the key
+        :param key: key
+        :param value: value
+        """
+        hashes, keys, values, mask, shift = self._hashes, self._keys, self._values, self._mask, self._shift
+        i = key_hash >> shift
+        distance = 0
+        while True:
+            slot_hash = hashes[i]
+            if slot_hash is None:
+                hashes[i], keys[i], values[i] = key_hash, key, value
+                return
+            slot_distance = (i - (slot_hash >> shift)) & mask
+            if slot_distance < distance:
+                # take the slot from the richer entry and carry on inserting it
+                hashes[i], key_hash = key_hash, slot_hash
+                keys[i], key = key, keys[i]
+                values[i], value = value, values[i]
+                distance = slot_distance
+            i = (i + 1) & mask
+            distance += 1
+
+    def _resize(self, capacity):
+        """
+        Rehashes all the entries into a table with capacity slots.
+        :param capacity: new number of slots
+        """
+        hashes, keys, values = self._hashes, self._keys, self._values
+        self._allocate(capacity)
+        for i, key_hash in enumerate(hashes):
+            if key_hash is not None:
+                self._insert(key_hash, keys[i], values[i])
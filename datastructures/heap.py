@@ -1,10 +1,16 @@
 """
-Binary Heap Implementation
+Heap Implementations:
+ - Binary MinHeap and MaxHeap, on a list or a typed array, with push_pop,
+   replace, an O(n) merge of several heaps, and nsmallest / nlargest
+ - MutablePriorityQueue and the d-ary IndexedPriorityQueue with decrease-key
+ - PairingHeap and FibonacciHeap, which return node handles for decrease_key
+   and delete and meld in O(1)
 """
 from abc import ABC, abstractmethod
+from array import array
 from heapq import heappush, heappop
-import sys
 import itertools
+import operator
 
 
 class Heap(ABC):
@@ -12,18 +18,44 @@ class Heap(ABC):
     A heap is represented by a list of elements and the current size.
     Notice that an empty heap contains the element 0 already.
     This helps with calculating indices.
+    With a typecode ('d' for floats, 'q' for ints) the elements are kept in
+    a typed array.array instead of a list, without a Python object per element.
     """
-    def __init__(self, initial=None):
+    def __init__(self, initial=None, typecode=None):
+        self.typecode = typecode
+        if typecode is None:
+            self.heap_list = [0]
+        else:
+            self.heap_list = array(typecode, [0])
         if initial is None:
             # build empty heap
-            self.heap_list = [0]
             self.current_size = 0
         else:
             # build heap from list
-            self.heap_list = [0] + initial
-            self.current_size = len(initial)
+            self.heap_list.extend(initial)
+            self.current_size = len(self.heap_list) - 1
             self.build_heap()
 
+    def __len__(self):
+        return self.current_size
+
+    @classmethod
+    def merge(cls, *heaps):
+        """
+        Builds a new heap with the elements of all heaps in O(n),
+        where n is the total number of elements.
+        The result uses a typed array if all heaps use the same typecode.
+        :param heaps: heaps to be merged, left unchanged
+        :return: the merged heap
+        """
+        typecodes = {heap.typecode for heap in heaps}
+        merged = cls(typecode=typecodes.pop() if len(typecodes) == 1 else None)
+        for heap in heaps:
+            merged.heap_list.extend(heap.heap_list[1:heap.current_size + 1])
+        merged.current_size = len(merged.heap_list) - 1
+        merged.build_heap()
+        return merged
+
     def build_heap(self):
         """
         Builds heap from a random list
@@ -31,21 +63,110 @@ class Heap(ABC):
         for i in range(self.current_size//2, 0, -1):
             self.heapify(i)
 
+    @staticmethod
     @abstractmethod
+    def higher_priority(a, b):
+        """
+        :return: True if a belongs closer to the root than b
+        """
+        pass
+
     def heapify(self, i):
         """
-        Maintains the Heap property (Max or Min).
+        Maintains the Heap property (Max or Min) by sifting the element at i down.
         :param i: the subtrees rooted at left(i) and right(i) are heaps.
         """
-        pass
+        heap, size, higher = self.heap_list, self.current_size, self.higher_priority
+        item = heap[i]
+        while True:
+            child = 2 * i
+            if child > size:
+                break
+            if child < size and higher(heap[child + 1], heap[child]):
+                child += 1
+            if not higher(heap[child], item):
+                break
+            # move the child up into the hole
+            heap[i] = heap[child]
+            i = child
+        heap[i] = item
+
+    def _sift_up(self, i):
+        """
+        Moves the element at i up until its parent has a higher or equal priority.
+        :param i: index of the element
+        """
+        heap, higher = self.heap_list, self.higher_priority
+        item = heap[i]
+        while i > 1 and higher(item, heap[i // 2]):
+            heap[i] = heap[i // 2]
+            i //= 2
+        heap[i] = item
 
-    @abstractmethod
     def insert(self, key):
         """
         Inserts an element into the heap
         :param key: key to be inserted
         """
-        pass
+        self.current_size += 1
+        if self.current_size < len(self.heap_list):
+            self.heap_list[self.current_size] = key
+        else:
+            self.heap_list.append(key)
+        self._sift_up(self.current_size)
+
+    push = insert
+
+    def peek(self):
+        """
+        :return: the element at the root (maximum or minimum)
+        """
+        if self.current_size == 0:
+            raise ValueError("No elements in the Heap.")
+        return self.heap_list[1]
+
+    def pop(self):
+        """
+        Removes the element at the root and returns it.
+        :return: the maximum or minimum element
+        """
+        if self.current_size == 0:
+            raise ValueError("No elements in the Heap.")
+        heap = self.heap_list
+        top = heap[1]
+        last = heap[self.current_size]
+        # also drops the elements left behind by heap_sort
+        del heap[self.current_size:]
+        self.current_size -= 1
+        if self.current_size > 0:
+            heap[1] = last
+            self.heapify(1)
+        return top
+
+    def push_pop(self, key):
+        """
+        Pushes key and then pops the root, faster than insert followed by pop.
+        :param key: key to be pushed
+        :return: the maximum or minimum of key and the elements of the heap
+        """
+        heap = self.heap_list
+        if self.current_size > 0 and self.higher_priority(heap[1], key):
+            key, heap[1] = heap[1], key
+            self.heapify(1)
+        return key
+
+    def replace(self, key):
+        """
+        Pops the root and then pushes key, faster than pop followed by insert.
+        :param key: key to be pushed
+        :return: the popped root
+        """
+        if self.current_size == 0:
+            raise ValueError("No elements in the Heap.")
+        top = self.heap_list[1]
+        self.heap_list[1] = key
+        self.heapify(1)
+        return top
 
     def get_array(self):
         """
@@ -82,26 +203,20 @@ class Heap(ABC):
 
 
 class MaxHeap(Heap):
+    higher_priority = staticmethod(operator.gt)
+
     def max(self):
         """
         :return: the maximum element
         """
-        if self.current_size is 0:
-            raise ValueError("No elements in the Heap.")
-        return self.heap_list[1]
+        return self.peek()
 
     def extract_max(self):
         """
         Removes the maximum element and returns it.
         :return: the maximum element
         """
-        if self.current_size is 0:
-            raise ValueError("No elements in the Heap")
-        maximum = self.heap_list[1]
-        self.heap_list[1] = self.heap_list[self.current_size]
-        self.current_size -= 1
-        self.heapify(1)
-        return maximum
+        return self.pop()
 
     def increase_key(self, i, key):
         """
@@ -112,44 +227,90 @@ class MaxHeap(Heap):
         if key < self.heap_list[i]:
             raise ValueError("New key is smaller than current key.")
         self.heap_list[i] = key
-        while i > 1 and self.heap_list[self.parent(i)] < self.heap_list[i]:
-            self.heap_list[i], self.heap_list[self.parent(i)] =\
-                self.heap_list[self.parent(i)], self.heap_list[i]
-            i = self.parent(i)
+        self._sift_up(i)
 
-    def insert(self, key):
-        self.current_size += 1
-        self.heap_list[self.current_size] = -sys.maxsize
-        self.increase_key(self.current_size, key)
 
-    def heapify(self, i):
+class MinHeap(Heap):
+    higher_priority = staticmethod(operator.lt)
+
+    def min(self):
         """
-        Maintains the Max Heap property.
-        :param i: the subtrees rooted at left(i) and right(i) are max heaps.
+        :return: the minimum element
         """
-        left = self.left(i)
-        right = self.right(i)
-        if left <= self.current_size and self.heap_list[left] > self.heap_list[i]:
-            largest = left
-        else:
-            largest = i
-        if right <= self.current_size and self.heap_list[right] > self.heap_list[largest]:
-            largest = right
-        if largest != i:
-            self.heap_list[i], self.heap_list[largest] = self.heap_list[largest], self.heap_list[i]
-            self.heapify(largest)
+        return self.peek()
 
+    def extract_min(self):
+        """
+        Removes the minimum element and returns it.
+        :return: the minimum element
+        """
+        return self.pop()
 
-class MinHeap(Heap):
-    def heapify(self, i):
+    def decrease_key(self, i, key):
         """
-        Maintains the Min Heap property
-        :param i: the subtress rooted at left(i) and right(i) are min heaps.
+        Decreases the key at index i
+        :param i: index to be changed
+        :param key: new key
         """
-        pass
+        if key > self.heap_list[i]:
+            raise ValueError("New key is greater than current key.")
+        self.heap_list[i] = key
+        self._sift_up(i)
+
+
+def nsmallest(n, iterable, key=None, typecode=None):
+    """
+    Finds the n smallest elements with a max heap of size n,
+    in O(m * log(n)) time and O(n) memory for m elements.
+    :param n: number of elements
+    :param iterable: elements, consumed lazily
+    :param key: optional function computing the comparison key of an element
+    :param typecode: typecode of the heap when there is no key, see Heap
+    :return: sorted list of the n smallest elements
+    """
+    return _select(MaxHeap, n, iterable, key, typecode, 1)
 
-    def insert(self, key):
-        pass
+
+def nlargest(n, iterable, key=None, typecode=None):
+    """
+    Finds the n largest elements with a min heap of size n,
+    in O(m * log(n)) time and O(n) memory for m elements.
+    :param n: number of elements
+    :param iterable: elements, consumed lazily
+    :param key: optional function computing the comparison key of an element
+    :param typecode: typecode of the heap when there is no key, see Heap
+    :return: list of the n largest elements, largest first
+    """
+    return _select(MinHeap, n, iterable, key, typecode, -1)
+
+
+def _select(heap_class, n, iterable, key, typecode, direction):
+    """
+    Keeps the n best elements in a heap whose root is the worst of them.
+    With a key, the elements are decorated as (key, direction * position, element)
+    so that ties keep the earlier element, like sorted.
+    :return: the n best elements, best first
+    """
+    if n <= 0:
+        return []
+    if key is None:
+        heap = heap_class(typecode=typecode)
+        elements = iterable
+    else:
+        heap = heap_class()
+        elements = ((key(x), direction * i, x) for i, x in enumerate(iterable))
+    for x in elements:
+        if heap.current_size < n:
+            heap.insert(x)
+        else:
+            heap.push_pop(x)
+    best = []
+    while heap.current_size > 0:
+        best.append(heap.pop())
+    best.reverse()
+    if key is not None:
+        best = [x for _, _, x in best]
+    return best
 
 
 class MutablePriorityQueue:
@@ -209,3 +370,625 @@ class MutablePriorityQueue:
                 del self.entry_finder[task]
                 return task
         raise KeyError("Pop from an empty priority queue!")
+
+
+class IndexedPriorityQueue:
+    """
+    d-ary min heap with a position map from every task to its slot in the heap,
+    so the priority of a queued task is changed in place in O(log n) instead of
+    leaving a removed entry behind like MutablePriorityQueue.
+    Has the same add_task/remove_task/pop_task/empty interface.
+    Entries are kept in two parallel lists, priorities and tasks.
+    """
+    __slots__ = ("arity", "_priorities", "_tasks", "_position")
+
+    def __init__(self, arity=4):
+        """
+        :param arity: number of children of every heap node, 4 or 8 make the
+                      heap shallower and sift-downs more cache friendly
+        """
+        if arity < 2:
+            raise ValueError("The arity of the heap must be at least 2.")
+        self.arity = arity
+        # priorities[i] is the priority of tasks[i]
+        self._priorities = []
+        self._tasks = []
+        # mapping of tasks to their index in the heap
+        self._position = {}
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task):
+        return task in self._position
+
+    def empty(self):
+        """
+        :return: True if the queue is empty, false otherwise
+        """
+        return len(self._tasks) == 0
+
+    def priority(self, task):
+        """
+        Raises KeyError if not found.
+        :param task: a queued task
+        :return: the priority of the task
+        """
+        return self._priorities[self._position[task]]
+
+    def peek_task(self):
+        """
+        Returns the lowest priority task without removing it.
+        Raises KeyError if empty.
+        :return: lowest priority task
+        """
+        if not self._tasks:
+            raise KeyError("Peek from an empty priority queue!")
+        return self._tasks[0]
+
+    def add_task(self, task, priority=0):
+        """
+        Adds a new task or updates the priority of an existing task in place.
+        :param task: task to be added
+        :param priority: task's priority
+        """
+        i = self._position.get(task)
+        if i is None:
+            i = len(self._tasks)
+            self._priorities.append(priority)
+            self._tasks.append(task)
+            self._position[task] = i
+            self._sift_up(i)
+        elif priority < self._priorities[i]:
+            self._priorities[i] = priority
+            self._sift_up(i)
+        else:
+            self._priorities[i] = priority
+            self._sift_down(i)
+
+    def remove_task(self, task):
+        """
+        Removes an existing task.
+        Raises KeyError if not found.
+        :param task: to be removed
+        """
+        i = self._position.pop(task)
+        last_priority = self._priorities.pop()
+        last_task = self._tasks.pop()
+        if i < len(self._tasks):
+            # move the last entry into the hole and restore the heap order
+            self._priorities[i] = last_priority
+            self._tasks[i] = last_task
+            self._position[last_task] = i
+            self._sift_up(i)
+            self._sift_down(self._position[last_task])
+
+    def pop_task(self):
+        """
+        Removes and returns the lowest priority task.
+        Raises KeyError if empty.
+        :return: lowest priority task
+        """
+        if not self._tasks:
+            raise KeyError("Pop from an empty priority queue!")
+        task = self._tasks[0]
+        del self._position[task]
+        last_priority = self._priorities.pop()
+        last_task = self._tasks.pop()
+        if self._tasks:
+            self._priorities[0] = last_priority
+            self._tasks[0] = last_task
+            self._position[last_task] = 0
+            self._sift_down(0)
+        return task
+
+    def _sift_up(self, i):
+        """
+        Moves the entry at i up until its parent has a smaller or equal priority.
+        :param i: index of the entry
+        """
+        priorities, tasks, position, arity = self._priorities, self._tasks, self._position, self.arity
+        priority = priorities[i]
+        task = tasks[i]
+        while i > 0:
+            parent = (i - 1) // arity
+            if priorities[parent] <= priority:
+                break
+            # move the parent down into the hole
+            priorities[i] = priorities[parent]
+            tasks[i] = tasks[parent]
+            position[tasks[i]] = i
+            i = parent
+        priorities[i] = priority
+        tasks[i] = task
+        position[task] = i
+
+    def _sift_down(self, i):
+        """
+        Moves the entry at i down until all its children have greater or equal priorities.
+        :param i: index of the entry
+        """
+        priorities, tasks, position, arity = self._priorities, self._tasks, self._position, self.arity
+        n = len(tasks)
+        priority = priorities[i]
+        task = tasks[i]
+        while True:
+            first = arity * i + 1
+            if first >= n:
+                break
+            # find the child with the smallest priority
+            smallest = first
+            for child in range(first + 1, min(first + arity, n)):
+                if priorities[child] < priorities[smallest]:
+                    smallest = child
+            if priorities[smallest] >= priority:
+                break
+            # move the child up into the hole
+            priorities[i] = priorities[smallest]
+            tasks[i] = tasks[smallest]
+            position[tasks[i]] = i
+            i = smallest
+        priorities[i] = priority
+        tasks[i] = task
+        position[task] = i
+
+
+class MeldableHeap(ABC):
+    """
+    Min heap of nodes that are returned as handles by insert, so the priority
+    of a queued node is decreased in place and two heaps are melded in O(1).
+    Also has the add_task/remove_task/pop_task/empty interface of
+    IndexedPriorityQueue, so it can be used as the queue of the graph algorithms.
+    Use either the node handles or the tasks of one heap, not both.
+    """
+    def __init__(self):
+        self.size = 0
+        # mapping of tasks to their node, only used by the task interface
+        self._handles = {}
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, task):
+        return task in self._handles
+
+    def empty(self):
+        """
+        :return: True if the heap is empty, false otherwise
+        """
+        return self.size == 0
+
+    @abstractmethod
+    def insert(self, priority, task=None):
+        """
+        :param priority: priority of the new node
+        :param task: payload of the new node
+        :return: the node, a handle for decrease_key and delete
+        """
+        pass
+
+    @abstractmethod
+    def find_min(self):
+        """
+        Raises KeyError if empty.
+        :return: the node with the lowest priority
+        """
+        pass
+
+    @abstractmethod
+    def extract_min(self):
+        """
+        Removes the node with the lowest priority.
+        Raises KeyError if empty.
+        :return: the removed node
+        """
+        pass
+
+    @abstractmethod
+    def decrease_key(self, node, priority):
+        """
+        Lowers the priority of a node of this heap.
+        Raises ValueError if the new priority is greater than the current one.
+        :param node: handle returned by insert
+        :param priority: the new priority
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, node):
+        """
+        Removes a node of this heap.
+        :param node: handle returned by insert
+        """
+        pass
+
+    def meld(self, other):
+        """
+        Moves all the nodes of other, a heap of the same class, into this heap.
+        The two heaps must not share tasks. Other is left empty.
+        :param other: the heap to be melded
+        """
+        self._meld(other)
+        self.size += other.size
+        self._handles.update(other._handles)
+        other.__init__()
+
+    @abstractmethod
+    def _meld(self, other):
+        """
+        Links the nodes of other into this heap.
+        :param other: the heap to be melded
+        """
+        pass
+
+    def add_task(self, task, priority=0):
+        """
+        Adds a new task or updates the priority of an existing task.
+        A lower priority is a decrease_key, a higher one a delete and insert.
+        :param task: task to be added
+        :param priority: task's priority
+        """
+        node = self._handles.get(task)
+        if node is None:
+            self._handles[task] = self.insert(priority, task)
+        elif priority <= node.priority:
+            self.decrease_key(node, priority)
+        else:
+            self.delete(node)
+            self._handles[task] = self.insert(priority, task)
+
+    def remove_task(self, task):
+        """
+        Removes an existing task.
+        Raises KeyError if not found.
+        :param task: to be removed
+        """
+        self.delete(self._handles.pop(task))
+
+    def pop_task(self):
+        """
+        Removes and returns the lowest priority task.
+        Raises KeyError if empty.
+        :return: lowest priority task
+        """
+        task = self.extract_min().task
+        del self._handles[task]
+        return task
+
+    def peek_task(self):
+        """
+        Returns the lowest priority task without removing it.
+        Raises KeyError if empty.
+        :return: lowest priority task
+        """
+        return self.find_min().task
+
+    def priority(self, task):
+        """
+        Raises KeyError if not found.
+        :param task: a queued task
+        :return: the priority of the task
+        """
+        return self._handles[task].priority
+
+
+class PairingNode:
+    """
+    Node of a Pairing Heap. The children of a node are a list linked through
+    sibling, prev is the left sibling or, for the first child, the parent.
+    """
+    __slots__ = ("priority", "task", "child", "sibling", "prev")
+
+    def __init__(self, priority, task=None):
+        self.priority = priority
+        self.task = task
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+
+class PairingHeap(MeldableHeap):
+    """
+    Pairing Heap: a heap ordered multiway tree, restructured only by extract_min.
+    insert, meld and find_min are O(1), decrease_key is o(log n) amortised
+    (O(1) in practice) and extract_min and delete are O(log n) amortised.
+    """
+    def __init__(self):
+        super().__init__()
+        self.root = None
+
+    def insert(self, priority, task=None):
+        node = PairingNode(priority, task)
+        self.root = node if self.root is None else self._link(self.root, node)
+        self.size += 1
+        return node
+
+    def find_min(self):
+        if self.root is None:
+            raise KeyError("Peek from an empty heap!")
+        return self.root
+
+    def extract_min(self):
+        root = self.find_min()
+        self.root = self._merge_pairs(root.child)
+        root.child = None
+        self.size -= 1
+        return root
+
+    def decrease_key(self, node, priority):
+        if priority > node.priority:
+            raise ValueError("The new priority is greater than the current one.")
+        node.priority = priority
+        if node is not self.root:
+            self._cut(node)
+            self.root = self._link(self.root, node)
+
+    def delete(self, node):
+        if node is self.root:
+            self.extract_min()
+            return
+        self._cut(node)
+        subtree = self._merge_pairs(node.child)
+        node.child = None
+        if subtree is not None:
+            self.root = self._link(self.root, subtree)
+        self.size -= 1
+
+    def _meld(self, other):
+        if other.root is not None:
+            self.root = other.root if self.root is None else self._link(self.root, other.root)
+
+    @staticmethod
+    def _link(a, b):
+        """
+        Makes the root with the greater priority the first child of the other.
+        :param a: root of a tree
+        :param b: root of a tree
+        :return: the root of the linked tree
+        """
+        if b.priority < a.priority:
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        return a
+
+    @staticmethod
+    def _cut(node):
+        """
+        Detaches the subtree of node from its parent and siblings.
+        :param node: a node that is not the root
+        """
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.sibling = None
+        node.prev = None
+
+    @staticmethod
+    def _merge_pairs(first):
+        """
+        Two pass pairing: links the trees pairwise from left to right,
+        then links the results into one tree from right to left.
+        :param first: first tree of a sibling list
+        :return: root of the merged tree, None if the list is empty
+        """
+        pairs = []
+        while first is not None:
+            a = first
+            b = a.sibling
+            a.prev = a.sibling = None
+            if b is None:
+                pairs.append(a)
+                break
+            first = b.sibling
+            b.prev = b.sibling = None
+            pairs.append(PairingHeap._link(a, b))
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = PairingHeap._link(pairs.pop(), root)
+        return root
+
+
+class FibonacciNode:
+    """
+    Node of a Fibonacci Heap. Siblings are kept in a circular doubly linked list.
+    """
+    __slots__ = ("priority", "task", "parent", "child", "left", "right", "degree", "mark")
+
+    def __init__(self, priority, task=None):
+        self.priority = priority
+        self.task = task
+        self.parent = None
+        self.child = None
+        self.left = self
+        self.right = self
+        self.degree = 0
+        # True if the node lost a child since it became the child of its parent
+        self.mark = False
+
+
+class FibonacciHeap(MeldableHeap):
+    """
+    Fibonacci Heap, see Introduction to Algorithms chapter 19.
+    insert, meld, find_min and decrease_key are O(1) amortised,
+    extract_min and delete are O(log n) amortised.
+    """
+    def __init__(self):
+        super().__init__()
+        self.min = None
+
+    def insert(self, priority, task=None):
+        node = FibonacciNode(priority, task)
+        self._add_root(node)
+        self.size += 1
+        return node
+
+    def find_min(self):
+        if self.min is None:
+            raise KeyError("Peek from an empty heap!")
+        return self.min
+
+    def extract_min(self):
+        z = self.find_min()
+        # move the children of z to the root list
+        child = z.child
+        if child is not None:
+            children = [child]
+            node = child.right
+            while node is not child:
+                children.append(node)
+                node = node.right
+            for node in children:
+                node.parent = None
+                node.mark = False
+                self._splice(z, node)
+            z.child = None
+        # remove z from the root list
+        z.left.right = z.right
+        z.right.left = z.left
+        if z.right is z:
+            self.min = None
+        else:
+            self.min = z.right
+            self._consolidate()
+        z.left = z.right = z
+        z.degree = 0
+        self.size -= 1
+        return z
+
+    def decrease_key(self, node, priority):
+        if priority > node.priority:
+            raise ValueError("The new priority is greater than the current one.")
+        node.priority = priority
+        parent = node.parent
+        if parent is not None and priority < parent.priority:
+            self._cut(node, parent)
+            self._cascading_cut(parent)
+        if priority < self.min.priority:
+            self.min = node
+
+    def delete(self, node):
+        # same as decreasing the priority to minus infinity and extracting the minimum
+        parent = node.parent
+        if parent is not None:
+            self._cut(node, parent)
+            self._cascading_cut(parent)
+        self.min = node
+        self.extract_min()
+
+    def _meld(self, other):
+        if other.min is None:
+            return
+        if self.min is None:
+            self.min = other.min
+            return
+        # concatenate the two circular root lists
+        a, b = self.min, other.min
+        a_right, b_left = a.right, b.left
+        a.right = b
+        b.left = a
+        b_left.right = a_right
+        a_right.left = b_left
+        if b.priority < a.priority:
+            self.min = b
+
+    @staticmethod
+    def _splice(a, node):
+        """
+        Inserts node to the right of a in the circular list of a.
+        """
+        node.left = a
+        node.right = a.right
+        a.right.left = node
+        a.right = node
+
+    def _add_root(self, node):
+        """
+        Adds node to the root list and updates the minimum.
+        """
+        if self.min is None:
+            node.left = node.right = node
+            self.min = node
+        else:
+            self._splice(self.min, node)
+            if node.priority < self.min.priority:
+                self.min = node
+
+    def _consolidate(self):
+        """
+        Links the roots of equal degree until all the roots have distinct degrees.
+        """
+        roots = [self.min]
+        node = self.min.right
+        while node is not self.min:
+            roots.append(node)
+            node = node.right
+        by_degree = []
+        for x in roots:
+            d = x.degree
+            while d < len(by_degree) and by_degree[d] is not None:
+                y = by_degree[d]
+                if y.priority < x.priority:
+                    x, y = y, x
+                self._link(y, x)
+                by_degree[d] = None
+                d += 1
+            if d >= len(by_degree):
+                by_degree.extend([None] * (d + 1 - len(by_degree)))
+            by_degree[d] = x
+        self.min = None
+        for x in by_degree:
+            if x is not None and (self.min is None or x.priority < self.min.priority):
+                self.min = x
+
+    def _link(self, y, x):
+        """
+        Removes the root y from the root list and makes it a child of the root x.
+        """
+        y.left.right = y.right
+        y.right.left = y.left
+        y.parent = x
+        y.mark = False
+        if x.child is None:
+            y.left = y.right = y
+            x.child = y
+        else:
+            self._splice(x.child, y)
+        x.degree += 1
+
+    def _cut(self, x, y):
+        """
+        Moves x, a child of y, to the root list.
+        """
+        if x.right is x:
+            y.child = None
+        else:
+            x.left.right = x.right
+            x.right.left = x.left
+            if y.child is x:
+                y.child = x.right
+        y.degree -= 1
+        x.parent = None
+        x.mark = False
+        self._splice(self.min, x)
+
+    def _cascading_cut(self, y):
+        """
+        Cuts y from its parent if it already lost a child, and so on up the tree.
+        """
+        z = y.parent
+        while z is not None:
+            if not y.mark:
+                y.mark = True
+                return
+            self._cut(y, z)
+            y = z
+            z = y.parent
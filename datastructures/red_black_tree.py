@@ -7,7 +7,15 @@ It has the following properties:
  - If a node is red, then both its children are black
  - For each node, all simple paths from the node to descendant leaves
    contain the same number of black nodes
+Every node also stores the sizes of its left and right subtrees,
+which gives O(log n) order statistic queries (select, rank, percentile).
+Nodes can hold a value next to their key, so the tree doubles as an ordered map.
+Bulk operations (join, split, union, intersection, difference) follow
+the join-based algorithms of Blelloch, Ferizovic and Sun,
+"Just Join for Parallel Ordered Sets".
 """
+import math
+
 # black color
 BLACK = 0
 # red color
@@ -18,7 +26,10 @@ class RBNode:
     """
     Represents a node of a Red Black Tree
     """
-    def __init__(self, key=None):
+    # no per-node __dict__, trees hold millions of nodes
+    __slots__ = ("color", "parent", "left", "right", "num_left", "num_right", "key", "value")
+
+    def __init__(self, key=None, value=None):
         # color of the node
         self.color = BLACK
         # initialize parent, left child and right child
@@ -29,26 +40,194 @@ class RBNode:
         self.num_left = 0
         # number of elements to the right of this node
         self.num_right = 0
-        # set key
+        # set key and value
         self.key = key
+        self.value = value
+
+
+class NilNode(RBNode):
+    """
+    The NIL node shared by all Red Black Trees.
+    It is read-only: no tree operation writes to it, so unrelated
+    trees can be used from different threads without any locking.
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        for name, value in (("color", BLACK), ("num_left", 0), ("num_right", 0), ("key", None), ("value", None)):
+            object.__setattr__(self, name, value)
+        for name in ("parent", "left", "right"):
+            object.__setattr__(self, name, self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("The NIL node is read-only.")
 
 
 # the NIL node of the Red Black Tree
-nil: RBNode = RBNode()
+nil: RBNode = NilNode()
 
 
 class RedBlackTree:
     def __init__(self):
         self.root: RBNode = nil
-        self.root.parent = nil
-        self.root.left = nil
-        self.root.right = nil
+
+    def __len__(self):
+        return self._size(self.root)
+
+    def __contains__(self, key):
+        return self.search(self.root, key) is not nil
+
+    def __getitem__(self, key):
+        x = self.search(self.root, key)
+        if x is nil:
+            raise KeyError(key)
+        return x.value
+
+    def __setitem__(self, key, value):
+        x = self.search(self.root, key)
+        if x is nil:
+            self.insert(key, value)
+        else:
+            x.value = value
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def __iter__(self):
+        for x in self._iter_nodes(self.minimum(), self.successor):
+            yield x.key
+
+    def __reversed__(self):
+        for x in self._iter_nodes(self.maximum(), self.predecessor):
+            yield x.key
+
+    @staticmethod
+    def _size(x: RBNode):
+        """
+        :param x: root of a subtree
+        :return: number of nodes in the subtree
+        """
+        if x is nil:
+            return 0
+        return x.num_left + x.num_right + 1
 
     def in_order_walk(self, x: RBNode):
-        if x is not nil:
-            print(str(x.key) + ", c: " + str(x.color))
-            self.in_order_walk(x.left)
-            self.in_order_walk(x.right)
+        """
+        Prints the keys and colors of the subtree rooted at x in order.
+        :param x: root of the subtree
+        """
+        stack = []
+        while stack or x is not nil:
+            if x is not nil:
+                stack.append(x)
+                x = x.left
+            else:
+                x = stack.pop()
+                print(str(x.key) + ", c: " + str(x.color))
+                x = x.right
+
+    @staticmethod
+    def _iter_nodes(x: RBNode, step):
+        """
+        Lazily walks the nodes starting at x.
+        Each step is amortized O(1), so k nodes are produced in O(log n + k).
+        :param x: first node, or nil
+        :param step: self.successor or self.predecessor
+        :return: generator of nodes
+        """
+        while x is not nil:
+            # step before yielding, so the caller may delete the yielded node
+            next_x = step(x)
+            yield x
+            x = next_x
+
+    def items(self):
+        """
+        :return: generator of (key, value) pairs in key order
+        """
+        for x in self._iter_nodes(self.minimum(), self.successor):
+            yield x.key, x.value
+
+    def values(self):
+        """
+        :return: generator of the values in key order
+        """
+        for x in self._iter_nodes(self.minimum(), self.successor):
+            yield x.value
+
+    def get(self, key, default=None):
+        """
+        :param key: key
+        :param default: returned if the key is not in the tree
+        :return: the value of key, or default
+        """
+        x = self.search(self.root, key)
+        return default if x is nil else x.value
+
+    def floor(self, key):
+        """
+        :param key: any key comparable with the keys of the tree
+        :return: the largest key smaller than or equal to key, or None
+        """
+        x = self._floor_node(key)
+        return None if x is nil else x.key
+
+    def ceiling(self, key):
+        """
+        :param key: any key comparable with the keys of the tree
+        :return: the smallest key greater than or equal to key, or None
+        """
+        x = self._ceiling_node(key)
+        return None if x is nil else x.key
+
+    def _floor_node(self, key):
+        """
+        :return: the last node in order with a key <= key, or nil
+        """
+        best = nil
+        x = self.root
+        while x is not nil:
+            if key < x.key:
+                x = x.left
+            else:
+                best = x
+                x = x.right
+        return best
+
+    def _ceiling_node(self, key):
+        """
+        :return: the first node in order with a key >= key, or nil
+        """
+        best = nil
+        x = self.root
+        while x is not nil:
+            if x.key < key:
+                x = x.right
+            else:
+                best = x
+                x = x.left
+        return best
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        """
+        Lazily iterates over the keys k with lo <= k <= hi in O(log n + k).
+        :param lo: lower bound, inclusive, None for no bound
+        :param hi: upper bound, inclusive, None for no bound
+        :param reverse: iterate from hi down to lo
+        :return: generator of keys
+        """
+        if reverse:
+            x = self.maximum() if hi is None else self._floor_node(hi)
+            for x in self._iter_nodes(x, self.predecessor):
+                if lo is not None and x.key < lo:
+                    return
+                yield x.key
+        else:
+            x = self.minimum() if lo is None else self._ceiling_node(lo)
+            for x in self._iter_nodes(x, self.successor):
+                if hi is not None and hi < x.key:
+                    return
+                yield x.key
 
     def minimum(self, x: RBNode=None):
         """
@@ -102,19 +281,24 @@ class RedBlackTree:
             y = y.parent
         return y
 
-    def insert(self, key):
+    def insert(self, key, value=None):
         """
-        Insert the value into the tree.
+        Insert the key into the tree. Duplicate keys are allowed,
+        use tree[key] = value to replace the value of an existing key.
         :param key: to be inserted
+        :param value: optional value stored with the key
         """
-        z: RBNode = RBNode(key)
+        z: RBNode = RBNode(key, value)
         y = nil
         x = self.root
         while x is not nil:
             y = x
+            # z ends up in the subtree that is followed
             if z.key < x.key:
+                x.num_left += 1
                 x = x.left
             else:
+                x.num_right += 1
                 x = x.right
         z.parent = y
         if y is nil:
@@ -134,21 +318,31 @@ class RedBlackTree:
         :param key: key to be deleted
         """
         z = self.search(self.root, key)
+        if z is nil:
+            raise KeyError("Key not in the tree.")
+        # the node removed from its position is z, or its successor if z has two children
+        if z.left is nil or z.right is nil:
+            self._decrement_sizes(z)
+        else:
+            self._decrement_sizes(self.minimum(z.right))
         y = z
         y_original_color = y.color
+        # x moves into the removed position, x_parent is tracked explicitly
+        # because x may be the read-only NIL node
         if z.left is nil:
-            x = z.right
+            x, x_parent = z.right, z.parent
             self._transplant(z, z.right)
         elif z.right is nil:
-            x = z.left
+            x, x_parent = z.left, z.parent
             self._transplant(z, z.left)
         else:
             y = self.minimum(z.right)
             y_original_color = y.color
             x = y.right
             if y.parent is z:
-                x.parent = y
+                x_parent = y
             else:
+                x_parent = y.parent
                 self._transplant(y, y.right)
                 y.right = z.right
                 y.right.parent = y
@@ -156,22 +350,389 @@ class RedBlackTree:
             y.left = z.left
             y.left.parent = y
             y.color = z.color
+            y.num_left = z.num_left
+            y.num_right = z.num_right
         if y_original_color is BLACK:
-            self._delete_fix_up(x)
+            self._delete_fix_up(x, x_parent)
+
+    def _decrement_sizes(self, x: RBNode):
+        """
+        Updates the subtree sizes of all ancestors of x before x is removed.
+        :param x: the node about to be removed from its position
+        """
+        while x.parent is not nil:
+            if x is x.parent.left:
+                x.parent.num_left -= 1
+            else:
+                x.parent.num_right -= 1
+            x = x.parent
+
+    ###########################
+    # Order statistic queries #
+    ###########################
+
+    def select(self, k):
+        """
+        Finds the k-th smallest key in O(log n).
+        :param k: 0-based rank, negative values count from the largest key
+        :return: the key with rank k
+        """
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("Rank out of range.")
+        x = self.root
+        while True:
+            if k < x.num_left:
+                x = x.left
+            elif k == x.num_left:
+                return x.key
+            else:
+                k -= x.num_left + 1
+                x = x.right
+
+    def rank(self, key):
+        """
+        :param key: any key comparable with the keys of the tree
+        :return: the number of keys strictly smaller than key
+        """
+        return self._count_below(key, inclusive=False)
+
+    def _count_below(self, key, inclusive):
+        """
+        :param key: bound
+        :param inclusive: also count the keys equal to key
+        :return: the number of keys smaller than (or equal to) key
+        """
+        count = 0
+        x = self.root
+        while x is not nil:
+            if x.key < key or (inclusive and x.key == key):
+                count += x.num_left + 1
+                x = x.right
+            else:
+                x = x.left
+        return count
+
+    def count_range(self, lo, hi):
+        """
+        :param lo: lower bound, inclusive
+        :param hi: upper bound, inclusive
+        :return: the number of keys k with lo <= k <= hi
+        """
+        if hi < lo:
+            return 0
+        return self._count_below(hi, inclusive=True) - self._count_below(lo, inclusive=False)
+
+    def percentile(self, p):
+        """
+        Nearest-rank percentile of the keys.
+        :param p: percentile between 0 and 100
+        :return: the smallest key such that at least p percent of the keys are smaller or equal
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100.")
+        n = len(self)
+        if n == 0:
+            raise ValueError("No elements in the tree.")
+        return self.select(max(0, math.ceil(p / 100 * n) - 1))
+
+    ###################
+    # Bulk operations #
+    ###################
+
+    @classmethod
+    def from_sorted(cls, keys, values=None):
+        """
+        Builds a tree from sorted keys in O(n).
+        The tree is perfectly balanced and only its deepest level is red.
+        :param keys: iterable of keys in non-decreasing order
+        :param values: optional iterable of the values of the keys
+        :return: the new tree
+        """
+        keys = list(keys)
+        n = len(keys)
+        values = [None] * n if values is None else list(values)
+        if len(values) != n:
+            raise ValueError("keys and values must have the same length.")
+        for i in range(1, n):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("Keys are not sorted.")
+        tree = cls()
+        # depth of the deepest level, which is colored red unless it is the root
+        red_depth = n.bit_length() - 1
+
+        def build(lo, hi, depth, parent):
+            if lo > hi:
+                return nil
+            mid = (lo + hi) // 2
+            x = RBNode(keys[mid], values[mid])
+            x.parent = parent
+            x.color = RED if 0 < depth == red_depth else BLACK
+            x.left = build(lo, mid - 1, depth + 1, x)
+            x.right = build(mid + 1, hi, depth + 1, x)
+            x.num_left = mid - lo
+            x.num_right = hi - mid
+            return x
+
+        tree.root = build(0, n - 1, 0, nil)
+        return tree
+
+    def copy(self):
+        """
+        :return: a new tree with the same keys and values, built in O(n)
+        """
+        return self.from_sorted(self, self.values())
+
+    @classmethod
+    def join(cls, left, key, right, value=None):
+        """
+        Joins two trees and a key in O(log n), given that every key of left
+        is smaller than or equal to key and every key of right is greater than or equal to key.
+        The nodes of left and right are moved into the result, leaving them empty.
+        :param left: tree with the smaller keys
+        :param key: the middle key
+        :param right: tree with the greater keys
+        :param value: value of the middle key
+        :return: the joined tree
+        """
+        if (left.root is not nil and key < left.maximum().key) or \
+                (right.root is not nil and right.minimum().key < key):
+            raise ValueError("Keys of left must be <= key <= keys of right.")
+        tree = cls()
+        tree.root = tree._join(left._take_root(), RBNode(key, value), right._take_root())
+        return tree
+
+    def split(self, key):
+        """
+        Splits the tree in O(log n) into the keys smaller than key and the rest.
+        The nodes are moved into the two new trees, leaving this tree empty.
+        :param key: split key
+        :return: (tree of the keys < key, tree of the keys >= key)
+        """
+        left, right = type(self)(), type(self)()
+        # _split rotates and joins through the root of the tree it runs on,
+        # so it runs on a scratch tree and self is left empty
+        left.root, right.root = left._split(self._take_root(), key)
+        return left, right
+
+    def union(self, other):
+        """
+        Union of two trees of unique keys, the value of a common key is taken from self.
+        Runs in O(m log(n / m + 1)) where m is the size of the smaller tree.
+        The nodes are moved into the result, leaving self and other empty.
+        :param other: the other tree
+        :return: the union tree
+        """
+        tree = type(self)()
+        tree.root = tree._union(self._take_root(), other._take_root())
+        return tree
+
+    def intersection(self, other):
+        """
+        Intersection of two trees of unique keys, with the values of self.
+        Runs in O(m log(n / m + 1)) where m is the size of the smaller tree.
+        The nodes are moved into the result, leaving self and other empty.
+        :param other: the other tree
+        :return: the intersection tree
+        """
+        tree = type(self)()
+        tree.root = tree._intersection(self._take_root(), other._take_root())
+        return tree
+
+    def difference(self, other):
+        """
+        The keys of self that are not in other, for trees of unique keys.
+        Runs in O(m log(n / m + 1)) where m is the size of the smaller tree.
+        The nodes are moved into the result, leaving self and other empty.
+        :param other: the other tree
+        :return: the difference tree
+        """
+        tree = type(self)()
+        tree.root = tree._difference(self._take_root(), other._take_root())
+        return tree
+
+    def _take_root(self):
+        """
+        Empties the tree.
+        :return: the detached root of the tree
+        """
+        root = self.root
+        self.root = nil
+        return self._detach(root)
+
+    @staticmethod
+    def _detach(x: RBNode):
+        """
+        Turns the subtree rooted at x into a standalone tree, with a black root.
+        :param x: root of the subtree
+        :return: x
+        """
+        if x is not nil:
+            x.parent = nil
+            x.color = BLACK
+        return x
+
+    @staticmethod
+    def _black_height(x: RBNode):
+        """
+        :param x: root of a subtree
+        :return: number of black nodes on any path from x down to a leaf
+        """
+        height = 0
+        while x is not nil:
+            if x.color is BLACK:
+                height += 1
+            x = x.left
+        return height
+
+    def _join(self, left: RBNode, z: RBNode, right: RBNode):
+        """
+        Joins two standalone trees and a detached node z lying between them.
+        The node is hung from the spine of the taller tree at the level
+        of the shorter one and the insertion fix-up restores the colors.
+        Uses self.root while fixing up.
+        :param left: root of the tree with the smaller keys
+        :param z: the middle node
+        :param right: root of the tree with the greater keys
+        :return: the root of the joined tree
+        """
+        left_height, right_height = self._black_height(left), self._black_height(right)
+        left_size, right_size = self._size(left), self._size(right)
+        if left_height == right_height:
+            z.left, z.right, z.parent = left, right, nil
+            z.num_left, z.num_right = left_size, right_size
+            z.color = BLACK
+            if left is not nil:
+                left.parent = z
+            if right is not nil:
+                right.parent = z
+            return z
+        if left_height > right_height:
+            # walk down the right spine of left to a black node as high as right
+            x, parent, height = left, nil, left_height
+            while x.color is RED or height > right_height:
+                if x.color is BLACK:
+                    height -= 1
+                x.num_right += right_size + 1
+                parent, x = x, x.right
+            parent.right = z
+            z.left, z.right = x, right
+            z.num_left, z.num_right = self._size(x), right_size
+            other = right
+            self.root = left
+        else:
+            x, parent, height = right, nil, right_height
+            while x.color is RED or height > left_height:
+                if x.color is BLACK:
+                    height -= 1
+                x.num_left += left_size + 1
+                parent, x = x, x.left
+            parent.left = z
+            z.left, z.right = left, x
+            z.num_left, z.num_right = left_size, self._size(x)
+            other = left
+            self.root = right
+        z.parent = parent
+        z.color = RED
+        if x is not nil:
+            x.parent = z
+        if other is not nil:
+            other.parent = z
+        self._insert_fix_up(z)
+        return self.root
+
+    def _join2(self, left: RBNode, right: RBNode):
+        """
+        Joins two standalone trees without a middle node.
+        :return: the root of the joined tree
+        """
+        if left is nil:
+            return right
+        left, last = self._split_last(left)
+        return self._join(left, last, right)
+
+    def _split_last(self, x: RBNode):
+        """
+        Detaches the maximum node of the standalone tree rooted at x.
+        :return: (root of the remaining tree, maximum node)
+        """
+        left, right = self._detach(x.left), self._detach(x.right)
+        if right is nil:
+            return left, x
+        right, last = self._split_last(right)
+        return self._join(left, x, right), last
+
+    def _split(self, x: RBNode, key):
+        """
+        Splits the standalone tree rooted at x.
+        :return: (root of the keys < key, root of the keys >= key)
+        """
+        if x is nil:
+            return nil, nil
+        left, right = self._detach(x.left), self._detach(x.right)
+        if x.key < key:
+            smaller, greater = self._split(right, key)
+            return self._join(left, x, smaller), greater
+        smaller, greater = self._split(left, key)
+        return smaller, self._join(greater, x, right)
+
+    def _split3(self, x: RBNode, key):
+        """
+        Splits the standalone tree rooted at x, which has unique keys.
+        :return: (root of the keys < key, node with key or nil, root of the keys > key)
+        """
+        if x is nil:
+            return nil, nil, nil
+        left, right = self._detach(x.left), self._detach(x.right)
+        if key < x.key:
+            smaller, middle, greater = self._split3(left, key)
+            return smaller, middle, self._join(greater, x, right)
+        if x.key < key:
+            smaller, middle, greater = self._split3(right, key)
+            return self._join(left, x, smaller), middle, greater
+        return left, x, right
+
+    def _union(self, a: RBNode, b: RBNode):
+        if a is nil:
+            return b
+        if b is nil:
+            return a
+        left, right = self._detach(a.left), self._detach(a.right)
+        smaller, _, greater = self._split3(b, a.key)
+        return self._join(self._union(left, smaller), a, self._union(right, greater))
+
+    def _intersection(self, a: RBNode, b: RBNode):
+        if a is nil or b is nil:
+            return nil
+        left, right = self._detach(a.left), self._detach(a.right)
+        smaller, middle, greater = self._split3(b, a.key)
+        left, right = self._intersection(left, smaller), self._intersection(right, greater)
+        if middle is nil:
+            return self._join2(left, right)
+        return self._join(left, a, right)
+
+    def _difference(self, a: RBNode, b: RBNode):
+        if a is nil or b is nil:
+            return a
+        left, right = self._detach(b.left), self._detach(b.right)
+        smaller, _, greater = self._split3(a, b.key)
+        return self._join2(self._difference(smaller, left), self._difference(greater, right))
 
     def search(self, x: RBNode, key):
         """
         Searches for the key starting at x
         :param x: start
         :param key: key to be found
-        :return: the node with the key
+        :return: the node with the key, or nil
         """
-        if x is nil or key == x.key:
-            return x
-        if key < x.key:
-            return self.search(x.left, key)
-        else:
-            return self.search(x.right, key)
+        while x is not nil and key != x.key:
+            if key < x.key:
+                x = x.left
+            else:
+                x = x.right
+        return x
 
     def _insert_fix_up(self, z: RBNode):
         """
@@ -214,55 +775,59 @@ class RedBlackTree:
                     self._left_rotate(z.parent.parent)
         self.root.color = BLACK
 
-    def _delete_fix_up(self, x: RBNode):
+    def _delete_fix_up(self, x: RBNode, parent: RBNode):
         """
         Fixes the properties of the Red Black Tree after deletion
         :param x: starting node
+        :param parent: parent of x, needed when x is NIL
         """
         while x is not self.root and x.color is BLACK:
-            if x is x.parent.left:
-                w = x.parent.right
+            if x is parent.left:
+                w = parent.right
                 if w.color is RED:
                     w.color = BLACK
-                    x.parent.color = RED
-                    self._left_rotate(x.parent)
-                    w = x.parent.right
+                    parent.color = RED
+                    self._left_rotate(parent)
+                    w = parent.right
                 if w.left.color is BLACK and w.right.color is BLACK:
                     w.color = RED
-                    x = x.parent
+                    x = parent
+                    parent = x.parent
                 else:
                     if w.right.color is BLACK:
                         w.left.color = BLACK
                         w.color = RED
                         self._right_rotate(w)
-                        w = x.parent.right
-                    w.color = x.parent.color
-                    x.parent.color = BLACK
+                        w = parent.right
+                    w.color = parent.color
+                    parent.color = BLACK
                     w.right.color = BLACK
-                    self._left_rotate(x.parent)
+                    self._left_rotate(parent)
                     x = self.root
             else:
-                w = x.parent.left
+                w = parent.left
                 if w.color is RED:
                     w.color = BLACK
-                    x.parent.color = RED
-                    self._right_rotate(x.parent)
-                    w = x.parent.left
+                    parent.color = RED
+                    self._right_rotate(parent)
+                    w = parent.left
                 if w.left.color is BLACK and w.right.color is BLACK:
                     w.color = RED
-                    x = x.parent
+                    x = parent
+                    parent = x.parent
                 else:
                     if w.left.color is BLACK:
                         w.right.color = BLACK
                         w.color = RED
                         self._left_rotate(w)
-                        w = x.parent.left
-                    w.color = x.parent.color
-                    x.parent.color = BLACK
+                        w = parent.left
+                    w.color = parent.color
+                    parent.color = BLACK
                     w.left.color = BLACK
-                    self._right_rotate(x.parent)
+                    self._right_rotate(parent)
                     x = self.root
-        x.color = BLACK
+        if x is not nil:
+            x.color = BLACK
 
     def _transplant(self, u: RBNode, v: RBNode):
         """
@@ -276,7 +841,8 @@ class RedBlackTree:
             u.parent.left = v
         else:
             u.parent.right = v
-        v.parent = u.parent
+        if v is not nil:
+            v.parent = u.parent
 
     def _left_rotate(self, x: RBNode):
         """
@@ -296,6 +862,9 @@ class RedBlackTree:
             x.parent.right = y
         y.left = x
         x.parent = y
+        # x lost y and y.left from its right subtree, y gained x and x.left
+        x.num_right = y.num_left
+        y.num_left = x.num_left + x.num_right + 1
 
     def _right_rotate(self, y: RBNode):
         """
@@ -315,9 +884,13 @@ class RedBlackTree:
             y.parent.right = x
         x.right = y
         y.parent = x
+        # y lost x and x.right from its left subtree, x gained y and y.right
+        y.num_left = x.num_right
+        x.num_right = y.num_left + y.num_right + 1
 
 
-red_black_tree = RedBlackTree()
-for i in range(1, 20):
-    red_black_tree.insert(i)
-red_black_tree.in_order_walk(red_black_tree.root)
+if __name__ == "__main__":
+    red_black_tree = RedBlackTree()
+    for i in range(1, 20):
+        red_black_tree.insert(i)
+    red_black_tree.in_order_walk(red_black_tree.root)
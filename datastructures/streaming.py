@@ -0,0 +1,144 @@
+"""
+Streaming algorithms built on the Binary Heap:
+k-way merging of sorted iterables and running top-k / bottom-k sets.
+All of them use O(k) memory and consume their inputs lazily.
+"""
+from datastructures.heap import MaxHeap, MinHeap
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def kway_merge(*iterables, key=None, reverse=False):
+    """
+    Lazily merges sorted iterables into one sorted stream.
+    Keeps one element per input in a heap, so it uses O(k) memory for
+    k inputs and O(log k) time per element. Equal elements come out in the
+    order of their inputs, so the merge is stable.
+    :param iterables: sorted iterables, in descending order if reverse
+    :param key: optional function computing the comparison key of an element
+    :param reverse: merge iterables sorted in descending order
+    :return: generator of the merged elements
+    """
+    # heap entries are (key, position of the input, element, iterator),
+    # the position breaks ties so iterators are never compared
+    if reverse:
+        heap, direction = MaxHeap(), -1
+    else:
+        heap, direction = MinHeap(), 1
+    for i, iterator in enumerate(map(iter, iterables)):
+        for x in iterator:
+            heap.insert((x if key is None else key(x), direction * i, x, iterator))
+            break
+    while heap.current_size > 1:
+        _, i, x, iterator = heap.peek()
+        yield x
+        for y in iterator:
+            heap.replace((y if key is None else key(y), i, y, iterator))
+            break
+        else:
+            heap.pop()
+    if heap.current_size == 1:
+        _, _, x, iterator = heap.pop()
+        yield x
+        yield from iterator
+
+
+class TopK:
+    """
+    Keeps the k largest elements pushed so far in a min heap of size k,
+    whose root is the smallest element that is still kept.
+    Ties keep the element pushed first, like heapq.nlargest.
+    """
+    heap_class = MinHeap
+    # sign of the push counter used to break ties between equal keys
+    direction = -1
+
+    def __init__(self, k, key=None, typecode=None):
+        """
+        :param k: number of elements to keep
+        :param key: optional function computing the comparison key of an element
+        :param typecode: typecode of the heap when there is no key, see Heap
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative.")
+        self.k = k
+        self.key = key
+        self._heap = self.heap_class(typecode=None if key is not None else typecode)
+        # number of elements pushed so far
+        self._count = 0
+
+    def __len__(self):
+        return self._heap.current_size
+
+    def push(self, x):
+        """
+        Offers an element, in O(log k).
+        :param x: the element
+        """
+        if self.key is not None:
+            x = (self.key(x), self.direction * self._count, x)
+        self._count += 1
+        if self._heap.current_size < self.k:
+            self._heap.insert(x)
+        elif self.k > 0:
+            self._heap.push_pop(x)
+
+    def push_many(self, elements):
+        """
+        Offers all the elements. For a NumPy array (and no key) the batch is
+        first cut down to its own best k elements with a vectorised partition.
+        :param elements: iterable or NumPy array of elements
+        """
+        if self.k == 0:
+            return
+        if np is not None and isinstance(elements, np.ndarray) and self.key is None:
+            elements = self._best_of_batch(elements.ravel()).tolist()
+        for x in elements:
+            self.push(x)
+
+    def _best_of_batch(self, values):
+        """
+        :param values: 1-d NumPy array
+        :return: the values that can still enter the top k
+        """
+        if self._heap.current_size == self.k and self.k > 0:
+            values = values[values > self._heap.peek()]
+        if len(values) > self.k:
+            values = np.partition(values, len(values) - self.k)[len(values) - self.k:]
+        return values
+
+    def threshold(self):
+        """
+        :return: the worst element that is kept, raises ValueError if none
+        """
+        root = self._heap.peek()
+        return root if self.key is None else root[2]
+
+    def result(self):
+        """
+        :return: list of the kept elements, best first
+        """
+        kept = sorted(self._heap.heap_list[1:self._heap.current_size + 1], reverse=self.direction < 0)
+        if self.key is not None:
+            kept = [x for _, _, x in kept]
+        return kept
+
+
+class BottomK(TopK):
+    """
+    Keeps the k smallest elements pushed so far in a max heap of size k,
+    whose root is the largest element that is still kept.
+    Ties keep the element pushed first, like heapq.nsmallest.
+    """
+    heap_class = MaxHeap
+    direction = 1
+
+    def _best_of_batch(self, values):
+        if self._heap.current_size == self.k and self.k > 0:
+            values = values[values < self._heap.peek()]
+        if len(values) > self.k:
+            values = np.partition(values, self.k - 1)[:self.k]
+        return values
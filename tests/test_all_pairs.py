@@ -0,0 +1,89 @@
+import math
+import random
+import unittest
+
+from algorithms.graphs.all_pairs import all_pairs_shortest_paths, floyd_warshall, johnson
+from algorithms.graphs.graph import Graph
+from algorithms.graphs.shortest_paths import INFINITY, NegativeCycleError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def graph_with_negative_edges(seed, n=25, m=70):
+    """
+    Random graph whose negative edges come from reweighting positive ones
+    by random potentials, so it has no negative cycle.
+    """
+    rng = random.Random(seed)
+    potential = [rng.randint(0, 10) for _ in range(n)]
+    graph = Graph()
+    for key in range(n):
+        graph.add_vertex(key)
+    for _ in range(m):
+        u, v = rng.randrange(n), rng.randrange(n)
+        graph.add_edge(u, v, rng.randint(0, 10) + potential[u] - potential[v])
+    return graph
+
+
+class TestAllPairs(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(list(all_pairs_shortest_paths(Graph(), workers=1)), [])
+        self.assertEqual(list(johnson(Graph(), workers=1)), [])
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            all_pairs_shortest_paths(Graph(), algorithm="unknown")
+
+    def test_sources_and_workers(self):
+        graph = graph_with_negative_edges(0)
+        sources = [3, 0, 3]
+        serial = [dict(r) for r in all_pairs_shortest_paths(graph, sources, workers=1, algorithm="spfa")]
+        parallel = [dict(r) for r in all_pairs_shortest_paths(graph, sources, workers=2, algorithm="bellman_ford")]
+        self.assertEqual(parallel, serial)
+        self.assertEqual([r.source for r in all_pairs_shortest_paths(graph, sources, workers=2)], sources)
+
+    def test_johnson_matches_bellman_ford(self):
+        for seed in range(10):
+            graph = graph_with_negative_edges(seed)
+            for result in johnson(graph, workers=1):
+                self.assertEqual(dict(result), dict(graph.bellman_ford(result.source)))
+
+    def test_johnson_negative_cycle(self):
+        graph = Graph()
+        for edge in [(0, 1, 1), (1, 2, -3), (2, 1, 1), (2, 3, 1)]:
+            graph.add_edge(*edge)
+        with self.assertRaises(NegativeCycleError) as context:
+            list(johnson(graph, workers=1))
+        self.assertEqual(sorted(context.exception.cycle), [1, 2])
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestFloydWarshall(unittest.TestCase):
+    def test_matches_bellman_ford(self):
+        for seed in range(5):
+            graph = graph_with_negative_edges(seed)
+            keys, dist, predecessor = floyd_warshall(graph)
+            for i, key in enumerate(keys):
+                expected = graph.bellman_ford(key)
+                for j, other in enumerate(keys):
+                    if expected[other] == INFINITY:
+                        self.assertTrue(math.isinf(dist[i, j]))
+                        self.assertEqual(predecessor[i, j], -1)
+                    else:
+                        self.assertEqual(dist[i, j], expected[other])
+
+    def test_empty_and_negative_cycle(self):
+        keys, dist, _ = floyd_warshall(Graph())
+        self.assertEqual((len(keys), dist.shape), (0, (0, 0)))
+        graph = Graph()
+        graph.add_edge(0, 1, -2)
+        graph.add_edge(1, 0, 1)
+        with self.assertRaises(NegativeCycleError):
+            floyd_warshall(graph)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from datastructures.concurrent_red_black_tree import ConcurrentRedBlackTree
+
+
+class TestIrange(unittest.TestCase):
+    def test_bounded_irange_does_not_copy_the_tree(self):
+        tree = ConcurrentRedBlackTree()
+        for key in range(100):
+            tree.insert(key)
+        self.assertEqual(list(tree.irange(10, 14)), [10, 11, 12, 13, 14])
+        self.assertEqual(list(tree.irange(hi=2, reverse=True)), [2, 1, 0])
+        self.assertIsNone(tree._snapshot)
+
+    def test_irange_is_not_changed_by_later_updates(self):
+        tree = ConcurrentRedBlackTree()
+        for key in range(10):
+            tree.insert(key)
+        keys = tree.irange(3, 6)
+        tree.delete(4)
+        tree.insert(5.5)
+        self.assertEqual(list(keys), [3, 4, 5, 6])
+        self.assertEqual(list(tree.irange(3, 6)), [3, 5, 5.5, 6])
+
+    def test_irange_uses_the_cached_snapshot(self):
+        tree = ConcurrentRedBlackTree()
+        for key in range(10):
+            tree.insert(key)
+        self.assertEqual(list(tree), list(range(10)))
+        self.assertEqual(list(tree.irange(7)), [7, 8, 9])
+        self.assertEqual(list(tree.irange(reverse=True)), list(range(9, -1, -1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
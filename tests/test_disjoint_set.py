@@ -0,0 +1,36 @@
+import unittest
+
+from datastructures.disjoint_set import DisjointSet
+
+
+class TestDisjointSet(unittest.TestCase):
+    def test_empty(self):
+        components = DisjointSet(0)
+        self.assertEqual(len(components), 0)
+        self.assertEqual(components.num_sets, 0)
+        self.assertEqual(components.sets(), {})
+
+    def test_union_and_find(self):
+        components = DisjointSet(6)
+        self.assertTrue(components.union(0, 1))
+        self.assertTrue(components.union(2, 3))
+        self.assertTrue(components.union(1, 3))
+        self.assertFalse(components.union(0, 2))
+        self.assertEqual(components.num_sets, 3)
+        self.assertTrue(components.connected(0, 3))
+        self.assertFalse(components.connected(0, 4))
+        self.assertEqual(sorted(sorted(members) for members in components.sets().values()),
+                         [[0, 1, 2, 3], [4], [5]])
+
+    def test_path_compression(self):
+        components = DisjointSet(1000)
+        for i in range(999):
+            components.union(i, i + 1)
+        self.assertEqual(components.num_sets, 1)
+        roots = {components.find(i) for i in range(1000)}
+        # every element now points straight at the root
+        self.assertEqual(set(components.parent), roots)
+
+
+if __name__ == "__main__":
+    unittest.main()
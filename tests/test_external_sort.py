@@ -0,0 +1,70 @@
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+from algorithms.sorting.external_sort import external_sort, sort_file
+
+
+class TestExternalSort(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.words = ["w{:03d}".format(rng.randrange(200)) for _ in range(1000)]
+
+    def test_empty(self):
+        self.assertEqual(list(external_sort([])), [])
+
+    def test_in_memory(self):
+        self.assertEqual(list(external_sort(iter(self.words))), sorted(self.words))
+
+    def test_multi_pass_merge_with_duplicates(self):
+        # chunks of about 10 records and pairwise merges take several passes
+        result = list(external_sort(self.words, memory_budget=50, fan_in=2))
+        self.assertEqual(result, sorted(self.words))
+
+    def test_key_and_reverse(self):
+        result = list(external_sort(self.words, key=lambda w: w[::-1], reverse=True, memory_budget=200))
+        self.assertEqual([w[::-1] for w in result], sorted((w[::-1] for w in self.words), reverse=True))
+
+    def test_binary_records(self):
+        rng = random.Random(1)
+        records = [struct.pack(">q", rng.randrange(-1000, 1000)) for _ in range(500)]
+        result = list(external_sort(records, key=lambda r: struct.unpack(">q", r)[0],
+                                    memory_budget=64, fan_in=3, record_size=8))
+        self.assertEqual(result, sorted(records, key=lambda r: struct.unpack(">q", r)[0]))
+        with self.assertRaises(ValueError):
+            list(external_sort([b"abc", b"de"], memory_budget=1, record_size=3))
+
+    def test_fan_in_must_be_at_least_two(self):
+        with self.assertRaises(ValueError):
+            list(external_sort(self.words, fan_in=1))
+
+    def test_sort_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "input.txt")
+            output_path = os.path.join(directory, "output.txt")
+            with open(input_path, "w") as f:
+                f.write("\n".join(self.words))
+            sort_file(input_path, output_path, memory_budget=100, tmp_dir=directory)
+            with open(output_path) as f:
+                self.assertEqual(f.read().splitlines(), sorted(self.words))
+
+    def test_sort_binary_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "input.bin")
+            output_path = os.path.join(directory, "output.bin")
+            records = [bytes([b, 0]) for b in (5, 3, 9, 3, 0)]
+            with open(input_path, "wb") as f:
+                f.write(b"".join(records))
+            sort_file(input_path, output_path, memory_budget=4, record_size=2)
+            with open(output_path, "rb") as f:
+                self.assertEqual(f.read(), b"".join(sorted(records)))
+            with open(input_path, "ab") as f:
+                f.write(b"x")
+            with self.assertRaises(ValueError):
+                sort_file(input_path, output_path, record_size=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
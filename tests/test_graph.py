@@ -0,0 +1,231 @@
+import random
+import unittest
+
+from algorithms.graphs.graph import Graph
+from algorithms.graphs.shortest_paths import INFINITY
+
+
+class TestRemoveEdge(unittest.TestCase):
+    def test_remove_undirected_self_loop(self):
+        graph = Graph(False)
+        graph.add_edge(1, 1, 3)
+        graph.remove_edge(1, 1)
+        self.assertFalse(graph.connected(1, 1))
+        self.assertEqual(graph.get_edges(), [])
+
+    def test_remove_undirected_edge(self):
+        graph = Graph(False)
+        graph.add_edge(1, 2, 3)
+        graph.remove_edge(2, 1)
+        self.assertFalse(graph.connected(1, 2))
+        self.assertFalse(graph.connected(2, 1))
+
+    def test_remove_missing_edge(self):
+        graph = Graph()
+        graph.add_edge(1, 2, 3)
+        with self.assertRaises(KeyError):
+            graph.remove_edge(2, 1)
+
+
+class TestInEdges(unittest.TestCase):
+    def test_in_edges_follow_changes(self):
+        graph = Graph()
+        graph.add_edge(1, 2, 3)
+        reverse = graph.in_edges()
+        graph.add_edge(3, 2, 4)
+        graph.add_edge(1, 2, 5)
+        graph.remove_edge(3, 2)
+        graph.add_edge(2, 4, 1)
+        self.assertIs(graph.in_edges(), reverse)
+        expected = [{}] * graph.num_vertices
+        expected[graph.index_of(2)] = {graph.get_vertex(1): 5}
+        expected[graph.index_of(4)] = {graph.get_vertex(2): 1}
+        self.assertEqual(reverse, expected)
+
+
+class TestDynamicShortestPaths(unittest.TestCase):
+    def test_trackers_follow_changes(self):
+        graph = Graph()
+        for edge in [(1, 2, 4), (1, 3, 1), (3, 2, 1), (2, 4, 1)]:
+            graph.add_edge(*edge)
+        first = graph.dynamic_shortest_paths(1)
+        second = graph.dynamic_shortest_paths(3)
+        graph.add_edge(3, 2, 5)
+        graph.add_edge(3, 4, 2)
+        self.assertEqual(dict(first.result()), dict(graph.dijkstra(1)))
+        graph.remove_edge(1, 2)
+        self.assertEqual(dict(first.result()), dict(graph.dijkstra(1)))
+        self.assertEqual(dict(second.result()), dict(graph.dijkstra(3)))
+
+    def test_vertices_added_without_edges(self):
+        graph = Graph()
+        graph.add_edge(1, 2, 3)
+        tracker = graph.dynamic_shortest_paths(1)
+        graph.add_vertex(9)
+        self.assertEqual(dict(tracker.result()), {1: 0, 2: 3, 9: INFINITY})
+        self.assertEqual(dict(tracker.result()), dict(graph.dijkstra(1)))
+
+
+class TestChangeLog(unittest.TestCase):
+    def test_release_drops_changes_no_reader_needs(self):
+        graph = Graph()
+        first = graph.acquire()
+        graph.add_edge(1, 2, 3)
+        second = graph.acquire()
+        graph.add_edge(2, 3, 4)
+        graph.release(first)
+        self.assertEqual(graph.version, 2)
+        self.assertEqual(len(graph._changes), 1)
+        self.assertEqual([(c.source, c.target) for c in graph.changes_since(second)], [(2, 3)])
+        with self.assertRaises(ValueError):
+            graph.changes_since(first)
+        graph.release(second)
+        self.assertEqual(graph._changes, [])
+        self.assertEqual(graph.version, 2)
+
+    def test_closed_trackers_release_the_log(self):
+        graph = Graph()
+        graph.add_edge(1, 2, 3)
+        tracker = graph.dynamic_shortest_paths(1)
+        graph.add_edge(2, 3, 4)
+        tracker.result()
+        self.assertEqual(graph._changes, [])
+        graph.add_edge(1, 3, 1)
+        tracker.close()
+        self.assertEqual(graph._changes, [])
+        with self.assertRaises(ValueError):
+            tracker.update()
+
+    def test_track_changes_keeps_the_log(self):
+        graph = Graph()
+        graph.add_edge(1, 2, 3)
+        graph.track_changes()
+        version = graph.version
+        tracker = graph.dynamic_shortest_paths(1)
+        graph.add_edge(2, 3, 4)
+        tracker.result()
+        tracker.close()
+        self.assertEqual([(c.source, c.target) for c in graph.changes_since(version)], [(2, 3)])
+
+
+class TestBellmanFord(unittest.TestCase):
+    def test_unreachable_vertices_use_the_graph_infinity(self):
+        graph = Graph()
+        graph.add_edge(1, 2, 1.5)
+        graph.add_edge(3, 1, -0.5)
+        result = graph.bellman_ford(1)
+        self.assertEqual(dict(result), {1: 0, 2: 1.5, 3: INFINITY})
+        self.assertEqual(result.infinity, INFINITY)
+        self.assertEqual(result.path_to(3), graph.dijkstra(1).path_to(3))
+        for result in graph.all_pairs_shortest_paths(workers=1, algorithm="bellman_ford"):
+            self.assertEqual(dict(result), dict(graph.dijkstra(result.source)))
+
+    def test_non_numeric_weights_are_rejected(self):
+        graph = Graph()
+        graph.add_edge(1, 2, "3")
+        with self.assertRaises(TypeError):
+            graph.bellman_ford(1)
+
+
+def random_graph(seed, directed, n=30, m=80):
+    rng = random.Random(seed)
+    graph = Graph(directed)
+    for key in range(n):
+        graph.add_vertex(key)
+    for _ in range(m):
+        graph.add_edge(rng.randrange(n), rng.randrange(n), rng.randint(1, 20))
+    return graph
+
+
+def reachable(graph, key):
+    seen = {key}
+    stack = [key]
+    while stack:
+        for v in graph.get_vertex(stack.pop()).get_connections():
+            if v.get_id() not in seen:
+                seen.add(v.get_id())
+                stack.append(v.get_id())
+    return seen
+
+
+class TestSpanningTrees(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(Graph(False).kruskal(), [])
+        self.assertEqual(Graph(False).prim(), [])
+
+    def test_known_tree(self):
+        graph = Graph(False)
+        for edge in [(0, 1, 4), (0, 2, 1), (1, 2, 2), (1, 3, 5), (2, 3, 8), (3, 4, 3)]:
+            graph.add_edge(*edge)
+        for tree in (graph.kruskal(), graph.prim(0)):
+            self.assertEqual(sorted(w for _, _, w in tree), [1, 2, 3, 5])
+
+    def test_kruskal_and_prim_agree_on_forests(self):
+        for seed in range(20):
+            graph = random_graph(seed, directed=False, m=25)
+            kruskal, prim = graph.kruskal(), graph.prim()
+            self.assertEqual(sum(w for _, _, w in kruskal), sum(w for _, _, w in prim))
+            # a spanning forest has one edge less than vertices per component
+            self.assertEqual(len(kruskal), graph.num_vertices - len(graph.connected_components()))
+            self.assertEqual(len(prim), len(kruskal))
+
+
+class TestComponents(unittest.TestCase):
+    def test_connected_components(self):
+        graph = Graph()
+        for edge in [(0, 1), (2, 1), (3, 4)]:
+            graph.add_edge(*edge)
+        graph.add_vertex(5)
+        components = sorted(sorted(c) for c in graph.connected_components())
+        self.assertEqual(components, [[0, 1, 2], [3, 4], [5]])
+        self.assertEqual(Graph().connected_components(), [])
+
+    def test_strongly_connected_components(self):
+        for seed in range(20):
+            graph = random_graph(seed, directed=True, m=40)
+            expected = {frozenset(k for k in reachable(graph, key) if key in reachable(graph, k))
+                        for key in graph.get_vertices()}
+            for algorithm in ("tarjan", "kosaraju"):
+                components = graph.strongly_connected_components(algorithm)
+                self.assertEqual({frozenset(c) for c in components}, expected)
+                self.assertEqual(sum(map(len, components)), graph.num_vertices)
+        with self.assertRaises(ValueError):
+            graph.strongly_connected_components("unknown")
+
+    def test_component_order(self):
+        graph = Graph()
+        for edge in [(0, 1), (1, 0), (1, 2), (2, 3), (3, 2)]:
+            graph.add_edge(*edge)
+        self.assertEqual([sorted(c) for c in graph.strongly_connected_components("tarjan")], [[2, 3], [0, 1]])
+        self.assertEqual([sorted(c) for c in graph.strongly_connected_components("kosaraju")], [[0, 1], [2, 3]])
+
+    def test_deep_graph_does_not_recurse(self):
+        graph = Graph()
+        for i in range(5000):
+            graph.add_edge(i, i + 1)
+        graph.add_edge(5000, 0)
+        self.assertEqual(len(graph.strongly_connected_components()), 1)
+
+
+class TestTopologicalSort(unittest.TestCase):
+    def test_order(self):
+        graph = Graph()
+        for edge in [(5, 2), (5, 0), (4, 0), (4, 1), (2, 3), (3, 1)]:
+            graph.add_edge(*edge)
+        order = graph.topological_sort()
+        position = {key: i for i, key in enumerate(order)}
+        self.assertEqual(sorted(order), [0, 1, 2, 3, 4, 5])
+        for u, v, _ in graph.get_edges():
+            self.assertLess(position[u.get_id()], position[v.get_id()])
+        self.assertEqual(Graph().topological_sort(), [])
+
+    def test_cycle(self):
+        graph = Graph()
+        for edge in [(0, 1), (1, 2), (2, 1)]:
+            graph.add_edge(*edge)
+        with self.assertRaises(ValueError):
+            graph.topological_sort()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import random
+import unittest
+
+from datastructures.hash_map import HashMap, OpenAddressingHashMap
+
+
+def max_probe_distance(hash_map):
+    """
+    :return: the largest distance of an entry from its home slot
+    """
+    mask, shift = hash_map._mask, hash_map._shift
+    return max((i - (key_hash >> shift)) & mask
+               for i, key_hash in enumerate(hash_map._hashes) if key_hash is not None)
+
+
+class TestOpenAddressingHashMapHashing(unittest.TestCase):
+    def check_spread(self, keys):
+        hash_map = OpenAddressingHashMap()
+        for key in keys:
+            hash_map.put(key, key)
+        self.assertEqual(len(hash_map), len(keys))
+        self.assertLess(max_probe_distance(hash_map), 32)
+        for key in keys:
+            self.assertEqual(hash_map.get(key), key)
+
+    def test_float_keys(self):
+        self.check_spread([i / 1024 for i in range(4096)])
+
+    def test_high_bit_integer_keys(self):
+        self.check_spread([i << 48 for i in range(4096)])
+
+    def test_consecutive_integer_keys(self):
+        self.check_spread(list(range(4096)))
+
+
+class MapTests:
+    """
+    Tests of the put/get/delete interface shared by both maps.
+    """
+    map_class = None
+
+    def test_empty(self):
+        hash_map = self.map_class()
+        self.assertEqual(len(hash_map), 0)
+        self.assertEqual(list(hash_map), [])
+        self.assertNotIn(1, hash_map)
+        with self.assertRaises(ValueError):
+            hash_map.get(1)
+        with self.assertRaises(ValueError):
+            hash_map.delete(1)
+
+    def test_put_overwrites_duplicate_keys(self):
+        hash_map = self.map_class()
+        hash_map.put("a", 1)
+        hash_map.put("a", 2)
+        self.assertEqual(len(hash_map), 1)
+        self.assertEqual(hash_map.get("a"), 2)
+
+    def test_grows_and_shrinks(self):
+        hash_map = self.map_class()
+        for key in range(1000):
+            hash_map.put(key, -key)
+        self.assertEqual(len(hash_map), 1000)
+        for key in range(0, 1000, 2):
+            hash_map.delete(key)
+        self.assertEqual(hash_map.size(), 500)
+        self.assertEqual(sorted(hash_map), list(range(1, 1000, 2)))
+        self.assertEqual(sorted(hash_map.items()), [(key, -key) for key in range(1, 1000, 2)])
+        for key in range(1000):
+            self.assertEqual(key in hash_map, key % 2 == 1)
+        with self.assertRaises(ValueError):
+            hash_map.delete(0)
+
+    def test_equal_keys_with_different_types(self):
+        hash_map = self.map_class()
+        hash_map.put(1, "int")
+        hash_map.put(1.0, "float")
+        self.assertEqual(len(hash_map), 1)
+        self.assertEqual(hash_map.get(1), "float")
+
+
+class TestHashMap(MapTests, unittest.TestCase):
+    map_class = HashMap
+
+    def test_lookups_during_incremental_resize(self):
+        hash_map = HashMap(num_buckets=2)
+        for key in range(200):
+            hash_map.put(key, key)
+            # every key put so far is found, whether it was migrated or not
+            self.assertEqual(hash_map.get(key // 2), key // 2)
+        self.assertEqual(sorted(hash_map), list(range(200)))
+
+
+class TestOpenAddressingHashMap(MapTests, unittest.TestCase):
+    map_class = OpenAddressingHashMap
+
+    def test_matches_dict_under_random_operations(self):
+        rng = random.Random(0)
+        hash_map, expected = OpenAddressingHashMap(), {}
+        for _ in range(5000):
+            key = rng.randrange(300)
+            if rng.random() < 0.4 and key in expected:
+                hash_map.delete(key)
+                del expected[key]
+            else:
+                value = rng.random()
+                hash_map.put(key, value)
+                expected[key] = value
+        self.assertEqual(len(hash_map), len(expected))
+        self.assertEqual(dict(hash_map.items()), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import random
+import unittest
+
+from algorithms.graphs.graph import Graph
+from datastructures.heap import (FibonacciHeap, IndexedPriorityQueue, MaxHeap, MinHeap, PairingHeap,
+                                 nlargest, nsmallest)
+
+
+def drain(queue):
+    tasks = []
+    while not queue.empty():
+        tasks.append(queue.pop_task())
+    return tasks
+
+
+def pop_all(heap):
+    return [heap.pop() for _ in range(len(heap))]
+
+
+class TestBinaryHeap(unittest.TestCase):
+    def test_empty(self):
+        for heap_class in (MinHeap, MaxHeap):
+            for typecode in (None, 'q'):
+                heap = heap_class(typecode=typecode)
+                self.assertEqual(len(heap), 0)
+                for method in (heap.peek, heap.pop):
+                    with self.assertRaises(ValueError):
+                        method()
+                with self.assertRaises(ValueError):
+                    heap.replace(1)
+                self.assertEqual(heap.push_pop(3), 3)
+
+    def test_pop_order_with_duplicates(self):
+        data = [5, 3, 8, 3, 1, 8, 0, 5]
+        for typecode in (None, 'q', 'd'):
+            self.assertEqual(pop_all(MinHeap(data, typecode)), sorted(data))
+            self.assertEqual(pop_all(MaxHeap(data, typecode)), sorted(data, reverse=True))
+
+    def test_insert_and_peek(self):
+        heap = MinHeap(typecode='d')
+        for x in [2.5, -1.0, 7.0]:
+            heap.insert(x)
+        self.assertEqual(heap.min(), -1.0)
+        heap.push(-3.0)
+        self.assertEqual(heap.extract_min(), -3.0)
+        self.assertEqual(len(heap), 3)
+
+    def test_push_pop_and_replace(self):
+        heap = MinHeap([4, 6, 8])
+        self.assertEqual(heap.push_pop(1), 1)
+        self.assertEqual(heap.push_pop(5), 4)
+        self.assertEqual(heap.replace(2), 5)
+        self.assertEqual(pop_all(heap), [2, 6, 8])
+
+    def test_decrease_and_increase_key(self):
+        heap = MinHeap([4, 6, 8])
+        heap.decrease_key(3, 1)
+        self.assertEqual(heap.min(), 1)
+        with self.assertRaises(ValueError):
+            heap.decrease_key(1, 100)
+        heap = MaxHeap([4, 6, 8])
+        heap.increase_key(3, 10)
+        self.assertEqual(heap.max(), 10)
+
+    def test_merge(self):
+        merged = MinHeap.merge(MinHeap([5, 1], 'q'), MinHeap([4, 1, 9], 'q'), MinHeap(typecode='q'))
+        self.assertEqual(merged.typecode, 'q')
+        self.assertEqual(pop_all(merged), [1, 1, 4, 5, 9])
+        first = MaxHeap([2, 7])
+        merged = MaxHeap.merge(first, MaxHeap([3.5], 'd'))
+        self.assertIsNone(merged.typecode)
+        self.assertEqual(pop_all(merged), [7, 3.5, 2])
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(MinHeap.merge()), 0)
+
+    def test_nsmallest_and_nlargest(self):
+        data = [5, 1, 4, 1, 9, 2, 6]
+        for n in (0, 1, 3, 7, 10):
+            self.assertEqual(nsmallest(n, iter(data)), sorted(data)[:n])
+            self.assertEqual(nlargest(n, data, typecode='q'), sorted(data, reverse=True)[:n])
+        self.assertEqual(nsmallest(3, []), [])
+
+    def test_selection_with_key_keeps_ties_in_input_order(self):
+        data = [(1, 'a'), (0, 'b'), (1, 'c'), (0, 'd'), (1, 'e')]
+        first = lambda pair: pair[0]
+        self.assertEqual(nsmallest(3, data, key=first), sorted(data, key=first)[:3])
+        self.assertEqual(nlargest(2, data, key=first), sorted(data, key=first, reverse=True)[:2])
+
+
+class TestIndexedPriorityQueue(unittest.TestCase):
+    def test_empty(self):
+        queue = IndexedPriorityQueue()
+        self.assertTrue(queue.empty())
+        self.assertEqual(len(queue), 0)
+        with self.assertRaises(KeyError):
+            queue.pop_task()
+        with self.assertRaises(KeyError):
+            queue.peek_task()
+        with self.assertRaises(KeyError):
+            queue.remove_task("a")
+
+    def test_arity_must_be_at_least_two(self):
+        with self.assertRaises(ValueError):
+            IndexedPriorityQueue(arity=1)
+
+    def test_pops_in_priority_order(self):
+        for arity in (2, 4, 8):
+            queue = IndexedPriorityQueue(arity)
+            priorities = list(range(100))
+            random.Random(arity).shuffle(priorities)
+            for task, priority in enumerate(priorities):
+                queue.add_task(task, priority)
+            self.assertEqual(queue.peek_task(), priorities.index(0))
+            self.assertEqual([priorities[task] for task in drain(queue)], list(range(100)))
+
+    def test_duplicate_priorities(self):
+        queue = IndexedPriorityQueue()
+        for task in range(10):
+            queue.add_task(task, task % 2)
+        self.assertEqual(sorted(drain(queue)[:5]), [0, 2, 4, 6, 8])
+
+    def test_update_priority_in_place(self):
+        queue = IndexedPriorityQueue()
+        for task in "abcd":
+            queue.add_task(task, 10)
+        queue.add_task("c", 1)
+        queue.add_task("a", 20)
+        self.assertEqual(len(queue), 4)
+        self.assertEqual(queue.priority("c"), 1)
+        self.assertEqual(queue.pop_task(), "c")
+        self.assertEqual(drain(queue)[-1], "a")
+
+    def test_remove_task(self):
+        queue = IndexedPriorityQueue(arity=2)
+        for task in range(20):
+            queue.add_task(task, (task * 7) % 20)
+        for task in range(0, 20, 3):
+            queue.remove_task(task)
+        self.assertNotIn(3, queue)
+        remaining = [task for task in range(20) if task % 3]
+        self.assertEqual(drain(queue), sorted(remaining, key=lambda task: (task * 7) % 20))
+
+
+class MeldableHeapTests:
+    """
+    Tests shared by the meldable heaps.
+    """
+    heap_class = None
+
+    def extract_all(self, heap):
+        priorities = []
+        while not heap.empty():
+            priorities.append(heap.extract_min().priority)
+        return priorities
+
+    def test_empty(self):
+        heap = self.heap_class()
+        self.assertTrue(heap.empty())
+        with self.assertRaises(KeyError):
+            heap.find_min()
+        with self.assertRaises(KeyError):
+            heap.extract_min()
+        with self.assertRaises(KeyError):
+            heap.pop_task()
+
+    def test_extract_order_with_duplicates(self):
+        heap = self.heap_class()
+        data = [5, 3, 8, 3, 1, 8, 0, 5] * 5
+        for priority in data:
+            heap.insert(priority)
+        self.assertEqual(len(heap), len(data))
+        self.assertEqual(heap.find_min().priority, 0)
+        self.assertEqual(self.extract_all(heap), sorted(data))
+
+    def test_decrease_key_and_delete(self):
+        rng = random.Random(0)
+        heap = self.heap_class()
+        nodes = [heap.insert(rng.randrange(1000), i) for i in range(300)]
+        # extracting once builds the trees that the cuts below work on
+        first = heap.extract_min()
+        nodes.remove(first)
+        rng.shuffle(nodes)
+        for node in nodes[:100]:
+            heap.decrease_key(node, node.priority - rng.randrange(500))
+        for node in nodes[100:150]:
+            heap.delete(node)
+        with self.assertRaises(ValueError):
+            heap.decrease_key(nodes[0], nodes[0].priority + 1)
+        expected = sorted(node.priority for node in nodes[:100] + nodes[150:])
+        self.assertEqual(self.extract_all(heap), expected)
+
+    def test_meld(self):
+        a, b = self.heap_class(), self.heap_class()
+        for priority in [4, 9, 1]:
+            a.insert(priority)
+        node = b.insert(7)
+        b.insert(2)
+        a.meld(b)
+        self.assertTrue(b.empty())
+        self.assertEqual(len(a), 5)
+        a.decrease_key(node, 0)
+        self.assertEqual(self.extract_all(a), [0, 1, 2, 4, 9])
+        a.meld(self.heap_class())
+        self.assertTrue(a.empty())
+
+    def test_task_interface(self):
+        heap = self.heap_class()
+        for task in "abcd":
+            heap.add_task(task, 10)
+        heap.add_task("c", 1)
+        heap.add_task("a", 20)
+        heap.remove_task("b")
+        self.assertNotIn("b", heap)
+        self.assertEqual(heap.priority("a"), 20)
+        self.assertEqual(heap.peek_task(), "c")
+        self.assertEqual([heap.pop_task() for _ in range(3)], ["c", "d", "a"])
+
+    def test_dijkstra_queue(self):
+        graph = Graph()
+        rng = random.Random(1)
+        for _ in range(200):
+            graph.add_edge(rng.randrange(40), rng.randrange(40), rng.randint(1, 9))
+        self.assertEqual(dict(graph.dijkstra(0, queue_class=self.heap_class)), dict(graph.dijkstra(0)))
+
+
+class TestPairingHeap(MeldableHeapTests, unittest.TestCase):
+    heap_class = PairingHeap
+
+
+class TestFibonacciHeap(MeldableHeapTests, unittest.TestCase):
+    heap_class = FibonacciHeap
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from operator import itemgetter
+
+from algorithms.sorting.heapsort import heap_sort
+
+
+class TestHeapSort(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(heap_sort([]), [])
+        self.assertEqual(heap_sort([], key=abs, reverse=True), [])
+
+    def test_duplicates(self):
+        a = [3, 1, 2, 3, 1, 0, 2]
+        self.assertEqual(heap_sort(a), sorted(a))
+        self.assertEqual(heap_sort(a, reverse=True), sorted(a, reverse=True))
+
+    def test_key_is_stable(self):
+        a = [(1, 'a'), (0, 'b'), (1, 'c'), (0, 'd')]
+        self.assertEqual(heap_sort(a, key=itemgetter(0)), sorted(a, key=itemgetter(0)))
+
+    def test_reverse_keeps_equal_keys_in_input_order(self):
+        a = [(1, 'a'), (1, 'b'), (0, 'c')]
+        self.assertEqual(heap_sort(a, key=itemgetter(0), reverse=True), [(1, 'a'), (1, 'b'), (0, 'c')])
+        a = [(i % 3, i) for i in range(20)]
+        self.assertEqual(heap_sort(a, key=itemgetter(0), reverse=True),
+                         sorted(a, key=itemgetter(0), reverse=True))
+
+    def test_does_not_change_the_input(self):
+        a = [2, 0, 1]
+        heap_sort(a, key=lambda x: -x)
+        self.assertEqual(a, [2, 0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+from array import array
+import random
+import unittest
+
+from algorithms.sorting.heapsort import heap_sort
+from algorithms.sorting.parallel_sort import parallel_sort
+
+
+class TestParallelSort(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(list(parallel_sort([], workers=2)), [])
+        self.assertEqual(parallel_sort([], workers=2, key=abs), [])
+
+    def test_serial_below_threshold(self):
+        result = parallel_sort([3, 1, 2], workers=4)
+        self.assertEqual(result, array('q', [1, 2, 3]))
+
+    def test_parallel_ints_with_duplicates(self):
+        rng = random.Random(0)
+        data = [rng.randrange(-50, 50) for _ in range(5000)]
+        result = parallel_sort(data, workers=3, threshold=100)
+        self.assertEqual(result.typecode, 'q')
+        self.assertEqual(list(result), sorted(data))
+
+    def test_parallel_floats_and_arrays(self):
+        rng = random.Random(1)
+        data = array('d', [rng.random() for _ in range(3001)])
+        self.assertEqual(list(parallel_sort(data, workers=2, threshold=100)), sorted(data))
+        self.assertEqual(list(parallel_sort(data, workers=2, threshold=100, sort=heap_sort)), sorted(data))
+
+    def test_parallel_with_key(self):
+        rng = random.Random(2)
+        data = [(rng.randrange(100), i) for i in range(4000)]
+        result = parallel_sort(data, workers=3, threshold=100, key=lambda pair: pair[0])
+        self.assertEqual([k for k, _ in result], sorted(k for k, _ in data))
+        self.assertEqual(sorted(result), sorted(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
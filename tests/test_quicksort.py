@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from algorithms.sorting.quicksort import quick_sort, quick_sort_helper
+
+
+class TestQuickSort(unittest.TestCase):
+    def check(self, data, key=None, reverse=False):
+        arr = list(data)
+        quick_sort(arr, key=key, reverse=reverse)
+        expected = sorted(data, key=key, reverse=reverse)
+        if key is None:
+            self.assertEqual(arr, expected)
+        else:
+            # the sort is not stable, only the keys are ordered
+            self.assertEqual([key(x) for x in arr], [key(x) for x in expected])
+            self.assertEqual(sorted(arr), sorted(data))
+
+    def test_empty_and_single(self):
+        self.check([])
+        self.check([1])
+        self.check([], key=abs, reverse=True)
+
+    def test_random(self):
+        rng = random.Random(0)
+        for n in (2, 15, 16, 17, 127, 128, 129, 1000):
+            self.check([rng.random() for _ in range(n)])
+
+    def test_duplicates(self):
+        rng = random.Random(1)
+        self.check([rng.randrange(3) for _ in range(1000)])
+        self.check([7] * 500)
+
+    def test_adversarial_patterns(self):
+        n = 2000
+        self.check(list(range(n)))
+        self.check(list(range(n, 0, -1)))
+        self.check(list(range(n // 2)) + list(range(n // 2, 0, -1)))
+        self.check([i % 10 for i in range(n)])
+
+    def test_key_and_reverse(self):
+        rng = random.Random(2)
+        data = [(rng.randrange(50), i) for i in range(500)]
+        self.check(data, key=lambda pair: pair[0])
+        self.check(data, key=lambda pair: pair[0], reverse=True)
+        self.check([rng.random() for _ in range(300)], reverse=True)
+
+    def test_textbook_quicksort(self):
+        arr = [3, 1, 2, 3, 0]
+        quick_sort_helper(arr, 0, len(arr) - 1)
+        self.assertEqual(arr, [0, 1, 2, 3, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import random
+import unittest
+
+from datastructures.red_black_tree import BLACK, RED, RedBlackTree, nil
+
+
+def check_invariants(test, tree):
+    """
+    Checks the red-black properties, the parent links and the subtree sizes of tree.
+    :return: the number of nodes
+    """
+    def walk(x):
+        if x is nil:
+            return 0, 1
+        if x.color == RED:
+            test.assertEqual((x.left.color, x.right.color), (BLACK, BLACK))
+        left_size, left_height = walk(x.left)
+        right_size, right_height = walk(x.right)
+        test.assertEqual(left_height, right_height)
+        test.assertEqual((x.num_left, x.num_right), (left_size, right_size))
+        for child in (x.left, x.right):
+            if child is not nil:
+                test.assertIs(child.parent, x)
+        return left_size + right_size + 1, left_height + (x.color == BLACK)
+    test.assertEqual(tree.root.color, BLACK)
+    return walk(tree.root)[0]
+
+
+class TestOrderStatistics(unittest.TestCase):
+    def test_empty(self):
+        tree = RedBlackTree()
+        self.assertEqual(tree.rank(5), 0)
+        self.assertEqual(tree.count_range(0, 10), 0)
+        with self.assertRaises(IndexError):
+            tree.select(0)
+        with self.assertRaises(ValueError):
+            tree.percentile(50)
+
+    def test_sizes_follow_inserts_and_deletes(self):
+        rng = random.Random(0)
+        tree, keys = RedBlackTree(), []
+        for _ in range(500):
+            key = rng.randrange(1000)
+            if key in tree and rng.random() < 0.5:
+                tree.delete(key)
+                keys.remove(key)
+            elif key not in tree:
+                tree.insert(key)
+                keys.append(key)
+        keys.sort()
+        self.assertEqual(check_invariants(self, tree), len(keys))
+        for k, key in enumerate(keys):
+            self.assertEqual(tree.select(k), key)
+            self.assertEqual(tree.rank(key), k)
+        self.assertEqual(tree.select(-1), keys[-1])
+        with self.assertRaises(IndexError):
+            tree.select(len(keys))
+
+    def test_duplicate_keys(self):
+        tree = RedBlackTree()
+        for key in [5, 1, 5, 3, 5, 1]:
+            tree.insert(key)
+        self.assertEqual([tree.select(k) for k in range(6)], [1, 1, 3, 5, 5, 5])
+        self.assertEqual(tree.rank(5), 3)
+        self.assertEqual(tree.count_range(1, 3), 3)
+        self.assertEqual(tree.count_range(5, 5), 3)
+        self.assertEqual(tree.count_range(4, 2), 0)
+
+    def test_percentile(self):
+        tree = RedBlackTree.from_sorted(range(1, 101))
+        self.assertEqual(tree.percentile(0), 1)
+        self.assertEqual(tree.percentile(50), 50)
+        self.assertEqual(tree.percentile(99.5), 100)
+        self.assertEqual(tree.percentile(100), 100)
+        with self.assertRaises(ValueError):
+            tree.percentile(101)
+
+
+class TestBulkOperations(unittest.TestCase):
+    def test_from_sorted(self):
+        for n in (0, 1, 2, 7, 8, 100):
+            tree = RedBlackTree.from_sorted(range(n), [str(i) for i in range(n)])
+            self.assertEqual(check_invariants(self, tree), n)
+            self.assertEqual(list(tree.items()), [(i, str(i)) for i in range(n)])
+
+    def test_from_sorted_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            RedBlackTree.from_sorted([2, 1])
+        with self.assertRaises(ValueError):
+            RedBlackTree.from_sorted([1, 2], ["a"])
+
+    def test_from_sorted_duplicate_keys(self):
+        tree = RedBlackTree.from_sorted([1, 1, 2, 2, 2])
+        check_invariants(self, tree)
+        self.assertEqual(list(tree), [1, 1, 2, 2, 2])
+
+    def test_copy_is_independent(self):
+        tree = RedBlackTree.from_sorted(range(10))
+        copy = tree.copy()
+        copy.insert(20)
+        self.assertEqual(list(tree), list(range(10)))
+        self.assertEqual(check_invariants(self, copy), 11)
+
+    def test_join(self):
+        for n, m in ((0, 0), (0, 5), (30, 1), (3, 40), (25, 25)):
+            left = RedBlackTree.from_sorted(range(n))
+            right = RedBlackTree.from_sorted(range(n + 1, n + 1 + m))
+            tree = RedBlackTree.join(left, n, right, "middle")
+            self.assertEqual(check_invariants(self, tree), n + m + 1)
+            self.assertEqual(list(tree), list(range(n + m + 1)))
+            self.assertEqual(tree[n], "middle")
+            self.assertEqual((list(left), list(right)), ([], []))
+
+    def test_join_rejects_unordered_trees(self):
+        with self.assertRaises(ValueError):
+            RedBlackTree.join(RedBlackTree.from_sorted([5]), 3, RedBlackTree())
+
+    def test_split_every_key(self):
+        for key in range(-1, 22):
+            tree = RedBlackTree.from_sorted(range(0, 21, 2))
+            left, right = tree.split(key)
+            check_invariants(self, left)
+            check_invariants(self, right)
+            self.assertEqual(list(left), [k for k in range(0, 21, 2) if k < key])
+            self.assertEqual(list(right), [k for k in range(0, 21, 2) if k >= key])
+
+    def test_split_empty(self):
+        left, right = RedBlackTree().split(3)
+        self.assertEqual((len(left), len(right)), (0, 0))
+
+    def test_set_operations(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            a = set(rng.sample(range(100), rng.randrange(40)))
+            b = set(rng.sample(range(100), rng.randrange(40)))
+            for operation, expected in (("union", a | b), ("intersection", a & b), ("difference", a - b)):
+                first = RedBlackTree.from_sorted(sorted(a), ["a"] * len(a))
+                second = RedBlackTree.from_sorted(sorted(b), ["b"] * len(b))
+                tree = getattr(first, operation)(second)
+                self.assertEqual(check_invariants(self, tree), len(expected))
+                self.assertEqual(list(tree), sorted(expected))
+                self.assertEqual((len(first), len(second)), (0, 0))
+                for key in a & expected:
+                    self.assertEqual(tree[key], "a")
+
+
+class TestSplit(unittest.TestCase):
+    def test_split_empties_source_tree(self):
+        tree = RedBlackTree.from_sorted(range(20))
+        left, right = tree.split(10)
+        self.assertEqual(list(tree), [])
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(list(left), list(range(10)))
+        self.assertEqual(list(right), list(range(10, 20)))
+
+    def test_source_tree_is_independent_after_split(self):
+        tree = RedBlackTree.from_sorted(range(20))
+        left, right = tree.split(10)
+        tree.insert(5.5)
+        self.assertEqual(list(tree), [5.5])
+        self.assertEqual(list(left), list(range(10)))
+        self.assertEqual(list(right), list(range(10, 20)))
+        left.insert(-1)
+        self.assertEqual(list(tree), [5.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import unittest
+
+from algorithms.graphs import traversal
+from algorithms.graphs.graph import Graph
+
+
+def edge_events(events):
+    return [(e.kind, e.vertex, e.neighbour) for e in events if e.neighbour is not None]
+
+
+def vertex_events(events, kind):
+    return [e.vertex for e in events if e.kind == kind]
+
+
+class TestTraversal(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph()
+        for edge in [(0, 1), (1, 2), (2, 0), (0, 2), (3, 1)]:
+            self.graph.add_edge(*edge)
+
+    def test_empty_graph(self):
+        self.assertEqual(list(Graph().iter_bfs()), [])
+        self.assertEqual(list(Graph().iter_dfs()), [])
+
+    def test_dfs_classifies_edges(self):
+        events = list(self.graph.iter_dfs())
+        self.assertEqual(edge_events(events), [
+            (traversal.TREE, 0, 1), (traversal.TREE, 1, 2), (traversal.BACK, 2, 0),
+            (traversal.FORWARD, 0, 2), (traversal.CROSS, 3, 1)])
+        self.assertEqual(vertex_events(events, traversal.DISCOVER), [0, 1, 2, 3])
+        self.assertEqual(vertex_events(events, traversal.FINISH), [2, 1, 0, 3])
+        self.assertEqual(events, list(self.graph.freeze().iter_dfs()))
+
+    def test_bfs_levels_and_edges(self):
+        events = list(self.graph.iter_bfs(sources=[3]))
+        self.assertEqual([(e.vertex, e.depth) for e in events if e.kind == traversal.DISCOVER],
+                         [(3, 0), (1, 1), (2, 2), (0, 3)])
+        self.assertEqual(edge_events(events), [
+            (traversal.TREE, 3, 1), (traversal.TREE, 1, 2), (traversal.TREE, 2, 0),
+            (traversal.NON_TREE, 0, 1), (traversal.NON_TREE, 0, 2)])
+        self.assertEqual(events, list(self.graph.freeze().iter_bfs(sources=[3])))
+
+    def test_undirected_edges_are_reported_once(self):
+        graph = Graph(False)
+        for edge in [(0, 1), (1, 2), (2, 0), (2, 3)]:
+            graph.add_edge(*edge)
+        for events in (graph.iter_dfs(), graph.iter_bfs()):
+            edges = edge_events(events)
+            self.assertEqual(len(edges), 4)
+            self.assertEqual(sum(kind == traversal.TREE for kind, _, _ in edges), 3)
+
+    def test_depth_limit_and_no_edges(self):
+        for search in (self.graph.iter_bfs, self.graph.iter_dfs):
+            events = list(search(sources=[0], depth_limit=1, edges=False))
+            self.assertEqual(edge_events(events), [])
+            self.assertEqual(sorted(vertex_events(events, traversal.DISCOVER)), [0, 1, 2])
+            self.assertEqual(list(search(sources=[0], depth_limit=0)),
+                             [traversal.TraversalEvent(traversal.DISCOVER, 0, None, 0),
+                              traversal.TraversalEvent(traversal.FINISH, 0, None, 0)])
+
+    def test_stops_when_the_caller_stops(self):
+        graph = Graph()
+        for i in range(10000):
+            graph.add_edge(i, i + 1)
+        events = graph.iter_dfs()
+        self.assertEqual(next(events).vertex, 0)
+        events.close()
+
+    def test_deep_graph_does_not_recurse(self):
+        graph = Graph()
+        for i in range(5000):
+            graph.add_edge(i, i + 1)
+        self.assertEqual(vertex_events(graph.iter_dfs(sources=[0]), traversal.FINISH)[0], 5000)
+
+    def test_dfs_does_not_print(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            order = self.graph.dfs()
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(order, [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+try:
+    import numpy as np
+    from algorithms.sorting.vectorised_sorting import bucket_sort
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBucketSort(unittest.TestCase):
+    def check(self, arr, num_buckets=None):
+        self.assertTrue((bucket_sort(arr, num_buckets) == np.sort(arr)).all())
+        permutation = bucket_sort(arr, num_buckets, return_indices=True)
+        self.assertTrue((permutation == np.argsort(arr, kind="stable")).all())
+
+    def test_floats(self):
+        rng = np.random.default_rng(0)
+        self.check(rng.random(1000))
+        self.check(rng.exponential(size=1000) ** 4, 10)
+
+    def test_integers_with_duplicates(self):
+        rng = np.random.default_rng(1)
+        self.check(rng.integers(-20, 20, 1000))
+        self.check(np.full(10, 7))
+
+    def test_empty(self):
+        self.assertEqual(bucket_sort(np.array([])).size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()